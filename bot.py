@@ -1,15 +1,35 @@
 # used for interfacing with the discord api
 import discord
+from discord import app_commands
 # used for file io
 import sys
 import os
 from pathlib import Path
 import shutil
+import sqlite3
+# used for running file and database saves on background threads so they don't freeze the bot
+import concurrent.futures
+import threading
 # used for storing and using date and time information
 import datetime
-from zoneinfo import ZoneInfo
+import calendar
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 # used for creating coroutine tasks so the bot can loop to check for time without freezing itself
 import asyncio
+# used for the shared alert scheduler's timer heap and the send dispatcher's queues
+import heapq
+import itertools
+import collections
+# used for keeping the meeting and bday lists sorted with binary searches
+import bisect
+# used for packing lists of timestamps into compact binary saves
+import array
+# used for matching commands against their syntax patterns
+import re
+import csv
+import functools
+from io import BytesIO
+import uuid
 
 ########################################################################################################################
 #
@@ -18,12 +38,18 @@ import asyncio
 ########################################################################################################################
 
 # discord bot permissions
-perms = discord.Intents.default()
-perms.message_content = True
+# the bot only needs server and channel events and messages in servers (messages that @ the bot still come with their
+# content without the privileged message content intent, which is all the bot needs to read mention commands)
+perms = discord.Intents.none()
+perms.guilds = True
+perms.guild_messages = True
 
 # sets up the bot client
 client = discord.Client(intents = perms)
 
+# holds the bot's slash commands
+tree = app_commands.CommandTree(client)
+
 # gets the secret bot token by reading it from a local txt file
 with open("token.txt", "r") as file:
 	bot_token = file.readline().strip()
@@ -33,9 +59,24 @@ desktop_prefix = ""
 mobile_prefix = ""
 
 # used for keeping track of each server's meeting / dutyorders etc.
-# maps a discord guild object to a ServerData object
+# maps the id of a discord server to its ServerData object
+# (kept in order from least to most recently used so idle servers can be taken out of memory when lazy loading is on)
 server_data = {}
 
+# maps the id of each server that is currently having its data loaded to the task that is loading it
+loading_servers = {}
+
+# whether on_ready has already run once (discord can call it again after the bot reconnects)
+initialized = False
+
+# how many messages the bot has seen that were commands for it and how many it threw out
+# (the bot gets an event for every message in every server it's in, so this shows how much of that traffic is actually for it)
+accepted_messages = 0
+rejected_messages = 0
+
+# how many messages the bot sees between each time it prints the accepted and rejected message counts (0 to never print them)
+message_stats_interval = 10000
+
 # maximum number of characters that can be sent in a discord message
 max_message_len = 2000
 
@@ -48,6 +89,24 @@ timezone = ZoneInfo(key='US/Pacific')
 # be sure to change this yourself as well if you using another timezone
 tzstr = 'PT'
 
+# strftime formats for displaying times without leading zeros (windows takes them off with # and everything else uses -)
+# picked once here so the platform doesn't have to be checked every time a time is displayed
+if sys.platform == 'win32':
+	time_format = f'%#H:%M / %#I:%M %p {tzstr}'
+	meeting_format = f'%A %b %#d %Y at {time_format}'
+else:
+	time_format = f'%-H:%M / %-I:%M %p {tzstr}'
+	meeting_format = f'%A %b %-d %Y at {time_format}'
+
+# strftime format for times in iCalendar (.ics) files, and the name the bot gives itself in the calendars it exports
+ics_time_format = '%Y%m%dT%H%M%S'
+ics_product_id = '-//Capstone Meeting Bot//Meeting Schedule//EN'
+
+# how server data gets saved
+# 'sqlite' saves every server's data in one database file, 'files' saves each server's data in its own folder of files
+# (if there is a folder of files from before when the bot starts with 'sqlite', it gets imported into the database once)
+storage_engine = 'sqlite'
+
 # string for displaying the contact info users can use to reach out if they have problems with the bot
 contact_info = ""
 if os.path.isfile("contact_info.txt"):
@@ -60,70 +119,160 @@ if os.path.isfile("contact_info.txt"):
 #
 ########################################################################################################################
 
+# class for a list that keeps itself in sorted order and is changed in place instead of being copied on every insert
+class SortedList:
+	# constructor (items don't need to be sorted already)
+	def __init__(self, items = ()):
+		self.items = sorted(items)
+
+	# string caster
+	def __str__(self):
+		return str(self.items)
+
+	###########################################################################
+	#
+	# operator overloads
+	#
+	###########################################################################
+
+	# len()
+	def __len__(self) -> int:
+		return len(self.items)
+
+	# indexing and slicing []
+	def __getitem__(self, index):
+		return self.items[index]
+
+	# for loops
+	def __iter__(self):
+		return iter(self.items)
+
+	# in (binary search)
+	def __contains__(self, obj) -> bool:
+		return self.find(obj) != -1
+
+	###########################################################################
+	#
+	# utility functions
+	#
+	###########################################################################
+
+	# returns the index of obj in the list with a binary search, returns -1 if it isn't in the list
+	def find(self, obj) -> int:
+		index = bisect.bisect_left(self.items, obj)
+		# check every item that sorts the same as obj (like bdays on the same day for different people) for one that is equal to it
+		while index < len(self.items) and not obj < self.items[index]:
+			if obj == self.items[index]:
+				return index
+			index += 1
+
+		return -1
+
+	# returns the index of obj in the list with a binary search, raises a ValueError if it isn't in the list
+	def index(self, obj) -> int:
+		index = self.find(obj)
+		if index == -1:
+			raise ValueError(f'{obj} is not in list')
+		return index
+
+	# inserts obj into the list in sorted order with a binary search and returns the index it was inserted at
+	# if no_dupes is true and obj is already in the list, returns none and doesn't insert it
+	def add(self, obj, no_dupes: bool = False):
+		if no_dupes and self.find(obj) != -1:
+			return None
+
+		index = bisect.bisect_right(self.items, obj)
+		self.items.insert(index, obj)
+		return index
+
+	# removes obj from the list and returns the index it was at, raises a ValueError if it isn't in the list
+	def remove(self, obj) -> int:
+		index = self.index(obj)
+		del self.items[index]
+		return index
+
+	# removes and returns the item at index (default is the last item)
+	def pop(self, index: int = -1):
+		return self.items.pop(index)
+
+	# removes every item whose index is in the set of indexes by rebuilding the list once
+	def remove_indexes(self, indexes: set):
+		self.items = [item for i, item in enumerate(self.items) if i not in indexes]
+
+	# merges a sorted list of items into the list in one pass (items that sort the same as ones already in the list go after them, like add())
+	def merge(self, items: list):
+		self.items = list(heapq.merge(self.items, items))
+
 # class for storing data about weekly meetings for display purposes
+# stored as a single number (minutes since the start of the week) so comparing two of them is one integer compare
 class WeeklyMeeting:
+	__slots__ = ('key',)
+	# names of the days of the week for displaying (monday is 0)
+	day_strs = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 	# constructor (day must be int between 0 and 6 (monday to sunday), hour must be int between 0 and 23, minute must be int between 0 and 59)
 	def __init__(self, day: int, hour: int, minute: int):
-		# if the day is valid
-		if day >=0 and day <= 6:
-			self.day = day
-		else:
+		# if the day is not valid
+		if day < 0 or day > 6:
 			raise ValueError(f'Day of the week must be int between 0 and 6, {day} is not')
-		
-		# if the hour is valid
-		if hour >= 0 and hour <= 23:
-			self.hour = hour
-		else:
+		# if the hour is not valid
+		if hour < 0 or hour > 23:
 			raise ValueError(f'Hour must be int between 0 and 23, {hour} is not')
-		
-		# if the minute is valid
-		if minute >= 0 and minute <= 59:
-			self.minute = minute
-		else:
+		# if the minute is not valid
+		if minute < 0 or minute > 59:
 			raise ValueError(f'Minute must be int between 0 and 59, {minute} is not')
-		
-		# string for displaying the day of the week
-		if day == 0:
-			self.day_str = 'Monday'
-		elif day == 1:
-			self.day_str = 'Tuesday'
-		elif day == 2:
-			self.day_str = 'Wednesday'
-		elif day == 3:
-			self.day_str = 'Thursday'
-		elif day == 4:
-			self.day_str = 'Friday'
-		elif day == 5:
-			self.day_str = 'Saturday'
-		elif day == 6:
-			self.day_str = 'Sunday'
-		else:
-			raise ValueError(f'Day of the week must be int between 0 and 6, {day} is not')
-		
-		# hour in 12 hour time instead of 24 and am / pm
-		if hour > 12:
-			self.hour_12 = hour - 12
-			self.ampm = 'pm'
-		elif hour == 0:
-			self.hour_12 = 12
-			self.ampm = 'am'
-		else:
-			self.hour_12 = hour
-			if hour == 12:
-				self.ampm = 'pm'
-			else:
-				self.ampm = 'am'
-		
-		# string for displaying minute with a 0 padded onto numbers with only one digit
-		if minute < 10:
-			self.min_str = '0' + str(minute)
+
+		# minutes since monday at 0:00
+		self.key = day * 1440 + hour * 60 + minute
+
+	# returns the minutes since the start of the week of a WeeklyMeeting or datetime (so they can be compared with each other)
+	def key_of(time) -> int:
+		if type(time) is WeeklyMeeting:
+			return time.key
+		elif type(time) is datetime.datetime:
+			return time.weekday() * 1440 + time.hour * 60 + time.minute
 		else:
-			self.min_str = str(minute)
-	
+			raise TypeError(f'WeeklyMeeting class does not support operations with {type(time)}, only other WeeklyMeetings and datetimes')
+
+	# day of the week (0 to 6, monday to sunday)
+	@property
+	def day(self) -> int:
+		return self.key // 1440
+
+	# hour of the day in 24 hour time
+	@property
+	def hour(self) -> int:
+		return self.key // 60 % 24
+
+	# minute of the hour
+	@property
+	def minute(self) -> int:
+		return self.key % 60
+
+	# string for displaying the day of the week
+	@property
+	def day_str(self) -> str:
+		return WeeklyMeeting.day_strs[self.day]
+
+	# hour in 12 hour time instead of 24
+	@property
+	def hour_12(self) -> int:
+		return (self.hour - 1) % 12 + 1
+
+	# am / pm of the hour
+	@property
+	def ampm(self) -> str:
+		return 'am' if self.hour < 12 else 'pm'
+
+	# string for displaying minute with a 0 padded onto numbers with only one digit
+	@property
+	def min_str(self) -> str:
+		return f'{self.minute:02}'
+
 	# string caster
 	def __str__(self):
 		return f'{self.day_str}s at {self.hour}:{self.min_str} / {self.hour_12}:{self.min_str} {self.ampm} {tzstr}'
-	
+
 	###########################################################################
 	#
 	# operator overloads
@@ -133,57 +282,43 @@ class WeeklyMeeting:
 	# equal ==
 	def __eq__(self, other) -> bool:
 		if type(other) is WeeklyMeeting:
-			return self.day == other.day and self.hour == other.hour and self.minute == other.minute
-		elif type(other) is datetime.datetime:
-			return self.day == other.weekday() and self.hour == other.hour and self.minute == other.minute
-		else:
-			raise TypeError(f'WeeklyMeeting class does not support operations with {type(other)}, only other WeeklyMeetings and datetimes')
-	
+			return self.key == other.key
+		return self.key == WeeklyMeeting.key_of(other)
+
 	# not equal !=
 	def __ne__(self, other) -> bool:
 		if type(other) is WeeklyMeeting:
-			return self.day != other.day or self.hour != other.hour or self.minute != other.minute
-		elif type(other) is datetime.datetime:
-			return self.day != other.weekday() or self.hour != other.hour or self.minute != other.minute
-		else:
-			raise TypeError(f'WeeklyMeeting class does not support operations with {type(other)}, only other WeeklyMeetings and datetimes')
-	
+			return self.key != other.key
+		return self.key != WeeklyMeeting.key_of(other)
+
 	# less than <
 	def __lt__(self, other) -> bool:
 		if type(other) is WeeklyMeeting:
-			return self.day < other.day or (self.day == other.day and (self.hour < other.hour or (self.hour == other.hour and self.minute < other.minute)))
-		elif type(other) is datetime.datetime:
-			return self.day < other.weekday() or (self.day == other.weekday() and (self.hour < other.hour or (self.hour == other.hour and self.minute < other.minute)))
-		else:
-			raise TypeError(f'WeeklyMeeting class does not support operations with {type(other)}, only other WeeklyMeetings and datetimes')
-	
+			return self.key < other.key
+		return self.key < WeeklyMeeting.key_of(other)
+
 	# less than or equal to <=
 	def __le__(self, other) -> bool:
 		if type(other) is WeeklyMeeting:
-			return self.day < other.day or (self.day == other.day and (self.hour < other.hour or (self.hour == other.hour and self.minute <= other.minute)))
-		elif type(other) is datetime.datetime:
-			return self.day < other.weekday() or (self.day == other.weekday() and (self.hour < other.hour or (self.hour == other.hour and self.minute <= other.minute)))
-		else:
-			raise TypeError(f'WeeklyMeeting class does not support operations with {type(other)}, only other WeeklyMeetings and datetimes')
-	
+			return self.key <= other.key
+		return self.key <= WeeklyMeeting.key_of(other)
+
 	# greater than >
 	def __gt__(self, other) -> bool:
 		if type(other) is WeeklyMeeting:
-			return self.day > other.day or (self.day == other.day and (self.hour > other.hour or (self.hour == other.hour and self.minute > other.minute)))
-		elif type(other) is datetime.datetime:
-			return self.day > other.weekday() or (self.day == other.weekday() and (self.hour > other.hour or (self.hour == other.hour and self.minute > other.minute)))
-		else:
-			raise TypeError(f'WeeklyMeeting class does not support operations with {type(other)}, only other WeeklyMeetings and datetimes')
-	
+			return self.key > other.key
+		return self.key > WeeklyMeeting.key_of(other)
+
 	# greater than or equal to >=
 	def __ge__(self, other) -> bool:
 		if type(other) is WeeklyMeeting:
-			return self.day > other.day or (self.day == other.day and (self.hour > other.hour or (self.hour == other.hour and self.minute >= other.minute)))
-		elif type(other) is datetime.datetime:
-			return self.day > other.weekday() or (self.day == other.weekday() and (self.hour > other.hour or (self.hour == other.hour and self.minute >= other.minute)))
-		else:
-			raise TypeError(f'WeeklyMeeting class does not support operations with {type(other)}, only other WeeklyMeetings and datetimes')
-	
+			return self.key >= other.key
+		return self.key >= WeeklyMeeting.key_of(other)
+
+	# hash (so equal weekly meetings can be used as the same dict key)
+	def __hash__(self) -> int:
+		return self.key
+
 	###########################################################################
 	#
 	# utility functions
@@ -210,33 +345,171 @@ class WeeklyMeeting:
 		
 		return time
 
+# class for storing all of a server's weekly meetings in one structure that can be used both in display order (monday to sunday)
+# and in order of when each meeting happens next
+# each meeting's id is its WeeklyMeeting key (minutes since the start of the week), and since every meeting's next occurrence is
+# within the same week, the order of next occurrences is just the display order starting from the soonest meeting and wrapping around
+class WeeklySchedule:
+	# constructor (times is a list of datetimes of each meeting's next occurrence, only the first one for each day and time is kept)
+	def __init__(self, times = ()):
+		# maps each meeting's id to the datetime of its next occurrence
+		self.times = {}
+		for time in times:
+			self.times.setdefault(WeeklyMeeting.key_of(time), time)
+		# every meeting's id in display order
+		self.keys = sorted(self.times)
+		# display index of the meeting that happens soonest
+		self.start = 0
+		if len(self.keys) > 0:
+			self.start = self.keys.index(min(self.keys, key = self.times.get))
+
+	# string caster
+	def __str__(self):
+		return str([str(meeting) for meeting in self.display_meetings()])
+
+	# number of weekly meetings
+	def __len__(self) -> int:
+		return len(self.keys)
+
+	# datetime of the next occurrence of the meeting that happens index-th soonest
+	def __getitem__(self, index: int) -> datetime.datetime:
+		if index < 0:
+			index += len(self.keys)
+		if index < 0 or index >= len(self.keys):
+			raise IndexError('weekly schedule index out of range')
+		return self.times[self.keys[(self.start + index) % len(self.keys)]]
+
+	# iterates over the datetime of the next occurrence of each meeting from soonest to latest
+	def __iter__(self):
+		for index in range(len(self.keys)):
+			yield self[index]
+
+	# turns an index in order of next occurrence into an index in display order
+	def to_display_index(self, index: int) -> int:
+		return (self.start + index) % len(self.keys)
+
+	# turns an index in display order into an index in order of next occurrence
+	def to_occurrence_index(self, display_index: int) -> int:
+		return (display_index - self.start) % len(self.keys)
+
+	# returns the WeeklyMeeting at an index in display order
+	def display_meeting(self, display_index: int) -> WeeklyMeeting:
+		key = self.keys[display_index]
+		return WeeklyMeeting(key // 1440, key // 60 % 24, key % 60)
+
+	# returns a list of every WeeklyMeeting in display order
+	def display_meetings(self) -> list:
+		return [self.display_meeting(i) for i in range(len(self.keys))]
+
+	# adds a meeting given the datetime of its next occurrence
+	# returns the index of the meeting in order of next occurrence, or none if there is already a meeting on that day and time
+	def add(self, time: datetime.datetime):
+		key = WeeklyMeeting.key_of(time)
+		if key in self.times:
+			return None
+
+		display_index = bisect.bisect_left(self.keys, key)
+		# if the new meeting happens before the soonest one, it's the soonest one now
+		if len(self.keys) > 0 and time < self[0]:
+			self.start = display_index
+		# if it was put before the soonest one in display order, the soonest one moved over by 1
+		elif len(self.keys) > 0 and display_index <= self.start:
+			self.start += 1
+		self.keys.insert(display_index, key)
+		self.times[key] = time
+		return self.to_occurrence_index(display_index)
+
+	# adds up to limit meetings given the datetimes of their next occurrences all at once, skipping any that are on the same
+	# day and time as another meeting
+	# returns how many were added
+	def merge(self, times: list, limit: int) -> int:
+		added = 0
+		for time in times:
+			if added >= limit:
+				break
+			key = WeeklyMeeting.key_of(time)
+			if key not in self.times:
+				self.times[key] = time
+				added += 1
+
+		# sort the ids once and find the soonest meeting again
+		self.keys = sorted(self.times)
+		if len(self.keys) > 0:
+			self.start = self.keys.index(min(self.keys, key = self.times.get))
+		return added
+
+	# moves the soonest meeting to its occurrence a week later, which makes it the latest one
+	def advance(self):
+		key = self.keys[self.start]
+		self.times[key] += datetime.timedelta(days = 7)
+		self.start = (self.start + 1) % len(self.keys)
+
+	# removes every meeting whose index in display order is in a set of indexes
+	# returns the set of indexes those meetings had in order of next occurrence
+	def remove_display_indexes(self, display_indexes: set) -> set:
+		removed = {self.to_occurrence_index(i) for i in display_indexes}
+		# the soonest remaining meeting is the first one at or after the old soonest one in display order (wrapping around)
+		start = sum(1 for i in range(self.start) if i not in display_indexes)
+		for i in display_indexes:
+			self.times.pop(self.keys[i])
+		self.keys = [key for i, key in enumerate(self.keys) if i not in display_indexes]
+		self.start = start % len(self.keys) if len(self.keys) > 0 else 0
+		return removed
+
 # class for storing bday dates and names
+# the date is stored as a single number (year * 10000 + month * 100 + day) so comparing two of them is one integer compare
 class BDay:
+	__slots__ = ('key', 'name')
 	# default time of day that the bot says happy birthday to people at
 	default_hour = 8
 	default_min = 0
-	# constructor
-	def __init__(self, date: datetime.date, name: str):
-		self.date = date
+
+	# constructor (leap_day makes a feb 28th date into a feb 29th bday, which is on feb 28th in years that aren't leap years)
+	def __init__(self, date: datetime.date, name: str, leap_day: bool = False):
+		day = date.day
+		if leap_day and date.month == 2 and day == 28:
+			day = 29
+		self.key = date.year * 10000 + date.month * 100 + day
 		self.name = name
-		# if the bday is on a leap day, set a flag for that to true
-		if date.day == 29 and date.month == 2:
-			self.leap_day = True
-		# if not, then false
-		else:
-			self.leap_day = False
-	
+
+	# year of the next time this bday happens
+	@property
+	def year(self) -> int:
+		return self.key // 10000
+
+	# month of the bday
+	@property
+	def month(self) -> int:
+		return self.key // 100 % 100
+
+	# day of the month of the bday
+	@property
+	def day(self) -> int:
+		return self.key % 100
+
+	# whether the bday is on a leap day (feb 29th)
+	@property
+	def leap_day(self) -> bool:
+		return self.key % 10000 == 229
+
+	# datetime of when the bot says happy birthday for this bday (leap day bdays are on feb 28th in years that aren't leap years)
+	@property
+	def date(self) -> datetime.datetime:
+		day = self.day
+		if day == 29 and self.month == 2 and not calendar.isleap(self.year):
+			day = 28
+		return datetime.datetime(self.year, self.month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
+
+	# returns a copy of this bday that happens in a different year
+	def in_year(self, year: int):
+		bday = BDay.__new__(BDay)
+		bday.key = year * 10000 + self.key % 10000
+		bday.name = self.name
+		return bday
+
 	# string caster
 	def __str__(self):
-		# if this program is being run on windows
-		if sys.platform == 'win32':
-			date_str = self.date.strftime('%b %#d')
-		# if this program is being run on linux, mac os, or any other os
-		else:
-			date_str = self.date.strftime('%b %-d')
-		
-		bday_str = f'{self.name}: {date_str}'
-		return bday_str
+		return f'{self.name}: {calendar.month_abbr[self.month]} {self.date.day}'
 	
 	###########################################################################
 	#
@@ -246,27 +519,998 @@ class BDay:
 	
 	# equal ==
 	def __eq__(self, other) -> bool:
-		return self.date == other.date and self.name == other.name
+		return self.key == other.key and self.name == other.name
 	
 	# not equal !=
 	def __ne__(self, other) -> bool:
-		return self.date != other.date or self.name != other.name
+		return self.key != other.key or self.name != other.name
 	
 	# less than <
 	def __lt__(self, other) -> bool:
-		return self.date < other.date
+		return self.key < other.key
 	
 	# less than or equal to <=
 	def __le__(self, other) -> bool:
-		return self.date <= other.date
+		return self.key <= other.key
 	
 	# greater than >
 	def __gt__(self, other) -> bool:
-		return self.date > other.date
+		return self.key > other.key
 	
 	# greater than or equal to >=
 	def __ge__(self, other) -> bool:
-		return self.date >= other.date
+		return self.key >= other.key
+
+	# hash (so equal bdays can be used as the same dict key)
+	def __hash__(self) -> int:
+		return hash((self.key, self.name))
+
+# class for firing every server's meeting and bday alerts from one shared timer heap
+# instead of keeping a sleeping task running for each kind of alert in each server
+class AlertScheduler:
+	# constructor
+	def __init__(self):
+		# min heap of (fire timestamp, server id, alert kind, token) entries
+		self.heap = []
+		# maps (server id, alert kind) to the token of its only valid entry in the heap
+		# entries with any other token are stale and get thrown away when they reach the top of the heap
+		self.tokens = {}
+		# maps (server id, alert kind) to the coroutine function to call when its entry fires
+		self.callbacks = {}
+		# gives every heap entry a unique token
+		self.counter = itertools.count()
+		# handle for the one timer that goes off when the earliest entry in the heap is due
+		self.timer = None
+		# alert tasks that are currently running (kept here so they don't get garbage collected before they finish)
+		self.running = set()
+
+	# schedules callback to be called at time for this server and alert kind, replacing any entry it already had
+	def schedule(self, server_id: int, kind: str, time: datetime.datetime, callback):
+		key = (server_id, kind)
+		token = next(self.counter)
+		self.tokens[key] = token
+		self.callbacks[key] = callback
+		heapq.heappush(self.heap, (time.timestamp(), server_id, kind, token))
+
+		# if stale entries make up most of the heap, rebuild it without them
+		if len(self.heap) > 2 * len(self.tokens) + 16:
+			self.heap = [entry for entry in self.heap if self.tokens.get((entry[1], entry[2])) == entry[3]]
+			heapq.heapify(self.heap)
+
+		# if the new entry is the earliest one, set the timer for it instead
+		if self.heap[0][3] == token:
+			self.__set_timer()
+
+	# cancels the entry for this server and alert kind if there is one
+	def cancel(self, server_id: int, kind: str):
+		# the entry itself is left in the heap and gets thrown away once it reaches the top
+		self.tokens.pop((server_id, kind), None)
+		self.callbacks.pop((server_id, kind), None)
+
+	# cancels every entry for this server
+	def cancel_server(self, server_id: int):
+		for key in [key for key in self.tokens if key[0] == server_id]:
+			self.cancel(*key)
+
+	# returns the set of ids of every server that has an entry
+	def server_ids(self) -> set:
+		return {key[0] for key in self.tokens}
+
+	# returns the timestamp of the earliest valid entry for this server, or none if it doesn't have any
+	def next_time(self, server_id: int):
+		times = [entry[0] for entry in self.heap if entry[1] == server_id and self.tokens.get((entry[1], entry[2])) == entry[3]]
+		return min(times, default = None)
+
+	# sets the timer to go off when the earliest valid entry is due, or clears it if there aren't any entries left
+	def __set_timer(self):
+		# throw away any replaced or cancelled entries at the top of the heap
+		while len(self.heap) > 0 and self.tokens.get((self.heap[0][1], self.heap[0][2])) != self.heap[0][3]:
+			heapq.heappop(self.heap)
+
+		if self.timer is not None:
+			self.timer.cancel()
+			self.timer = None
+		if len(self.heap) > 0:
+			# calculate how many seconds to wait from now until the entry is due
+			wait_time = self.heap[0][0] - datetime.datetime.now(timezone).timestamp()
+			self.timer = client.loop.call_later(max(wait_time, 0), self.__fire)
+
+	# fires every entry that is due and sets the timer for the next one
+	def __fire(self):
+		self.timer = None
+		now = datetime.datetime.now(timezone).timestamp()
+		while len(self.heap) > 0 and self.heap[0][0] <= now:
+			fire_time, server_id, kind, token = heapq.heappop(self.heap)
+			key = (server_id, kind)
+			# if this entry was replaced or cancelled, throw it away
+			if self.tokens.get(key) != token:
+				continue
+
+			# fire the alert in its own task so a slow alert doesn't hold up the others
+			self.tokens.pop(key)
+			task = client.loop.create_task(self.callbacks.pop(key)())
+			self.running.add(task)
+			task.add_done_callback(self.running.discard)
+
+		self.__set_timer()
+
+# class for running blocking file / database work on a small pool of threads so slow saves don't freeze the bot
+# work for the same server always runs one at a time in the order it was submitted
+class IOExecutor:
+	# constructor (max_workers is the most threads that can be doing file / database work at once)
+	def __init__(self, max_workers: int):
+		self.pool = concurrent.futures.ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = 'io')
+		# maps each server id to the lock that keeps its work in order
+		self.locks = {}
+
+	# runs a blocking function on the thread pool after every earlier piece of work for the same server is done and returns what it returns
+	async def run(self, server_id: int, function, *args):
+		lock = self.locks.get(server_id)
+		if lock is None:
+			lock = asyncio.Lock()
+			self.locks[server_id] = lock
+		# asyncio locks wake up waiters in the order they started waiting, so work for a server runs in order
+		async with lock:
+			return await client.loop.run_in_executor(self.pool, function, *args)
+
+	# forgets the lock for a server (for when the bot leaves a server)
+	def forget(self, server_id: int):
+		lock = self.locks.get(server_id)
+		if lock is not None and not lock.locked():
+			self.locks.pop(server_id)
+
+	# waits for all of the work that has already been submitted to finish and stops the threads
+	def shutdown(self):
+		self.pool.shutdown(wait = True)
+
+# class for saving server data a short time after it changes instead of right away
+# so a burst of changes to the same data only gets written once
+class WriteBehind:
+	# constructor (delay is how many seconds to wait after the first unsaved change before saving)
+	def __init__(self, delay: float):
+		self.delay = delay
+		# maps each ServerData object with unsaved changes to the set of its data categories that need saving
+		self.dirty = {}
+		# (ServerData, category) pairs that the running flush took out of dirty but hasn't saved yet
+		self.pending = set()
+		# handle for the scheduled flush if there is one
+		self.timer = None
+		# the task that is currently flushing if there is one
+		self.task = None
+
+	# marks a category of a server's data as changed and schedules a flush if there isn't one already
+	def mark(self, data, category: str):
+		self.dirty.setdefault(data, set()).add(category)
+		if self.timer is None:
+			self.timer = client.loop.call_later(self.delay, self.__start_flush)
+
+	# forgets about any unsaved changes to a server's data (for when its data is being deleted)
+	def discard(self, data):
+		self.dirty.pop(data, None)
+		self.pending = {(pending_data, category) for pending_data, category in self.pending if pending_data is not data}
+
+	# starts a flush unless one is already running (a running flush picks up anything that changes while it runs)
+	def __start_flush(self):
+		self.timer = None
+		if self.task is None or self.task.done():
+			self.task = client.loop.create_task(self.flush())
+
+	# saves every category of data that changed since the last flush on the io threads
+	async def flush(self):
+		# categories that couldn't be saved, which get tried again after the next delay
+		failed = []
+		try:
+			while len(self.dirty) > 0:
+				dirty = self.dirty
+				self.dirty = {}
+				self.pending = {(data, category) for data, categories in dirty.items() for category in categories}
+				# different servers save on different threads at the same time, and the io executor keeps each server's saves in order
+				await asyncio.gather(*[self.__write(data, category, failed) for data, category in self.pending])
+		finally:
+			# if the flush got cancelled (like when the bot shuts down), put back whatever didn't get saved so it still gets saved
+			for data, category in self.pending:
+				self.dirty.setdefault(data, set()).add(category)
+			self.pending = set()
+		for data, category in failed:
+			self.mark(data, category)
+
+	# saves one category of a server's data on an io thread, adding it to failed if it couldn't be saved
+	async def __write(self, data, category: str, failed: list):
+		# if the server's data got discarded before its turn, don't save it
+		if (data, category) not in self.pending:
+			return
+		# copy the data on the event loop so the io thread never reads it while it's being changed
+		function, args = data.snapshot(category)
+		try:
+			await ServerData.io.run(data.server_id, function, *args)
+		# if the data couldn't be saved, try again next time
+		except Exception as error:
+			print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Failed to save {category} for server {data.server_id}: {error}")
+			failed.append((data, category))
+		self.pending.discard((data, category))
+
+	# saves all of a server's unsaved changes right away on an io thread (for when its data is being taken out of memory)
+	async def save_now(self, data):
+		categories = self.dirty.pop(data, set())
+		for pending_data, category in list(self.pending):
+			if pending_data is data:
+				categories.add(category)
+				self.pending.discard((pending_data, category))
+		if len(categories) < 1:
+			return
+
+		# copy every category now and save them all in one go so nothing for this server can run in between
+		snapshots = [(category, *data.snapshot(category)) for category in categories]
+		def save_all():
+			for category, function, args in snapshots:
+				function(*args)
+		try:
+			await ServerData.io.run(data.server_id, save_all)
+		# if the data couldn't be saved, try again next flush
+		except Exception as error:
+			print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Failed to save server {data.server_id}: {error}")
+			for category in categories:
+				self.mark(data, category)
+
+	# saves everything that is waiting to be saved right away on this thread (for when the bot is shutting down and the event loop is gone)
+	def flush_now(self):
+		if self.timer is not None:
+			self.timer.cancel()
+			self.timer = None
+
+		dirty = self.dirty
+		self.dirty = {}
+		for data, categories in dirty.items():
+			for category in categories:
+				function, args = data.snapshot(category)
+				try:
+					function(*args)
+				except Exception as error:
+					print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Failed to save {category} for server {data.server_id}: {error}")
+
+# class for a token bucket rate limit that allows up to rate actions in any period of per seconds
+# each token comes back per seconds after it was taken (instead of tokens trickling back at a steady rate), so a burst of
+# rate actions can't be followed by more before the period is over
+class TokenBucket:
+	# constructor
+	def __init__(self, rate: int, per: float):
+		self.capacity = rate
+		self.per = per
+		# times that each of the tokens that have been taken come back, from soonest to latest
+		self.returns = collections.deque()
+
+	# puts back the tokens that have come back by now
+	def __refill(self, now: float):
+		while len(self.returns) > 0 and self.returns[0] <= now:
+			self.returns.popleft()
+
+	# takes a token and returns 0 if there is one, otherwise returns how many seconds until there will be one
+	def take(self, now: float) -> float:
+		self.__refill(now)
+		if len(self.returns) < self.capacity:
+			self.returns.append(now + self.per)
+			return 0.0
+
+		return self.returns[0] - now
+
+	# returns whether the bucket has all of its tokens (so forgetting it wouldn't change anything)
+	def full(self, now: float) -> bool:
+		self.__refill(now)
+		return len(self.returns) < 1
+
+# class for sending every message and reaction the bot sends in channels through one queue with a few workers
+# so bursts of sends (like a lot of servers having a meeting at the same time) get spread out under discord's rate limits
+# instead of running into them, with alerts going out before command replies and command replies going out before reactions
+class SendDispatcher:
+	# priority lanes that sends can be submitted in (lower lanes go first)
+	alert = 0
+	reply = 1
+	reaction = 2
+	lane_names = ('alert', 'reply', 'reaction')
+
+	# constructor
+	# workers is the most sends that can be running at once
+	# up to global_rate sends can go out every global_per seconds in total, and up to channel_rate every channel_per seconds in each channel
+	def __init__(self, workers: int, global_rate: int, global_per: float, channel_rate: int, channel_per: float):
+		self.workers = workers
+		self.global_bucket = TokenBucket(global_rate, global_per)
+		self.channel_rate = channel_rate
+		self.channel_per = channel_per
+		# maps each channel id to its token bucket (buckets get forgotten once their channel is idle and they're full again)
+		self.channel_buckets = {}
+		# maps each channel id with sends waiting (or being sent) to a heap of (lane, order, function, args, future, submit time)
+		# entries for each of its sends that are waiting
+		self.pending = {}
+		# queue of (lane, order, channel id) entries for channels that have sends waiting
+		# each channel only has one entry in it that counts at a time, so the sends in a channel go out one at a time and in order
+		self.queue = asyncio.PriorityQueue()
+		# maps each channel id that is waiting in the queue (or waiting for its rate limit to be put back in it) to the
+		# (lane, order) of its entry that counts (any other entries for it are old and get skipped)
+		self.queued = {}
+		# gives every send a number so sends in the same lane go out in the order they were submitted
+		self.counter = itertools.count()
+		# worker tasks (started the first time something is submitted)
+		self.tasks = []
+		# stats for each lane: how many sends are waiting, how many have gone out, and the total / max seconds they waited
+		self.depth = [0, 0, 0]
+		self.sent = [0, 0, 0]
+		self.wait_total = [0.0, 0.0, 0.0]
+		self.wait_max = [0.0, 0.0, 0.0]
+		# how many sends failed
+		self.failed = 0
+
+	# submits a send (a coroutine function like channel.send and its arguments) to go out in a channel
+	# returns a future that is set to true once it's sent or false if sending it failed (waiting for it is optional)
+	def submit(self, lane: int, channel_id: int, function, *args) -> asyncio.Future:
+		# start the workers the first time something is submitted
+		if len(self.tasks) < 1:
+			self.tasks = [client.loop.create_task(self.__work()) for _ in range(self.workers)]
+
+		future = client.loop.create_future()
+		order = next(self.counter)
+		heap = self.pending.get(channel_id)
+		# if the channel doesn't have any sends waiting, put it in the queue
+		if heap is None:
+			heap = []
+			self.pending[channel_id] = heap
+			self.queued[channel_id] = (lane, order)
+			self.queue.put_nowait((lane, order, channel_id))
+		# if the channel is waiting in the queue behind sends in a higher lane, move it up to this send's lane
+		elif channel_id in self.queued and lane < self.queued[channel_id][0]:
+			self.queued[channel_id] = (lane, order)
+			self.queue.put_nowait((lane, order, channel_id))
+
+		heapq.heappush(heap, (lane, order, function, args, future, client.loop.time()))
+		self.depth[lane] += 1
+		return future
+
+	# takes channels off the queue and sends the next send waiting in each one
+	async def __work(self):
+		while True:
+			lane, order, channel_id = await self.queue.get()
+			# skip entries for channels that were moved up to a lower lane since
+			if self.queued.get(channel_id) != (lane, order):
+				continue
+			now = client.loop.time()
+			bucket = self.channel_buckets.get(channel_id)
+			if bucket is None:
+				bucket = TokenBucket(self.channel_rate, self.channel_per)
+				self.channel_buckets[channel_id] = bucket
+
+			# if the channel has used up its sends for now, put it back in the queue once it has one again
+			# (so this worker can send in other channels instead of waiting)
+			delay = bucket.take(now)
+			if delay > 0:
+				client.loop.call_later(delay, self.queue.put_nowait, (lane, order, channel_id))
+				continue
+			self.queued.pop(channel_id)
+
+			# wait until a send is allowed under the global rate limit
+			delay = self.global_bucket.take(now)
+			while delay > 0:
+				await asyncio.sleep(delay)
+				delay = self.global_bucket.take(client.loop.time())
+
+			# take the next send in the channel (which can be in a higher lane than the entry in the queue if one was submitted since)
+			heap = self.pending[channel_id]
+			lane, order, function, args, future, submit_time = heapq.heappop(heap)
+			self.depth[lane] -= 1
+			wait = client.loop.time() - submit_time
+			self.sent[lane] += 1
+			self.wait_total[lane] += wait
+			self.wait_max[lane] = max(self.wait_max[lane], wait)
+
+			try:
+				await function(*args)
+				result = True
+			except Exception as error:
+				self.failed += 1
+				print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Failed to send in channel {channel_id}: {error}")
+				result = False
+
+			if not future.done():
+				future.set_result(result)
+
+			# if the channel has more sends waiting, put it back in the queue for the next one
+			if len(heap) > 0:
+				self.queued[channel_id] = (heap[0][0], heap[0][1])
+				self.queue.put_nowait((heap[0][0], heap[0][1], channel_id))
+			# if it doesn't, forget it and forget its bucket once it's full again
+			else:
+				self.pending.pop(channel_id)
+				client.loop.call_later(self.channel_per, self.__forget_bucket, channel_id)
+
+	# forgets the bucket of a channel if it doesn't have any sends waiting and it's full
+	def __forget_bucket(self, channel_id: int):
+		bucket = self.channel_buckets.get(channel_id)
+		if bucket is not None and channel_id not in self.pending and bucket.full(client.loop.time()):
+			self.channel_buckets.pop(channel_id)
+
+	# returns a line of stats about how many sends are waiting and how long sends have waited in each lane
+	def stats(self) -> str:
+		lanes = []
+		for lane, name in enumerate(SendDispatcher.lane_names):
+			average = self.wait_total[lane] / self.sent[lane] if self.sent[lane] > 0 else 0.0
+			lanes.append(f"{name}: {self.depth[lane]} waiting, {self.sent[lane]} sent, {average:.3f}s average wait, {self.wait_max[lane]:.3f}s max wait")
+		return '; '.join(lanes) + f"; {self.failed} failed"
+
+# class for remembering the permissions the bot has in each channel and the first channel in each server that it can send messages in
+# (working out the bot's permissions goes through all of its roles and the channel's permission overwrites every time)
+# a server's entries get thrown out when a channel, role, or the bot's member in it changes, and after a time limit in case
+# discord didn't send an event for a change (the bot doesn't get member updates without the members intent)
+class PermissionCache:
+	# constructor
+	# ttl is how many seconds a server's entries are kept for at most
+	def __init__(self, ttl: float):
+		self.ttl = ttl
+		# maps each server id to [the time its entries run out, {channel id: the bot's permissions in the channel}, the id of the
+		# first channel it can send messages in (None if there isn't one, 0 if it hasn't been looked for yet)]
+		self.servers = {}
+		# how many lookups were answered from the cache and how many had to work the permissions out
+		self.hits = 0
+		self.misses = 0
+
+	# returns the entries for a server, starting new ones if it doesn't have any or its old ones ran out
+	def __entry(self, server) -> list:
+		now = client.loop.time()
+		entry = self.servers.get(server.id)
+		if entry is None or entry[0] <= now:
+			entry = [now + self.ttl, {}, 0]
+			self.servers[server.id] = entry
+		return entry
+
+	# returns the permissions the bot has in a channel
+	def channel_permissions(self, channel) -> discord.Permissions:
+		channels = self.__entry(channel.guild)[1]
+		perms = channels.get(channel.id)
+		if perms is not None:
+			self.hits += 1
+			return perms
+
+		self.misses += 1
+		perms = channel.permissions_for(channel.guild.me)
+		channels[channel.id] = perms
+		return perms
+
+	# returns the first text channel in a server that the bot has permission to send messages in, returns none if there are none
+	def first_message_channel(self, server):
+		entry = self.__entry(server)
+		# if it was already looked for (and the channel is still there)
+		if entry[2] is None:
+			self.hits += 1
+			return None
+		if entry[2] != 0:
+			channel = server.get_channel(entry[2])
+			if channel is not None:
+				self.hits += 1
+				return channel
+
+		self.misses += 1
+		entry[2] = None
+		for channel in server.text_channels:
+			if self.channel_permissions(channel).send_messages:
+				entry[2] = channel.id
+				return channel
+
+	# throws out everything remembered about a server
+	def invalidate(self, server_id: int):
+		self.servers.pop(server_id, None)
+
+	# throws out everything remembered about every server (for after the bot reconnects and could have missed events)
+	def clear(self):
+		self.servers.clear()
+
+	# returns a line of stats about how many lookups the cache answered
+	def stats(self) -> str:
+		total = self.hits + self.misses
+		rate = self.hits / total * 100 if total > 0 else 0.0
+		return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), {len(self.servers)} servers cached"
+
+# class for saving server data as a folder of flat files for each server
+class FileStorage:
+	# string format for datetimes in old text file saves (only used for reading files saved before the compact format)
+	dtfstr = '%Y-%m-%d %H:%M:%S %z'
+	# marks the start of meetings and weekly meetings files saved in the compact binary format
+	# (after it comes the index and then the timestamp of each meeting, all as 64 bit little endian integers)
+	times_magic = b'CMB\x02'
+	# first line of bdays files saved in the compact text format (every line after it is "<timestamp> <leap day> <name>", where
+	# leap day is 1 for bdays on feb 29th so they don't turn into feb 28th bdays when they're saved in a year that isn't a leap year)
+	bdays_magic = '#CMB3'
+	# first line of bdays files saved in the compact text format before it had leap days (every line after it is "<timestamp> <name>")
+	old_bdays_magic = '#CMB2'
+	# file names for each type of data
+	meetings_file = 'meetings.lst'
+	weekly_file = 'weekly_meetings.lst'
+	agenda_file = 'agenda_order.lst'
+	minutes_file = 'minutes_order.lst'
+	alert_file = 'alert_channel.cfg'
+	bdays_file = 'bdays.lst'
+
+	# constructor (root is the directory that every server's folder goes in)
+	def __init__(self, root: str):
+		self.root = root
+
+	# returns the path to one of a server's data files
+	def __path(self, server_id: int, file_name: str) -> str:
+		return f'{self.root}/{server_id}/{file_name}'
+
+	# creates the folder and data files for a server if they don't already exist
+	def create_server(self, server_id: int):
+		folder_name = f'{self.root}/{server_id}'
+		# if the folder for this server's data doesn't exist, make it (and the root folder if that doesn't exist either)
+		if not os.path.isdir(folder_name):
+			os.makedirs(folder_name)
+
+		# if any of the server's data files don't exist, make them
+		for file_name in [FileStorage.meetings_file, FileStorage.weekly_file, FileStorage.agenda_file, FileStorage.minutes_file, FileStorage.alert_file, FileStorage.bdays_file]:
+			path = self.__path(server_id, file_name)
+			if not os.path.isfile(path):
+				Path(path).touch()
+
+	# deletes the folder and all files in it for a server if the folder exists
+	def delete_server(self, server_id: int):
+		folder_name = f'{self.root}/{server_id}'
+		if os.path.isdir(folder_name):
+			shutil.rmtree(folder_name)
+
+	# returns the ids of every server that has a data folder
+	def server_ids(self) -> list:
+		if not os.path.isdir(self.root):
+			return []
+		return [int(name) for name in os.listdir(self.root) if name.isnumeric()]
+
+	###########################################################################
+	#
+	# saving functions
+	#
+	###########################################################################
+
+	# writes an index and a list of datetimes to a data file in the compact binary format
+	def __save_times(self, path: str, index: int, times):
+		numbers = array.array('q', [index])
+		numbers.extend(int(time.timestamp()) for time in times)
+		if sys.byteorder == 'big':
+			numbers.byteswap()
+
+		with open(path, 'wb') as file:
+			file.write(FileStorage.times_magic + numbers.tobytes())
+
+	# writes an index and a list of names to a data file
+	def __save_names(self, path: str, index: int, names: list):
+		file_lines = ''
+		# combine every item in the list into a newline separated string
+		for name in names:
+			file_lines += name + '\n'
+
+		# write the index and the items to the data file
+		with open(path, 'w', encoding='utf8') as file:
+			file.write(f'{index}\n')
+			file.write(file_lines)
+
+	# saves a server's meeting index and meetings list to its meetings file
+	def save_meetings(self, server_id: int, index: int, meetings):
+		self.__save_times(self.__path(server_id, FileStorage.meetings_file), index, meetings)
+
+	# saves a server's weekly meeting index and weekly meetings list to its weekly meetings file
+	def save_weekly_meetings(self, server_id: int, index: int, meetings):
+		self.__save_times(self.__path(server_id, FileStorage.weekly_file), index, meetings)
+
+	# saves a server's agenda index and agenda order list to its agenda order file
+	def save_agenda(self, server_id: int, index: int, names: list):
+		self.__save_names(self.__path(server_id, FileStorage.agenda_file), index, names)
+
+	# saves a server's minutes index and meeting minutes order list to its minutes order file
+	def save_minutes(self, server_id: int, index: int, names: list):
+		self.__save_names(self.__path(server_id, FileStorage.minutes_file), index, names)
+
+	# saves the id of a server's alert channel (or nothing if it doesn't have one) to its alert channel file
+	def save_alert_channel(self, server_id: int, channel_id):
+		with open(self.__path(server_id, FileStorage.alert_file), 'w') as file:
+			if channel_id is not None:
+				file.write(f'{channel_id}\n')
+
+	# saves a server's birthdays to its bdays file in the compact text format
+	def save_bdays(self, server_id: int, bdays):
+		# combine every item in the list into a newline separated string
+		file_lines = [FileStorage.bdays_magic]
+		for bday in bdays:
+			file_lines.append(f'{int(bday.date.timestamp())} {int(bday.leap_day)} {bday.name}')
+
+		# write the dates to the bdays file
+		with open(self.__path(server_id, FileStorage.bdays_file), 'w', encoding='utf8') as file:
+			file.write('\n'.join(file_lines) + '\n')
+
+	###########################################################################
+	#
+	# reading functions
+	#
+	###########################################################################
+
+	# reads an index and a list of datetimes from a data file saved in either the compact or the old text format
+	# returns the index (0 if it isn't a valid number) and a list of every datetime that could be read
+	def __read_times(self, path: str):
+		with open(path, 'rb') as file:
+			contents = file.read()
+
+		# if the file is in the compact format, unpack the index and timestamps
+		if contents.startswith(FileStorage.times_magic):
+			numbers = array.array('q')
+			body = contents[len(FileStorage.times_magic):]
+			# ignore a partly written number at the end
+			numbers.frombytes(body[:len(body) - len(body) % numbers.itemsize])
+			if sys.byteorder == 'big':
+				numbers.byteswap()
+			if len(numbers) < 1:
+				return 0, []
+			return max(numbers[0], 0), [datetime.datetime.fromtimestamp(timestamp, timezone) for timestamp in numbers[1:]]
+
+		# otherwise read it as the old text format
+		lines = contents.decode().splitlines()
+		index = 0
+		times = []
+		# if the file wasn't empty
+		if len(lines) > 0:
+			# if the first line is a positive integer, use it as the index
+			if lines[0].strip().isnumeric():
+				index = int(lines[0].strip())
+
+			# get the date and time of each line after the index
+			for line in lines[1:]:
+				try:
+					times.append(datetime.datetime.strptime(line.strip(), FileStorage.dtfstr))
+				# just do the next line if this one is wrong
+				except:
+					continue
+
+		return index, times
+
+	# reads an index and a list of names from a data file
+	# returns the index (none if it isn't a valid number) and the list of names
+	def __read_names(self, path: str):
+		with open(path, 'r', encoding='utf8') as file:
+			lines = file.readlines()
+
+		# if the file was empty
+		if len(lines) <= 0:
+			return None, []
+
+		index = lines[0].strip()
+		# remove the newline from each name
+		names = [line.strip() for line in lines[1:]]
+		# if the index is a positive integer
+		if index.isnumeric():
+			return int(index), names
+		else:
+			return None, names
+
+	# reads a server's meeting index and meetings list
+	def read_meetings(self, server_id: int):
+		return self.__read_times(self.__path(server_id, FileStorage.meetings_file))
+
+	# reads a server's weekly meeting index and weekly meetings list
+	def read_weekly_meetings(self, server_id: int):
+		return self.__read_times(self.__path(server_id, FileStorage.weekly_file))
+
+	# reads a server's agenda index and agenda order list
+	def read_agenda(self, server_id: int):
+		return self.__read_names(self.__path(server_id, FileStorage.agenda_file))
+
+	# reads a server's minutes index and meeting minutes order list
+	def read_minutes(self, server_id: int):
+		return self.__read_names(self.__path(server_id, FileStorage.minutes_file))
+
+	# reads the id of a server's alert channel, returns none if there isn't a valid one saved
+	def read_alert_channel(self, server_id: int):
+		with open(self.__path(server_id, FileStorage.alert_file), 'r') as file:
+			channel_id = file.read().strip()
+
+		if channel_id.isnumeric():
+			return int(channel_id)
+		else:
+			return None
+
+	# reads a server's birthdays as a list of (name, datetime, leap day) tuples from either the compact or the old text formats,
+	# skipping any lines that can't be read
+	def read_bdays(self, server_id: int) -> list:
+		with open(self.__path(server_id, FileStorage.bdays_file), 'r', encoding='utf8') as file:
+			lines = file.read().splitlines()
+
+		bdays = []
+		# if the file is in the compact format, each line is a timestamp, whether it's a leap day, and then the name
+		if len(lines) > 0 and lines[0] == FileStorage.bdays_magic:
+			for line in lines[1:]:
+				timestamp, _, line = line.partition(' ')
+				leap_day, _, name = line.partition(' ')
+				try:
+					bdays.append((name, datetime.datetime.fromtimestamp(int(timestamp), timezone), leap_day == '1'))
+				# do the next line if this one is wrong
+				except ValueError:
+					continue
+			return bdays
+
+		# if the file is in the compact format from before it had leap days, each line is a timestamp and then the name
+		if len(lines) > 0 and lines[0] == FileStorage.old_bdays_magic:
+			for line in lines[1:]:
+				timestamp, _, name = line.partition(' ')
+				try:
+					bdays.append((name, datetime.datetime.fromtimestamp(int(timestamp), timezone), False))
+				# do the next line if this one is wrong
+				except ValueError:
+					continue
+			return bdays
+
+		# otherwise read it as the old text format
+		for line in lines:
+			# get the name and datetime of the bday
+			try:
+				# assume the name of the bday goes up to the 25th last character, which is where the datetime should begin
+				index = -25
+				name = line[:index].strip()
+				# get the datetime of the bday
+				date = datetime.datetime.strptime(line[index:].strip(), FileStorage.dtfstr)
+			# do the next line if this one is wrong
+			except:
+				continue
+
+			bdays.append((name, date, False))
+
+		return bdays
+
+	# returns a dict of each server id to the timestamp of its soonest saved meeting, weekly meeting, or bday
+	def next_alert_times(self) -> dict:
+		alert_times = {}
+		for server_id in self.server_ids():
+			try:
+				times = self.read_meetings(server_id)[1][:1] + self.read_weekly_meetings(server_id)[1][:1] + [date for name, date, leap_day in self.read_bdays(server_id)]
+			# skip servers whose files are missing
+			except OSError:
+				continue
+			if len(times) > 0:
+				alert_times[server_id] = min(times).timestamp()
+
+		return alert_times
+
+# decorator for the saving functions of SQLiteStorage that runs each save in its own transaction
+# if the transaction is rolled back, the copy of what was last saved for the server is thrown out along with it (otherwise
+# the copy would say the changes are in the database and the next save would skip them), so the next save writes everything
+def sqlite_transaction(save):
+	@functools.wraps(save)
+	def wrapper(self, server_id: int, *args):
+		with self.lock:
+			try:
+				with self.connection:
+					save(self, server_id, *args)
+			except BaseException:
+				self.forget_saved(server_id)
+				raise
+	return wrapper
+
+# class for saving every server's data in a single sqlite database file
+# keeps a copy of what it last saved for each server so each save only writes the rows that changed
+class SQLiteStorage:
+	# constructor (path is the database file, which gets created if it doesn't exist)
+	def __init__(self, path: str):
+		self.path = path
+		# the connection gets used by the io threads, so only let one thread use it at a time
+		self.connection = sqlite3.connect(path, check_same_thread = False)
+		self.lock = threading.Lock()
+		# write ahead logging lets saves append to a log instead of rewriting pages of the database
+		self.connection.execute('PRAGMA journal_mode=WAL')
+		self.connection.execute('PRAGMA synchronous=NORMAL')
+		with self.lock, self.connection:
+			self.connection.executescript('''
+				CREATE TABLE IF NOT EXISTS servers (
+					id INTEGER PRIMARY KEY,
+					meeting_index INTEGER NOT NULL DEFAULT 0,
+					weekly_meeting_index INTEGER NOT NULL DEFAULT 0,
+					agenda_index INTEGER NOT NULL DEFAULT 0,
+					minutes_index INTEGER NOT NULL DEFAULT 0,
+					alert_channel INTEGER
+				);
+				CREATE TABLE IF NOT EXISTS meetings (
+					server_id INTEGER NOT NULL,
+					time INTEGER NOT NULL,
+					PRIMARY KEY (server_id, time)
+				) WITHOUT ROWID;
+				CREATE TABLE IF NOT EXISTS weekly_meetings (
+					server_id INTEGER NOT NULL,
+					time INTEGER NOT NULL,
+					PRIMARY KEY (server_id, time)
+				) WITHOUT ROWID;
+				CREATE TABLE IF NOT EXISTS agenda_order (
+					server_id INTEGER NOT NULL,
+					position INTEGER NOT NULL,
+					name TEXT NOT NULL,
+					PRIMARY KEY (server_id, position)
+				) WITHOUT ROWID;
+				CREATE TABLE IF NOT EXISTS minutes_order (
+					server_id INTEGER NOT NULL,
+					position INTEGER NOT NULL,
+					name TEXT NOT NULL,
+					PRIMARY KEY (server_id, position)
+				) WITHOUT ROWID;
+				CREATE TABLE IF NOT EXISTS bdays (
+					server_id INTEGER NOT NULL,
+					name TEXT NOT NULL,
+					date INTEGER NOT NULL,
+					leap_day INTEGER NOT NULL DEFAULT 0,
+					PRIMARY KEY (server_id, name, date)
+				) WITHOUT ROWID;
+			''')
+			# databases made before bdays had the leap day column get it added (every bday in them is taken as not being on a leap day)
+			columns = [row[1] for row in self.connection.execute('PRAGMA table_info(bdays)')]
+			if 'leap_day' not in columns:
+				self.connection.execute('ALTER TABLE bdays ADD COLUMN leap_day INTEGER NOT NULL DEFAULT 0')
+		# maps (table, server id) to what was last saved to or read from that table for that server
+		self.saved = {}
+
+	# creates the row for a server if it doesn't already exist
+	def create_server(self, server_id: int):
+		with self.lock, self.connection:
+			self.connection.execute('INSERT OR IGNORE INTO servers (id) VALUES (?)', (server_id,))
+
+	# deletes all of a server's data
+	def delete_server(self, server_id: int):
+		with self.lock, self.connection:
+			for table in ['meetings', 'weekly_meetings', 'agenda_order', 'minutes_order', 'bdays']:
+				self.connection.execute(f'DELETE FROM {table} WHERE server_id = ?', (server_id,))
+			self.connection.execute('DELETE FROM servers WHERE id = ?', (server_id,))
+			self.forget_saved(server_id)
+
+	# throws out the copy of what was last saved for a server, so the next save of each table writes all of its data
+	def forget_saved(self, server_id: int):
+		for table in ['servers', 'meetings', 'weekly_meetings', 'agenda_order', 'minutes_order', 'bdays']:
+			self.saved.pop((table, server_id), None)
+
+	# returns the ids of every server that has data saved
+	def server_ids(self) -> list:
+		with self.lock:
+			return [row[0] for row in self.connection.execute('SELECT id FROM servers')]
+
+	# sets one of the index / alert channel columns in a server's row if it changed since it was last saved
+	def __save_column(self, server_id: int, column: str, value):
+		key = ('servers', server_id)
+		columns = self.saved.setdefault(key, {})
+		if column not in columns or columns[column] != value:
+			self.connection.execute(f'UPDATE servers SET {column} = ? WHERE id = ?', (value, server_id))
+			columns[column] = value
+
+	# saves a set of rows for a server by only inserting the new ones and deleting the missing ones
+	def __save_rows(self, table: str, columns: str, server_id: int, rows: set):
+		key = (table, server_id)
+		old_rows = self.saved.get(key)
+		# if this table hasn't been read or saved for this server yet, clear it out and write every row
+		if old_rows is None:
+			self.connection.execute(f'DELETE FROM {table} WHERE server_id = ?', (server_id,))
+			old_rows = set()
+
+		placeholders = ', '.join('?' for _ in range(columns.count(',') + 2))
+		condition = ' AND '.join(f'{column.strip()} = ?' for column in columns.split(','))
+		self.connection.executemany(f'DELETE FROM {table} WHERE server_id = ? AND {condition}', [(server_id, *row) for row in old_rows - rows])
+		self.connection.executemany(f'INSERT OR REPLACE INTO {table} (server_id, {columns}) VALUES ({placeholders})', [(server_id, *row) for row in rows - old_rows])
+		self.saved[key] = rows
+
+	###########################################################################
+	#
+	# saving functions
+	#
+	###########################################################################
+
+	# saves a server's meeting index and meetings list
+	@sqlite_transaction
+	def save_meetings(self, server_id: int, index: int, meetings):
+		self.__save_column(server_id, 'meeting_index', index)
+		self.__save_rows('meetings', 'time', server_id, {(int(meeting.timestamp()),) for meeting in meetings})
+
+	# saves a server's weekly meeting index and weekly meetings list
+	@sqlite_transaction
+	def save_weekly_meetings(self, server_id: int, index: int, meetings):
+		self.__save_column(server_id, 'weekly_meeting_index', index)
+		self.__save_rows('weekly_meetings', 'time', server_id, {(int(meeting.timestamp()),) for meeting in meetings})
+
+	# saves a server's agenda index and agenda order list
+	@sqlite_transaction
+	def save_agenda(self, server_id: int, index: int, names: list):
+		self.__save_column(server_id, 'agenda_index', index)
+		self.__save_rows('agenda_order', 'position, name', server_id, set(enumerate(names)))
+
+	# saves a server's minutes index and meeting minutes order list
+	@sqlite_transaction
+	def save_minutes(self, server_id: int, index: int, names: list):
+		self.__save_column(server_id, 'minutes_index', index)
+		self.__save_rows('minutes_order', 'position, name', server_id, set(enumerate(names)))
+
+	# saves the id of a server's alert channel (or none if it doesn't have one)
+	@sqlite_transaction
+	def save_alert_channel(self, server_id: int, channel_id):
+		self.__save_column(server_id, 'alert_channel', channel_id)
+
+	# saves a server's birthdays
+	@sqlite_transaction
+	def save_bdays(self, server_id: int, bdays):
+		self.__save_rows('bdays', 'name, date, leap_day', server_id, {(bday.name, int(bday.date.timestamp()), int(bday.leap_day)) for bday in bdays})
+
+	###########################################################################
+	#
+	# reading functions
+	#
+	###########################################################################
+
+	# reads one of the index / alert channel columns from a server's row
+	def __read_column(self, server_id: int, column: str):
+		row = self.connection.execute(f'SELECT {column} FROM servers WHERE id = ?', (server_id,)).fetchone()
+		value = row[0] if row is not None else None
+		self.saved.setdefault(('servers', server_id), {})[column] = value
+		return value
+
+	# reads every row of a table for a server, sorted by the given columns
+	def __read_rows(self, table: str, columns: str, server_id: int) -> list:
+		rows = self.connection.execute(f'SELECT {columns} FROM {table} WHERE server_id = ? ORDER BY {columns}', (server_id,)).fetchall()
+		self.saved[(table, server_id)] = set(rows)
+		return rows
+
+	# reads a server's meeting index and meetings list
+	def read_meetings(self, server_id: int):
+		with self.lock:
+			index = self.__read_column(server_id, 'meeting_index') or 0
+			return index, [datetime.datetime.fromtimestamp(row[0], timezone) for row in self.__read_rows('meetings', 'time', server_id)]
+
+	# reads a server's weekly meeting index and weekly meetings list
+	def read_weekly_meetings(self, server_id: int):
+		with self.lock:
+			index = self.__read_column(server_id, 'weekly_meeting_index') or 0
+			return index, [datetime.datetime.fromtimestamp(row[0], timezone) for row in self.__read_rows('weekly_meetings', 'time', server_id)]
+
+	# reads a server's agenda index and agenda order list
+	def read_agenda(self, server_id: int):
+		with self.lock:
+			return self.__read_column(server_id, 'agenda_index'), [row[1] for row in self.__read_rows('agenda_order', 'position, name', server_id)]
+
+	# reads a server's minutes index and meeting minutes order list
+	def read_minutes(self, server_id: int):
+		with self.lock:
+			return self.__read_column(server_id, 'minutes_index'), [row[1] for row in self.__read_rows('minutes_order', 'position, name', server_id)]
+
+	# reads the id of a server's alert channel, returns none if there isn't one saved
+	def read_alert_channel(self, server_id: int):
+		with self.lock:
+			return self.__read_column(server_id, 'alert_channel')
+
+	# reads a server's birthdays as a list of (name, datetime, leap day) tuples
+	def read_bdays(self, server_id: int) -> list:
+		with self.lock:
+			return [(row[0], datetime.datetime.fromtimestamp(row[1], timezone), row[2] == 1) for row in self.__read_rows('bdays', 'name, date, leap_day', server_id)]
+
+	# returns a dict of each server id to the timestamp of its soonest saved meeting, weekly meeting, or bday
+	def next_alert_times(self) -> dict:
+		with self.lock:
+			rows = self.connection.execute('''
+				SELECT server_id, MIN(time) FROM (
+					SELECT server_id, MIN(time) AS time FROM meetings GROUP BY server_id
+					UNION ALL SELECT server_id, MIN(time) FROM weekly_meetings GROUP BY server_id
+					UNION ALL SELECT server_id, MIN(date) FROM bdays GROUP BY server_id
+				) GROUP BY server_id
+			''').fetchall()
+		return dict(rows)
+
+	###########################################################################
+	#
+	# utility functions
+	#
+	###########################################################################
+
+	# copies every server's data from another storage engine into this database
+	def import_from(self, source):
+		for server_id in source.server_ids():
+			self.create_server(server_id)
+			self.save_meetings(server_id, *source.read_meetings(server_id))
+			self.save_weekly_meetings(server_id, *source.read_weekly_meetings(server_id))
+			agenda_index, agenda_order = source.read_agenda(server_id)
+			self.save_agenda(server_id, agenda_index or 0, agenda_order)
+			minutes_index, minutes_order = source.read_minutes(server_id)
+			self.save_minutes(server_id, minutes_index or 0, minutes_order)
+			self.save_alert_channel(server_id, source.read_alert_channel(server_id))
+			self.save_bdays(server_id, [BDay(date, name, leap_day) for name, date, leap_day in source.read_bdays(server_id)])
 
 # class for storing a server's data (like agenda order list and meeting times)
 class ServerData:
@@ -276,10 +1520,12 @@ class ServerData:
 	#
 	###########################################################################
 
-	# directory name of all server data
+	# directory name of all server data (when it's saved as files)
 	server_root = 'server_data'
-	# string format for datetimes in file saves
-	dtfstr = '%Y-%m-%d %H:%M:%S %z'
+	# file name of the database of all server data (when it's saved with sqlite)
+	database_file = 'server_data.db'
+	# storage engine that saves and reads server data (set up when the bot starts)
+	storage = None
 	# max number of servers that the bot can be in (to save drive and ram space)
 	max_servers = 100
 	# max amounts of each type of data (to save drive and ram space)
@@ -288,15 +1534,47 @@ class ServerData:
 	max_agenda_order = 50
 	max_minutes_order = 50
 	max_bdays = 50
+	# max size in bytes of a file of meetings / bdays to add all at once (to save ram)
+	max_bulk_add_file_size = 64 * 1024
+	# max size in bytes of a calendar (.ics) file to import (calendar apps put a lot more in them than the bot uses)
+	max_import_file_size = 1024 * 1024
+	# number of minutes meetings last in exported calendars (the bot only keeps track of when they start)
+	export_meeting_mins = 60
 	# number of minutes before a meeting that the bot sends a meeting soon alert
 	soon_mins = 30
-	# file names for each type of data
-	meetings_file = 'meetings.lst'
-	weekly_file = 'weekly_meetings.lst'
-	agenda_file = 'agenda_order.lst'
-	minutes_file = 'minutes_order.lst'
-	alert_file = 'alert_channel.cfg'
-	bdays_file = 'bdays.lst'
+	# process-wide scheduler that fires the meeting and bday alerts for every server
+	scheduler = AlertScheduler()
+	# number of seconds the bot waits after data changes before saving it, so a burst of changes only gets saved once
+	save_delay = 0.25
+	# process-wide writer that saves the changed data of every server
+	writer = WriteBehind(save_delay)
+	# number of threads that do file / database work so it doesn't freeze the bot
+	io_threads = 4
+	# process-wide pool of threads that runs all of the file / database work for every server
+	io = IOExecutor(io_threads)
+	# max number of messages / reactions that get sent at the same time
+	send_workers = 4
+	# rate limits the bot keeps its messages / reactions under (as number of sends per number of seconds)
+	# discord allows about 50 requests a second in total and 5 messages every 5 seconds in each channel
+	global_send_rate = (50, 1.0)
+	channel_send_rate = (5, 5.0)
+	# process-wide dispatcher that sends every message and reaction in a channel for every server
+	sender = SendDispatcher(send_workers, *global_send_rate, *channel_send_rate)
+	# max number of seconds the bot's permissions in a server's channels are remembered for (they're also forgotten whenever they might have changed)
+	permission_cache_secs = 60
+	# process-wide cache of the bot's permissions in each channel and the first channel in each server it can send messages in
+	permissions = PermissionCache(permission_cache_secs)
+	# max number of servers that get their data loaded at the same time when the bot starts
+	max_concurrent_loads = 8
+	# if true, a server's data only gets loaded when it gets a command or has an alert coming up, and idle servers get taken out of memory
+	# (only each server's next alert time is kept in memory for servers that aren't loaded)
+	lazy_loading = False
+	# max number of servers that have their data in memory at once when lazy loading is on
+	max_resident_servers = 100
+	# number of seconds a server has to go without being used before its data can be taken out of memory
+	min_idle_secs = 60
+	# number of seconds before a server's next alert that its data gets loaded back into memory
+	wake_early_secs = 60
 
 	###########################################################################
 	#
@@ -308,62 +1586,77 @@ class ServerData:
 	# USE THIS TO CREATE SERVERDATA OBJECTS! DO NOT USE THE ACTUAL CONSTRUCTOR!
 	async def create_ServerData(server):
 		data = ServerData(server)
-		await data.__read_all()
+		# create the server's saved data if it doesn't already exist
+		await ServerData.io.run(server.id, ServerData.storage.create_server, server.id)
+		# hold the lock while loading so an alert or command can't see the lists half read
+		async with data.lock:
+			await data.__read_all()
+			# make sure every alert this server needs is on the scheduler
+			data.__schedule_all()
 		return data
 	
 	# DO NOT USE THIS TO CONSTRUCT A SERVERDATA OBJECT! USE THE create_ServerData() FUNCTION INSTEAD!
 	# THIS CONSTRUCTOR DOES NOT READ THE DATA FILES FOR ITSELF BECAUSE THE FUNCTIONS THAT DO THAT NEED TO BE ASYNC!
 	def __init__(self, server):
 		# initialize fields
-		self.server = server
-		self.meetings = []
+		# (only the ids of the server and alert channel are kept, the discord objects for them are looked up when they're used)
+		self.server_id = server.id
+		self.alert_channel_id = None
+		self.meetings = SortedList()
 		self.meeting_index = 0
-		self.meeting_soon_loop = None
-		self.meeting_now_loop = None
-		self.weekly_meetings = [] # for datetime objects
-		self.display_weekly_meetings = [] # for WeeklyMeeting objects
+		self.weekly_meetings = WeeklySchedule()
 		self.weekly_meeting_index = 0
-		self.weekly_meeting_soon_loop = None
-		self.weekly_meeting_now_loop = None
 		self.agenda_order = []
 		self.agenda_index = 0
 		self.minutes_order = []
 		self.minutes_index = 0
 		# set the meeting / bday alert channel to the first channel that the bot has message sending permissions in
 		self.alert_channel = ServerData.find_first_message_channel(server)
-		self.bdays = []
-		self.bday_loop = None
-
-		# create necessary folders and files if they don't already exist
-
-		# path to server's data files
-		self.folder_name = f'{ServerData.server_root}/{server.id}'
-		data_files = []
-		self.meetings_path = f'{self.folder_name}/{ServerData.meetings_file}'
-		data_files.append(self.meetings_path)
-		self.weekly_path = f'{self.folder_name}/{ServerData.weekly_file}'
-		data_files.append(self.weekly_path)
-		self.agenda_path = f'{self.folder_name}/{ServerData.agenda_file}'
-		data_files.append(self.agenda_path)
-		self.minutes_path = f'{self.folder_name}/{ServerData.minutes_file}'
-		data_files.append(self.minutes_path)
-		self.alert_path = f'{self.folder_name}/{ServerData.alert_file}'
-		data_files.append(self.alert_path)
-		self.bdays_path = f'{self.folder_name}/{ServerData.bdays_file}'
-		data_files.append(self.bdays_path)
-
-		# if the server folder doesn't exist, make one
-		if not os.path.isdir(ServerData.server_root):
-			os.mkdir(ServerData.server_root)
-		
-		# if the folder for this server's data doesn't exist, make it
-		if not os.path.isdir(self.folder_name):
-			os.mkdir(self.folder_name)
-		
-		# if any of the server's data files don't exist, make them
-		for file in data_files:
-			if not os.path.isfile(file):
-				Path(file).touch()
+		self.bdays = SortedList()
+		# when this server's data was last used (for deciding which servers to take out of memory)
+		self.last_used = client.loop.time()
+		# how many times what each of the cached command replies shows has changed, and the cached replies (see __render())
+		self.versions = {'meetings': 0, 'dutyorder': 0, 'bdays': 0}
+		self.render_cache = {}
+		# held while the server's data is being changed or an alert is going out so those happen one at a time
+		self.lock = asyncio.Lock()
+	
+	###########################################################################
+	#
+	# discord objects
+	#
+	###########################################################################
+
+	# the discord object for this server (looked up in the client's cache every time so old objects from before the bot
+	# reconnected don't get held onto), none if the bot isn't in the server anymore
+	@property
+	def server(self):
+		return client.get_guild(self.server_id)
+
+	# the discord object for this server's alert channel (looked up through the server so only its channels get searched),
+	# none if there isn't one or it was deleted
+	@property
+	def alert_channel(self):
+		server = self.server
+		if server is None or self.alert_channel_id is None:
+			return None
+		return server.get_channel(self.alert_channel_id)
+
+	@alert_channel.setter
+	def alert_channel(self, channel):
+		self.alert_channel_id = channel.id if channel is not None else None
+
+	# returns roughly how many bytes of memory this server's data takes up
+	def memory_size(self) -> int:
+		return deep_sizeof(self)
+
+	# marks this server's data as just used
+	# (moves it to the back of server_data so the dict stays in least to most recently used order for evict_idle_servers())
+	def touch(self):
+		self.last_used = client.loop.time()
+		# only move it if it's the data in memory for this server (and not data that was already taken out of memory)
+		if server_data.get(self.server_id) is self:
+			server_data[self.server_id] = server_data.pop(self.server_id)
 	
 	###########################################################################
 	#
@@ -371,12 +1664,34 @@ class ServerData:
 	#
 	###########################################################################
 
+	# works out where each of a list of saved weekly meeting times should be now that it's the time now
+	# returns a list of the next occurrence of each meeting (in the same order), the total number of meetings that were missed,
+	# and how many of the saved times were in the past
+	def catch_up_weekly_meetings(meetings: list, now: datetime.datetime) -> tuple:
+		next_times = []
+		meetings_missed = 0
+		meetings_stale = 0
+		for meeting in meetings:
+			# if the meeting time is in the future, it stays the same
+			if meeting >= now:
+				next_times.append(meeting)
+				continue
+
+			meetings_stale += 1
+			# calculate how many whole days and weeks have passed since this meeting
+			days = (now - meeting).days
+			weeks = days // 7
+			# move the meeting to the first occurrence after now
+			next_times.append(meeting + datetime.timedelta(days = 7 * (weeks + 1)))
+			# count every whole week that passed as a missed meeting, except for the last one if it was exactly a whole number of weeks ago
+			# (never counts below 0, so a meeting that happened earlier today doesn't move the duty orders backwards)
+			meetings_missed += max(weeks - (1 if days % 7 == 0 else 0), 0)
+
+		return next_times, meetings_missed, meetings_stale
+
 	# returns the first text channel that the bot has permission to send messages in, returns none if there are none
 	def find_first_message_channel(server):
-		for channel in server.text_channels:
-			channel_perms = channel.permissions_for(server.me)
-			if channel_perms.send_messages:
-				return channel
+		return ServerData.permissions.first_message_channel(server)
 	
 	###########################################################################
 	#
@@ -387,6 +1702,11 @@ class ServerData:
 	# adds a meeting time to the meeting list in sorted order with a binary search
 	# returns false if the time is in the past or already in the list, true if it was successfully added
 	async def add_meeting(self, time: datetime.datetime, save: bool = True) -> bool:
+		async with self.lock:
+			return await self.__add_meeting(time, save)
+	
+	# does the work of add_meeting() for callers that already hold the lock
+	async def __add_meeting(self, time: datetime.datetime, save: bool = True) -> bool:
 		# if the max list length has already been reached
 		if len(self.meetings) >= ServerData.max_meetings:
 			return False
@@ -396,32 +1716,26 @@ class ServerData:
 		if time < now:
 			return False
 		
-		# insert the meeting time into a new meetings list
-		l = bin_insert(self.meetings, time, no_dupes=True)
+		# insert the meeting time into the meetings list and get the index it was inserted at
+		index = self.meetings.add(time, no_dupes=True)
 		# if the meeting time was a duplicate
-		if not l:
+		if index is None:
 			return False
 		# if the meeting time wasn't a duplicate
 		else:
-			# set the meetings list to the new list
-			self.meetings = l
-			# get the index of the new meeting time in the list
-			index = self.meetings.index(time)
+			self.__changed('meetings')
 			if index == self.meeting_index:
-				# restart the meeting soon loop
-				await self.__end_loop(self.meeting_soon_loop)
-				await self.__start_meeting_soon_loop()
+				# reschedule the meeting soon alert for the new meeting
+				self.__schedule_meeting_soon()
 			elif index == 0:
-				# end the meeting now loop
-				await self.__end_loop(self.meeting_now_loop)
 				# send a meeting soon alert and readjust the meeting index
 				temp_index = self.meeting_index + 1
 				self.meeting_index = index
 				await self.__send_meeting_soon_alert()
 				self.meeting_index = temp_index
 				self.__save_meetings()
-				# restart the meeting now loop
-				await self.__start_meeting_now_loop()
+				# reschedule the meeting now alert for the new soonest meeting
+				self.__schedule_meeting_now()
 			elif index < self.meeting_index:
 				# send a meeting soon alert and readjust the meeting index
 				await self.__send_meeting_soon_alert()
@@ -432,98 +1746,47 @@ class ServerData:
 
 		return True
 	
-	# adds a weekly meeting time to a weekly meeting list in sorted order with a binary search
-	# returns false if the time is in the past or already in the list, true if it was successfully added
+	# adds a weekly meeting to the weekly schedule, given either a WeeklyMeeting or the datetime of its next occurrence
+	# returns false if there is already a weekly meeting on that day and time, true if it was successfully added
 	async def add_weekly_meeting(self, time, save: bool = True) -> bool:
+		async with self.lock:
+			return await self.__add_weekly_meeting(time, save)
+	
+	# does the work of add_weekly_meeting() for callers that already hold the lock
+	async def __add_weekly_meeting(self, time, save: bool = True) -> bool:
 		# if the max list length has already been reached
 		if len(self.weekly_meetings) >= ServerData.max_weekly_meetings:
 			return False
 		
-		# if the time parameter is a WeeklyMeeting, add it to the display list first and then create a datetime object to add
+		# if the time parameter is a WeeklyMeeting, get the datetime of the next occurrence of it
 		if type(time) is WeeklyMeeting:
-			# insert the meeting time into a new meetings list
-			l = bin_insert(self.display_weekly_meetings, time, no_dupes=True)
-			# if the meeting time was a duplicate
-			if not l:
-				return False
-			# if the meeting time wasn't a duplicate
-			else:
-				self.display_weekly_meetings = l
-			
-			# get the datetime of the next occurrence of this meeting
-			next_time = time.get_next_datetime()
-			# insert the meeting time into a new meetings list
-			l = bin_insert(self.weekly_meetings, next_time, no_dupes=True)
-			# if the meeting time was a duplicate
-			if not l:
-				return False
-			# if the meeting time wasn't a duplicate
-			else:
-				self.weekly_meetings = l
-				# get the index of the new weekly meeting time in the list
-				index = self.weekly_meetings.index(time)
-				if index == self.weekly_meeting_index:
-					# restart the weekly meeting soon loop
-					await self.__end_loop(self.weekly_meeting_soon_loop)
-					await self.__start_weekly_meeting_soon_loop()
-				elif index == 0:
-					# end the weekly meeting now loop
-					await self.__end_loop(self.weekly_meeting_now_loop)
-					# send a weekly meeting soon alert and readjust the weekly meeting index
-					temp_index = self.weekly_meeting_index + 1
-					self.weekly_meeting_index = index
-					await self.__send_weekly_meeting_soon_alert()
-					self.weekly_meeting_index = temp_index
-					self.__save_weekly_meetings()
-					# restart the weekly meeting now loop
-					await self.__start_weekly_meeting_now_loop()
-				elif index < self.weekly_meeting_index:
-					# send a weekly meeting soon alert and readjust the meeting index
-					await self.__send_weekly_meeting_soon_alert()
-		# if the time parameter is a datetime, add it to the normal list first and then create a WeeklyMeeting object to add
-		elif type(time) is datetime.datetime:
-			# insert the meeting time into a new meetings list
-			l = bin_insert(self.weekly_meetings, time, no_dupes=True)
-			# if the meeting time was a duplicate
-			if not l:
-				return False
-			# if the meeting time wasn't a duplicate
-			else:
-				self.weekly_meetings = l
-				# get the index of the new weekly meeting time in the list
-				index = self.weekly_meetings.index(time)
-				if index == self.weekly_meeting_index:
-					# restart the weekly meeting soon loop
-					await self.__end_loop(self.weekly_meeting_soon_loop)
-					await self.__start_weekly_meeting_soon_loop()
-				elif index == 0:
-					# end the weekly meeting now loop
-					await self.__end_loop(self.weekly_meeting_now_loop)
-					# send a weekly meeting soon alert and readjust the weekly meeting index
-					temp_index = self.weekly_meeting_index + 1
-					self.weekly_meeting_index = index
-					await self.__send_weekly_meeting_soon_alert()
-					self.weekly_meeting_index = temp_index
-					self.__save_weekly_meetings()
-					# restart the weekly meeting now loop
-					await self.__start_weekly_meeting_now_loop()
-				elif index < self.weekly_meeting_index:
-					# send a weekly meeting soon alert and readjust the meeting index
-					await self.__send_weekly_meeting_soon_alert()
-			
-			# get a WeeklyMeeting object of this meeting time
-			weekly_time = WeeklyMeeting(time.weekday(), time.hour, time.minute)
-			# insert the meeting time into a new meetings list
-			l = bin_insert(self.display_weekly_meetings, weekly_time, no_dupes=True)
-			# if the meeting time was a duplicate
-			if not l:
-				return False
-			# if the meeting time wasn't a duplicate
-			else:
-				self.display_weekly_meetings = l
+			time = time.get_next_datetime()
 		# if the time parameter isn't the right type at all
-		else:
+		elif type(time) is not datetime.datetime:
 			raise TypeError('You can only add WeeklyMeeting and datetime objects with this function')
+
+		# insert the meeting into the schedule and get its index in order of next occurrence
+		index = self.weekly_meetings.add(time)
+		# if the meeting time was a duplicate
+		if index is None:
+			return False
+
+		self.__changed('meetings')
+		if index == self.weekly_meeting_index:
+			# reschedule the weekly meeting soon alert for the new meeting
+			self.__schedule_weekly_meeting_soon()
+		elif index == 0:
+			# send a weekly meeting soon alert and readjust the weekly meeting index
+			temp_index = self.weekly_meeting_index + 1
+			self.weekly_meeting_index = index
+			await self.__send_weekly_meeting_soon_alert()
+			self.weekly_meeting_index = temp_index
+			self.__save_weekly_meetings()
+			# reschedule the weekly meeting now alert for the new soonest meeting
+			self.__schedule_weekly_meeting_now()
+		elif index < self.weekly_meeting_index:
+			# send a weekly meeting soon alert and readjust the meeting index
+			await self.__send_weekly_meeting_soon_alert()
 		
 		# saves all of the weekly meetings to the server's weekly meetings file
 		if save:
@@ -534,130 +1797,99 @@ class ServerData:
 	# removes meetings from the server's list of meetings given a list of arguments of the meetings' numbers
 	# returns true if all of the meetings were successfully removed, returns false if any of the meeting numbers wasn't valid
 	async def remove_meetings(self, meeting_numbers: list, save: bool = True) -> bool:
-		meeting_indexes = []
-		# loop through each argument
-		for arg in meeting_numbers:
-			# if the argument is a positive integer
-			if arg.isnumeric():
-				# turn the argument into a number
-				index = int(arg)
-				# if the number is between 1 and the last weekly meeting number, and that index hasn't already been inputted
-				if index >= 1 and index  <= len(self.meetings) and index not in meeting_indexes:
-					# add that number to a list of indexes to remove
-					meeting_indexes.append(index-1)
-					continue
-			
-			# if any of the arguments aren't valid
+		async with self.lock:
+			return await self.__remove_meetings(meeting_numbers, save)
+	
+	# does the work of remove_meetings() for callers that already hold the lock
+	async def __remove_meetings(self, meeting_numbers: list, save: bool = True) -> bool:
+		# turn the meeting numbers into a set of indexes in the meetings list
+		meeting_indexes = nums_to_indexes(meeting_numbers, len(self.meetings))
+		# if any of the arguments aren't valid
+		if meeting_indexes is None:
 			return False
 		
-		restart_now_loop = False
-		# the soonest meeting is being removed
-		if 0 in meeting_indexes:
-			# end the meeting now loop and set a flag to restart it later
-			await self.__end_loop(self.meeting_now_loop)
-			restart_now_loop = True
-		
-		restart_soon_loop = False
-		# if the meeting at the meeting index is being removed
-		if self.meeting_index in meeting_indexes:
-			# end the meeting soon loop and set a flag to restart it later
-			await self.__end_loop(self.meeting_soon_loop)
-			restart_soon_loop = True
+		await self.__remove_meeting_indexes(meeting_indexes, save)
+		return True
+	
+	# removes every meeting whose index is in a set of indexes from the meetings list in one pass
+	async def remove_meeting_indexes(self, meeting_indexes: set, save: bool = True):
+		async with self.lock:
+			await self.__remove_meeting_indexes(meeting_indexes, save)
+	
+	# does the work of remove_meeting_indexes() for callers that already hold the lock
+	async def __remove_meeting_indexes(self, meeting_indexes: set, save: bool = True):
+		# if the soonest meeting is being removed, set a flag to reschedule the meeting now alert later
+		reschedule_now = 0 in meeting_indexes
+		# if the meeting at the meeting index is being removed, set a flag to reschedule the meeting soon alert later
+		reschedule_soon = self.meeting_index in meeting_indexes
 		
-		# sort the list of indexes in reverse order because the right indexes will change while they're being removed if they're iterated through ascending order
-		meeting_indexes.sort(reverse=True)
-		# remove each meeting from the list in reverse order
-		for i in meeting_indexes:
-			# remove the meeting from the list
-			self.meetings = self.meetings[:i] + self.meetings[i+1:]
-			# if the index of the meeting is less than the meeting index, decrement the meeting index
-			if i < self.meeting_index:
-				self.adjust_meeting_index(-1)
+		# count how many of the removed meetings are before the meeting index so the index can stay aligned with the list
+		removed_before = sum(1 for i in meeting_indexes if i < self.meeting_index)
+		# rebuild the list once without the removed meetings
+		self.meetings.remove_indexes(meeting_indexes)
+		self.__changed('meetings')
+		self.adjust_meeting_index(-removed_before, save=False)
 		
-		# if the meeting now loop was stopped, restart it
-		if restart_now_loop:
-			await self.__start_meeting_now_loop()
+		# if the meeting now alert was for a removed meeting, reschedule it
+		if reschedule_now:
+			self.__schedule_meeting_now()
 		
-		# if the meeting soon loop was stopped, restart it
-		if restart_soon_loop:
-			await self.__start_meeting_soon_loop()
+		# if the meeting soon alert was for a removed meeting, reschedule it
+		if reschedule_soon:
+			self.__schedule_meeting_soon()
 		
 		# saves all of the remaining meetings to the server's meetings file
 		if save:
 			self.__save_meetings()
-
-		return True
 	
 	# removes weekly meetings from the server's lists of weekly meetings given a list of arguments of the meetings' numbers
 	# returns true if all of the meetings were successfully removed, returns false if any of the meeting numbers wasn't valid
 	async def remove_weekly_meetings(self, meeting_numbers: list, save: bool = True) -> bool:
-		meeting_indexes = []
-		other_meeting_indexes = []
-		# loop through each argument
-		for arg in meeting_numbers:
-			# if the argument is a positive integer
-			if arg.isnumeric():
-				# turn the argument into a number
-				index = int(arg)
-				# if the number is between 1 and the last weekly meeting number, and that index hasn't already been inputted
-				if index >= 1 and index  <= len(self.display_weekly_meetings) and index not in meeting_indexes:
-					# add that number to a list of indexes to remove
-					meeting_indexes.append(index-1)
-					# try to find the index of the equivalent datetime object in the other weekly meeting list
-					try:
-						other_meeting_indexes.append(self.weekly_meetings.index(self.display_weekly_meetings[index-1]))
-					# if it can't find the equivalent object's index, then just ignore it since it's already not there lol
-					except:
-						pass
-					continue
-			
-			# if any of the arguments aren't valid
+		async with self.lock:
+			return await self.__remove_weekly_meetings(meeting_numbers, save)
+	
+	# does the work of remove_weekly_meetings() for callers that already hold the lock
+	async def __remove_weekly_meetings(self, meeting_numbers: list, save: bool = True) -> bool:
+		# turn the meeting numbers into a set of indexes in the display list
+		meeting_indexes = nums_to_indexes(meeting_numbers, len(self.weekly_meetings))
+		# if any of the arguments aren't valid
+		if meeting_indexes is None:
 			return False
 		
-		restart_now_loop = False
-		# the soonest meeting is being removed
-		if 0 in other_meeting_indexes:
-			# end the weekly meeting now loop and set a flag to restart it later
-			await self.__end_loop(self.weekly_meeting_now_loop)
-			restart_now_loop = True
+		await self.__remove_weekly_meeting_indexes(meeting_indexes, save)
+		return True
+	
+	# removes every weekly meeting whose index in display order is in a set of indexes in one pass
+	async def remove_weekly_meeting_indexes(self, meeting_indexes: set, save: bool = True):
+		async with self.lock:
+			await self.__remove_weekly_meeting_indexes(meeting_indexes, save)
+	
+	# does the work of remove_weekly_meeting_indexes() for callers that already hold the lock
+	async def __remove_weekly_meeting_indexes(self, meeting_indexes: set, save: bool = True):
+		# remove the meetings and get the indexes they had in order of next occurrence
+		other_meeting_indexes = self.weekly_meetings.remove_display_indexes(meeting_indexes)
+		self.__changed('meetings')
 		
-		restart_soon_loop = False
-		# if the meeting at the meeting index is being removed
-		if self.meeting_index in other_meeting_indexes:
-			# end the weekly meeting soon loop and set a flag to restart it later
-			await self.__end_loop(self.weekly_meeting_soon_loop)
-			restart_soon_loop = True
-
-		# sort the lists of indexes in reverse order because the right indexes will change while they're being removed if they're iterated through ascending order
-		meeting_indexes.sort(reverse=True)
-		other_meeting_indexes.sort(reverse=True)
-
-		# remove each meeting from the display list in reverse order
-		for i in meeting_indexes:
-			# pop the WeeklyMeeting object from its list
-			self.display_weekly_meetings = self.display_weekly_meetings[:i] + self.display_weekly_meetings[i+1:]
+		# if the soonest meeting is being removed, set a flag to reschedule the weekly meeting now alert later
+		reschedule_now = 0 in other_meeting_indexes
+		# if the meeting at the weekly meeting index is being removed, set a flag to reschedule the weekly meeting soon alert later
+		reschedule_soon = self.weekly_meeting_index in other_meeting_indexes
 		
-		# remove each meeting from the datetime list in reverse order
-		for i in other_meeting_indexes:
-			# pop the datetime object from its list
-			self.weekly_meetings = self.weekly_meetings[:i] + self.weekly_meetings[i+1:]
-			# if a meeting before the weekly meeting index was removed, shift the weekly meeting index down too to stay aligned with the list
-			if i < self.weekly_meeting_index:
-				self.adjust_weekly_meeting_index(-1)
+		# count how many of the removed meetings are before the weekly meeting index so the index can stay aligned with the list
+		removed_before = sum(1 for i in other_meeting_indexes if i < self.weekly_meeting_index)
+		self.adjust_weekly_meeting_index(-removed_before, save=False)
 		
-		# if the weekly meeting now loop was stopped, restart it
-		if restart_now_loop:
-			await self.__start_weekly_meeting_now_loop()
+		# if the weekly meeting now alert was for a removed meeting, reschedule it
+		if reschedule_now:
+			self.__schedule_weekly_meeting_now()
 		
-		# if the weekly meeting soon loop was stopped, restart it
-		if restart_soon_loop:
-			await self.__start_weekly_meeting_soon_loop()
+		# if the weekly meeting soon alert was for a removed meeting, reschedule it
+		if reschedule_soon:
+			self.__schedule_weekly_meeting_soon()
 		
 		# saves all of the remaining meetings to the server's meetings file
 		if save:
 			self.__save_weekly_meetings()
-		
-		return True
 	
 	# adds i to the meeting index (default -1) and keeps the index within range
 	def adjust_meeting_index(self, i: int = -1, save: bool = True):
@@ -688,7 +1920,12 @@ class ServerData:
 			self.__save_weekly_meetings()
 	
 	# sets the agenda notetaking order to a given list of names
-	def set_agenda_order(self, names: list, save: bool = True) -> bool:
+	async def set_agenda_order(self, names: list, save: bool = True) -> bool:
+		async with self.lock:
+			return self.__set_agenda_order(names, save)
+	
+	# does the work of set_agenda_order() for callers that already hold the lock
+	def __set_agenda_order(self, names: list, save: bool = True) -> bool:
 		# if the names list is longer than the max allowed length
 		if len(names) >= ServerData.max_agenda_order:
 			return False
@@ -696,6 +1933,7 @@ class ServerData:
 		# set the list and reset the index
 		self.agenda_order = names
 		self.agenda_index = 0
+		self.__changed('dutyorder')
 
 		# saves the agenda order and index to the server folder
 		if save:
@@ -704,7 +1942,12 @@ class ServerData:
 		return True
 	
 	# sets the meeting minutes notetaking order to a given list of names
-	def set_minutes_order(self, names: list, save: bool = True) -> bool:
+	async def set_minutes_order(self, names: list, save: bool = True) -> bool:
+		async with self.lock:
+			return self.__set_minutes_order(names, save)
+	
+	# does the work of set_minutes_order() for callers that already hold the lock
+	def __set_minutes_order(self, names: list, save: bool = True) -> bool:
 		# if the names list is longer than the max allowed length
 		if len(names) >= ServerData.max_minutes_order:
 			return False
@@ -712,6 +1955,7 @@ class ServerData:
 		# set the list and reset the index
 		self.minutes_order = names
 		self.minutes_index = 0
+		self.__changed('dutyorder')
 
 		# saves the meeting minutes order and index to the server folder
 		if save:
@@ -721,11 +1965,17 @@ class ServerData:
 	
 	# sets the agenda index to the inputted name at that index
 	# returns true if the name was found, false if it wasn't
-	def set_agenda_to(self, name: str, save: bool = True) -> bool:
+	async def set_agenda_to(self, name: str, save: bool = True) -> bool:
+		async with self.lock:
+			return self.__set_agenda_to(name, save)
+	
+	# does the work of set_agenda_to() for callers that already hold the lock
+	def __set_agenda_to(self, name: str, save: bool = True) -> bool:
 		# if the name is in the list
 		if name in self.agenda_order:
 			# set the index to that name's index
 			self.agenda_index = self.agenda_order.index(name)
+			self.__changed('dutyorder')
 			# saves the agenda order and index to the server folder
 			if save:
 				self.__save_agenda()
@@ -736,11 +1986,17 @@ class ServerData:
 	
 	# sets the minutes index to the inputted name at that index
 	# returns true if the name was found, false if it wasn't
-	def set_minutes_to(self, name: str, save: bool = True) -> bool:
+	async def set_minutes_to(self, name: str, save: bool = True) -> bool:
+		async with self.lock:
+			return self.__set_minutes_to(name, save)
+	
+	# does the work of set_minutes_to() for callers that already hold the lock
+	def __set_minutes_to(self, name: str, save: bool = True) -> bool:
 		# if the name is in the list
 		if name in self.minutes_order:
 			# set the index to that name's index
 			self.minutes_index = self.minutes_order.index(name)
+			self.__changed('dutyorder')
 			# saves the meeting minutes order and index to the server folder
 			if save:
 				self.__save_minutes()
@@ -750,20 +2006,32 @@ class ServerData:
 			return False
 	
 	# sets the agenda duty list to an empty list and the agenda index to 0
-	def clear_agenda_order(self, save: bool = True):
+	async def clear_agenda_order(self, save: bool = True):
+		async with self.lock:
+			self.__clear_agenda_order(save)
+	
+	# does the work of clear_agenda_order() for callers that already hold the lock
+	def __clear_agenda_order(self, save: bool = True):
 		# clear the list and reset the index
 		self.agenda_order = []
 		self.agenda_index = 0
+		self.__changed('dutyorder')
 
 		# saves the agenda order and index to the server folder
 		if save:
 			self.__save_agenda()
 	
 	# sets the meeting minutes duty list to an empty list and the minutes index to 0
-	def clear_minutes_order(self, save: bool = True):
+	async def clear_minutes_order(self, save: bool = True):
+		async with self.lock:
+			self.__clear_minutes_order(save)
+	
+	# does the work of clear_minutes_order() for callers that already hold the lock
+	def __clear_minutes_order(self, save: bool = True):
 		# clear the list an reset the index
 		self.minutes_order = []
 		self.minutes_index = 0
+		self.__changed('dutyorder')
 
 		# saves the meeting minutes order and index to the server folder
 		if save:
@@ -774,6 +2042,7 @@ class ServerData:
 		# if there is an agenda list
 		if len(self.agenda_order) > 0:
 			self.agenda_index = (self.agenda_index + i) % len(self.agenda_order)
+			self.__changed('dutyorder')
 
 			# saves the agenda data
 			if save:
@@ -784,6 +2053,7 @@ class ServerData:
 		# if there is a meeting minutes list
 		if len(self.minutes_order) > 0:
 			self.minutes_index = (self.minutes_index + i) % len(self.minutes_order)
+			self.__changed('dutyorder')
 
 			# saves the meeting minutes data
 			if save:
@@ -791,16 +2061,21 @@ class ServerData:
 	
 	# sets the alert channel for a server to the one that is inputted
 	# returns false if it can't be set to that channel, true if it was successfully set to it
-	def set_alert_channel(self, channel):
+	async def set_alert_channel(self, channel):
+		async with self.lock:
+			return self.__set_alert_channel(channel)
+	
+	# does the work of set_alert_channel() for callers that already hold the lock
+	def __set_alert_channel(self, channel):
 		# if the channel is not in the same server as the this object's server
-		if channel.guild != self.server:
+		if channel.guild.id != self.server_id:
 			raise ValueError('Server passed as argument not the same as the object\'s server')
 		
 		# if the channel is the same as the current alert channel
-		if channel == self.alert_channel:
+		if channel.id == self.alert_channel_id:
 			return True
 		
-		channel_perms = channel.permissions_for(channel.guild.me)
+		channel_perms = ServerData.permissions.channel_permissions(channel)
 		# if the bot has permission to send messages in this channel
 		if channel_perms.send_messages:
 			# set this server's alert channel to this channel and return true
@@ -816,456 +2091,589 @@ class ServerData:
 	# sets it to none if the bot doesn't have permission to send messages in any of the channels
 	def reset_alert_channel(self, server):
 		# if the server is not the same as this object's server
-		if server != self.server:
+		if server.id != self.server_id:
 			raise ValueError('Server passed as argument not the same as the object\'s server')
 		
 		# get the first channel in this server that the bot has permission to send messages in
 		channel = ServerData.find_first_message_channel(server)
 		# if the new alert channel is different than the old one
-		if channel != self.alert_channel:
+		if (channel.id if channel is not None else None) != self.alert_channel_id:
 			# set the alert channel to the new one and save it
 			self.alert_channel = channel
 			self.__save_alert_channel()
+
+	# returns the alert channel for this server, looking for a new one first if it's no longer one of the server's text channels
+	# returns none if there isn't one and the bot doesn't have permission to send messages in any of the channels
+	async def find_alert_channel(self, server):
+		async with self.lock:
+			# if the alert channel is gone, set it to the first text channel that the bot can send messages in (and save it)
+			if self.alert_channel not in server.text_channels:
+				self.reset_alert_channel(server)
+			return self.alert_channel
+
+	# checks that the alert channel still exists and the bot can still send messages in it (for after the bot reconnects)
+	def refresh_server(self, server):
+		# if there is an alert channel, keep it if it's still in the server and the bot can still send messages in it
+		channel = server.get_channel(self.alert_channel_id) if self.alert_channel_id is not None else None
+		if channel is not None and ServerData.permissions.channel_permissions(channel).send_messages:
+			return
+
+		# set the alert channel to the first text channel that the bot can send messages in
+		self.reset_alert_channel(server)
 	
 	# adds a birthday to the bday list in sorted order with a binary search
 	# returns true if the bday was added to the list, false if a bday on the same day for the same name is already in the list
 	async def add_bday(self, bday: BDay, save: bool = True) -> bool:
+		async with self.lock:
+			return await self.__add_bday(bday, save)
+	
+	# does the work of add_bday() for callers that already hold the lock
+	async def __add_bday(self, bday: BDay, save: bool = True) -> bool:
 		# if the max list length has already been reached
 		if len(self.bdays) >= ServerData.max_bdays:
 			return False
 
-		# insert the meeting time into a new meetings list
-		l = bin_insert(self.bdays, bday, no_dupes=True)
-		# if the meeting time was a duplicate
-		if not l:
+		# insert the bday into the bday list and get the index it was inserted at
+		index = self.bdays.add(bday, no_dupes=True)
+		# if the bday was a duplicate
+		if index is None:
 			return False
-		# if the meeting time wasn't a duplicate
+		# if the bday wasn't a duplicate
 		else:
-			self.bdays = l
-			# get the index of the bday that was just added to the list
-			index = self.bdays.index(bday)
+			self.__changed('bdays')
 			# if the bday was added to the front of the list
 			if index == 0:
-				# restart the bday loop so the bot waits for the new soonest bday
-				await self.__end_loop(self.bday_loop)
-				await self.__start_bday_loop()
+				# reschedule the bday alert so the bot waits for the new soonest bday
+				self.__schedule_bday()
+		
+		# saves all of the birthdays to the server's bdays file
+		if save:
+			self.__save_bdays()
+		
+		return True
+	
+	# adds lists of meeting times, weekly meetings (WeeklyMeetings or datetimes of their next occurrences), and bdays all at once
+	# each list is merged in at once, each alert is rescheduled at most once, and each list is saved once
+	# returns how many of each were added (ones that are duplicates, in the past, or over the max list length are skipped)
+	async def add_many(self, meetings: list, weekly_meetings: list, bdays: list) -> tuple:
+		async with self.lock:
+			return await self.__add_meetings(meetings), await self.__add_weekly_meetings(weekly_meetings), self.__add_bdays(bdays)
+
+	# does the work of add_many() for meetings
+	async def __add_meetings(self, times: list) -> int:
+		now = datetime.datetime.now(timezone)
+		# meetings that go before one that already had a soon alert need one right away, so they get added one at a time
+		# (which can only happen for meetings in the next few minutes)
+		last_alerted = self.meetings[self.meeting_index - 1] if self.meeting_index > 0 else None
+		added = 0
+		new_times = set()
+		for time in times:
+			if last_alerted is not None and time < last_alerted:
+				if await self.__add_meeting(time, save=False):
+					added += 1
+			elif time >= now and time not in self.meetings:
+				new_times.add(time)
+
+		# add as many of the rest as there's room for (the soonest ones first)
+		new_times = sorted(new_times)[:max(ServerData.max_meetings - len(self.meetings), 0)]
+		if len(new_times) > 0:
+			self.meetings.merge(new_times)
+			self.__changed('meetings')
+			# the meeting that's next for a soon alert might be a new one
+			self.__schedule_meeting_soon()
+
+		added += len(new_times)
+		if added > 0:
+			self.__save_meetings()
+		return added
+
+	# does the work of add_many() for weekly meetings
+	async def __add_weekly_meetings(self, times: list) -> int:
+		# weekly meetings that go before one that already had a soon alert need one right away, so they get added one at a time
+		last_alerted = self.weekly_meetings[self.weekly_meeting_index - 1] if self.weekly_meeting_index > 0 else None
+		added = 0
+		new_times = []
+		for time in times:
+			# get the datetime of the next occurrence of each WeeklyMeeting
+			if type(time) is WeeklyMeeting:
+				time = time.get_next_datetime()
+			if last_alerted is not None and time < last_alerted:
+				if await self.__add_weekly_meeting(time, save=False):
+					added += 1
+			else:
+				new_times.append(time)
+
+		# add as many of the rest as there's room for (the soonest ones first)
+		new_added = self.weekly_meetings.merge(sorted(new_times), ServerData.max_weekly_meetings - len(self.weekly_meetings))
+		if new_added > 0:
+			self.__changed('meetings')
+			# the weekly meeting that's next for a soon alert might be a new one
+			self.__schedule_weekly_meeting_soon()
+
+		added += new_added
+		if added > 0:
+			self.__save_weekly_meetings()
+		return added
+
+	# does the work of add_many() for bdays
+	def __add_bdays(self, bdays: list) -> int:
+		new_bdays = []
+		for bday in sorted(bdays):
+			if len(self.bdays) + len(new_bdays) >= ServerData.max_bdays:
+				break
+			if bday not in self.bdays and bday not in new_bdays:
+				new_bdays.append(bday)
+
+		if len(new_bdays) > 0:
+			self.bdays.merge(new_bdays)
+			self.__changed('bdays')
+			# the soonest bday might be a new one
+			self.__schedule_bday()
+			self.__save_bdays()
+		return len(new_bdays)
+
+	# removes a birthday from the server's list of birthdays given a bday object
+	# returns true if the bday was found and removed, false if it wasn't
+	async def remove_bday(self, bday: BDay, save: bool = True) -> bool:
+		async with self.lock:
+			return await self.__remove_bday(bday, save)
+	
+	# does the work of remove_bday() for callers that already hold the lock
+	async def __remove_bday(self, bday: BDay, save: bool = True) -> bool:
+		# find the bday in the list with a binary search
+		index = self.bdays.find(bday)
+		# if the bday is in the list
+		if index != -1:
+			# remove it from the list and return true
+			self.bdays.pop(index)
+			self.__changed('bdays')
+			# if the soonest bday was removed
+			if index == 0:
+				# reschedule the bday alert for the new soonest bday
+				self.__schedule_bday()
+
+			# saves all of the birthdays to the server's bdays file
+			if save:
+				self.__save_bdays()
+			
+			return True
+		# if the bday is not in the list
+		else:
+			return False
+	
+	###########################################################################
+	#
+	# reply rendering functions
+	#
+	###########################################################################
+
+	# marks that something shown in one of the cached command replies ('meetings', 'dutyorder' or 'bdays') changed so it
+	# gets built again the next time it's used
+	def __changed(self, view: str):
+		self.versions[view] += 1
+
+	# returns the cached reply for a view if nothing it shows has changed since it was built, otherwise builds it again with build()
+	# while the data is being changed the last cached reply is returned instead so readers never wait or see it half changed
+	def __render(self, view: str, build) -> str:
+		cached = self.render_cache.get(view)
+		if cached is None or (cached[0] != self.versions[view] and not self.lock.locked()):
+			cached = (self.versions[view], build())
+			self.render_cache[view] = cached
+
+		return cached[1]
+
+	# returns the reply for the meetings command that shows all current meetings
+	def render_meetings(self) -> str:
+		return self.__render('meetings', self.__build_meetings)
+
+	# returns the reply for the dutyorder command that shows the current agenda and meeting minutes order
+	def render_dutyorder(self) -> str:
+		return self.__render('dutyorder', self.__build_dutyorder)
+
+	# returns the reply for the bdays command that shows all birthdays
+	def render_bdays(self) -> str:
+		return self.__render('bdays', self.__build_bdays)
+
+	# builds the reply for the meetings command
+	def __build_meetings(self) -> str:
+		reply = ['```One-Time Meetings```\n']
+		
+		# if there are no one time meetings
+		if len(self.meetings) < 1:
+			reply.append('**No meetings.**\n\n')
+		# if there is at least 1 meeting, display all of the meetings in a numbered list
+		else:
+			for i, meeting in enumerate(self.meetings):
+				reply.append(f'**{i+1}. {meeting.strftime(meeting_format)}**\n\n')
+
+		reply.append('```Weekly Meetings```\n')
+
+		# if there are no weekly meetings
+		if len(self.weekly_meetings) < 1:
+			reply.append('**No weekly meetings.**\n')
+		# if there is at least 1 weekly meeting, display all of the weekly meetings in a numbered list
+		else:
+			for i, meeting in enumerate(self.weekly_meetings.display_meetings()):
+				reply.append(f'**{i+1}. {meeting}**\n\n')
+
+		return ''.join(reply)
+
+	# builds the reply for the dutyorder command
+	def __build_dutyorder(self) -> str:
+		up_next = '  <-- Up Next'
+		reply = ['```Agenda Duty:```\n']
 		
-		# saves all of the birthdays to the server's bdays file
-		if save:
-			self.__save_bdays()
+		# if the agenda duty list is empty
+		if len(self.agenda_order) < 1:
+			reply.append('**No agenda duty list**\n\n')
+		# if there is anyone on the agenda duty list, display the list of people on agenda duty
+		else:
+			for i, name in enumerate(self.agenda_order):
+				# if this person is up next, put an arrow and some text next to their name to say so
+				reply.append(f'**{i + 1}. {name}**{up_next if i == self.agenda_index else ""}\n\n')
 		
-		return True
-	
-	# removes a birthday from the server's list of birthdays given a bday object
-	# returns true if the bday was found and removed, false if it wasn't
-	async def remove_bday(self, bday: BDay, save: bool = True) -> bool:
-		# if the bday is in the list
-		if bday in self.bdays:
-			# remove it from the list and return true
-			index = self.bdays.index(bday)
-			# if the soonest bday is being removed
-			if index == 0:
-				# stop the bday loop
-				await self.__end_loop(self.bday_loop)
-				# remove the bday
-				self.bdays = self.bdays[1:]
-				# restart the bday loop
-				await self.__start_bday_loop()
-			# otherwise just remove the bday
-			else:
-				self.bdays = self.bdays[:index] + self.bdays[index+1:]
+		reply.append('```Meeting Minutes Duty:```\n')
 
-			# saves all of the birthdays to the server's bdays file
-			if save:
-				self.__save_bdays()
-			
-			return True
-		# if the bday is not in the list
+		# if the meeting minutes duty list is empty
+		if len(self.minutes_order) < 1:
+			reply.append('**No meeting minutes duty list**')
+		# if there is anyone on the meeting minutes duty list, display the list of people on meeting minutes duty
 		else:
-			return False
-	
+			for i, name in enumerate(self.minutes_order):
+				# if this person is up next, put an arrow and some text next to their name to say so
+				reply.append(f'**{i + 1}. {name}**{up_next if i == self.minutes_index else ""}\n\n')
+
+		return ''.join(reply)
+
+	# builds the reply for the bdays command
+	def __build_bdays(self) -> str:
+		reply = ['```Birthdays:```\n']
+
+		# if the bday list is empty
+		if len(self.bdays) < 1:
+			reply.append('**No Birthdays**')
+		# if the bday list has at least 1 item in it, display the list of bdays
+		else:
+			for bday in self.bdays:
+				reply.append(f'**{bday}**\n\n')
+
+		return ''.join(reply)
+
+	###########################################################################
+	#
+	# calendar export functions
+	#
+	###########################################################################
+
+	# returns an iCalendar (.ics) file of the meetings, weekly meetings, and bdays of this server
+	# the file is written one line at a time as the lines are made instead of being built as one string first
+	async def export_ics(self) -> BytesIO:
+		file = BytesIO()
+		# wait for any change that is being made so the calendar isn't half changed
+		async with self.lock:
+			for line in self.__ics_lines():
+				file.write(ics_fold(line))
+
+		file.seek(0)
+		return file
+
+	# yields each (unfolded) line of the iCalendar file of this server
+	def __ics_lines(self):
+		stamp = datetime.datetime.now(datetime.timezone.utc).strftime(ics_time_format) + 'Z'
+		duration = f'DURATION:PT{ServerData.export_meeting_mins}M'
+
+		yield 'BEGIN:VCALENDAR'
+		yield 'VERSION:2.0'
+		yield f'PRODID:{ics_product_id}'
+		yield 'CALSCALE:GREGORIAN'
+		yield f'X-WR-CALNAME:{ics_escape(self.server.name)} Meetings'
+		yield from ics_timezone_lines(datetime.datetime.now(timezone).year)
+
+		# one-time meetings (in utc so they're the same in any timezone)
+		for meeting in self.meetings:
+			yield 'BEGIN:VEVENT'
+			yield f'UID:{uuid.uuid5(uuid.NAMESPACE_URL, f"{self.server_id}/meeting/{meeting.timestamp()}")}'
+			yield f'DTSTAMP:{stamp}'
+			yield f'DTSTART:{meeting.astimezone(datetime.timezone.utc).strftime(ics_time_format)}Z'
+			yield duration
+			yield 'SUMMARY:Meeting'
+			yield 'END:VEVENT'
+
+		# weekly meetings (in the bot's timezone so they stay at the same time of day when daylight saving time changes)
+		for meeting in self.weekly_meetings:
+			yield 'BEGIN:VEVENT'
+			yield f'UID:{uuid.uuid5(uuid.NAMESPACE_URL, f"{self.server_id}/weekly_meeting/{WeeklyMeeting.key_of(meeting)}")}'
+			yield f'DTSTAMP:{stamp}'
+			yield f'DTSTART;TZID={timezone.key}:{meeting.strftime(ics_time_format)}'
+			yield duration
+			yield 'RRULE:FREQ=WEEKLY'
+			yield 'SUMMARY:Weekly Meeting'
+			yield 'END:VEVENT'
+
+		# bdays (all day events every year)
+		for bday in self.bdays:
+			# a leap day bday has to start on a year that has feb 29th
+			year = bday.year
+			while bday.leap_day and not calendar.isleap(year):
+				year -= 1
+			yield 'BEGIN:VEVENT'
+			yield f'UID:{uuid.uuid5(uuid.NAMESPACE_URL, f"{self.server_id}/bday/{bday.month}/{bday.day}/{bday.name}")}'
+			yield f'DTSTAMP:{stamp}'
+			yield f'DTSTART;VALUE=DATE:{year:04}{bday.month:02}{bday.day:02}'
+			yield 'RRULE:FREQ=YEARLY'
+			yield f'SUMMARY:{ics_escape(bday.name)}\'s Birthday'
+			yield 'CATEGORIES:BIRTHDAY'
+			yield 'TRANSP:TRANSPARENT'
+			yield 'END:VEVENT'
+
+		yield 'END:VCALENDAR'
+
 	###########################################################################
 	#
 	# data backup / saving functions
 	#
 	###########################################################################
 
-	# saves the meetings list to the server's meetings file
+	# marks the meetings list and meeting index as needing to be saved
 	def __save_meetings(self):
-		file_lines = ''
-		# combine every item in the list into a newline separated string
-		for meeting in self.meetings:
-			file_lines += meeting.strftime(ServerData.dtfstr + '\n')
-		
-		# write the meeting index and the datetimes to the meetings file
-		with open(self.meetings_path, 'w') as file:
-			file.write(f'{self.meeting_index}\n')
-			file.write(file_lines)
-	
-	# saves the weekly meetings list to the server's weekly meetings file
+		ServerData.writer.mark(self, 'meetings')
+
+	# marks the weekly meetings list and weekly meeting index as needing to be saved
 	# note: only saves the datetime objects so the bot can know how many meetings it missed so it can set the agenda
 	# and minutes indexes properly
 	def __save_weekly_meetings(self):
-		file_lines = ''
-		# combine every item in the list into a newline separated string
-		for meeting in self.weekly_meetings:
-			file_lines += meeting.strftime(ServerData.dtfstr + '\n')
-		
-		# write the meeting index and the datetimes to the meetings file
-		with open(self.weekly_path, 'w') as file:
-			file.write(f'{self.weekly_meeting_index}\n')
-			file.write(file_lines)
-	
-	# saves the agenda order list and index to the server's agenda order file
+		ServerData.writer.mark(self, 'weekly_meetings')
+
+	# marks the agenda order list and index as needing to be saved
 	def __save_agenda(self):
-		file_lines = ''
-		# combine every item in the list into a newline separated string
-		for name in self.agenda_order:
-			file_lines += name + '\n'
-		
-		# write the index and the items to the data file
-		with open(self.agenda_path, 'w', encoding='utf8') as file:
-			file.write(f'{self.agenda_index}\n')
-			file.write(file_lines)
-	
-	# saves the meeting minutes order list and index to the server's minutes order file
+		ServerData.writer.mark(self, 'agenda')
+
+	# marks the meeting minutes order list and index as needing to be saved
 	def __save_minutes(self):
-		file_lines = ''
-		# combine every item in the list into a newline separated string
-		for name in self.minutes_order:
-			file_lines += name + '\n'
-		
-		# write the index and the items to the data file
-		with open(self.minutes_path, 'w', encoding='utf8') as file:
-			file.write(f'{self.minutes_index}\n')
-			file.write(file_lines)
-	
-	# saves the alert channel to the server's alert channel file
+		ServerData.writer.mark(self, 'minutes')
+
+	# marks the alert channel as needing to be saved
 	def __save_alert_channel(self):
-		with open(self.alert_path, 'w') as file:
-			# if this server has an alert channel, write its id to the file
-			if self.alert_channel is not None:
-				file.write(f'{self.alert_channel.id}\n')
-			# if this server doesn't have an alert channel, write an empty string to the file
-			else:
-				file.write('')
-	
-	# saves the birthdays list to the server's bdays file
+		ServerData.writer.mark(self, 'alert_channel')
+
+	# marks the birthdays list as needing to be saved
 	def __save_bdays(self):
-		file_lines = ''
-		# combine every item in the list into a newline separated string
-		for bday in self.bdays:
-			date_str = bday.date.strftime(ServerData.dtfstr)
-			file_lines += f'{bday.name} {date_str}\n'
-		
-		# write the dates to the meetings file
-		with open(self.bdays_path, 'w') as file:
-			file.write(file_lines)
-	
+		ServerData.writer.mark(self, 'bdays')
+
+	# returns the storage function that saves one category of this server's data and a copy of the arguments it needs
+	# (called by the writer on the event loop so the save can run on an io thread while this object keeps changing)
+	def snapshot(self, category: str):
+		if category == 'meetings':
+			return ServerData.storage.save_meetings, (self.server_id, self.meeting_index, list(self.meetings))
+		elif category == 'weekly_meetings':
+			return ServerData.storage.save_weekly_meetings, (self.server_id, self.weekly_meeting_index, list(self.weekly_meetings))
+		elif category == 'agenda':
+			return ServerData.storage.save_agenda, (self.server_id, self.agenda_index, list(self.agenda_order))
+		elif category == 'minutes':
+			return ServerData.storage.save_minutes, (self.server_id, self.minutes_index, list(self.minutes_order))
+		elif category == 'alert_channel':
+			# if this server has an alert channel, save its id
+			if self.alert_channel_id is not None:
+				return ServerData.storage.save_alert_channel, (self.server_id, self.alert_channel_id)
+			# if this server doesn't have an alert channel, save that it doesn't
+			else:
+				return ServerData.storage.save_alert_channel, (self.server_id, None)
+		elif category == 'bdays':
+			return ServerData.storage.save_bdays, (self.server_id, list(self.bdays))
+		else:
+			raise ValueError(f'{category} is not a category of server data')
+
 	###########################################################################
 	#
 	# data reading functions
 	#
 	###########################################################################
 
-	# reads all of the data files, stores them in this object, and updates the files if needed
+	# reads all of the saved data, stores it in this object, and updates the saved data if needed
 	async def __read_all(self):
 		# do agenda and minutes first since reading the meetings data can change the agenda and minutes data
 		# read saved agenda data
-		self.__read_agenda()
+		await self.__read_agenda()
 		# read saved minutes data
-		self.__read_minutes()
+		await self.__read_minutes()
 		# read saved meeting data
 		await self.__read_meetings()
 		# weekly meeting data
 		await self.__read_weekly_meetings()
 		# alert channel data
-		self.__read_alert_channel()
+		await self.__read_alert_channel()
 		# read saved bday data
 		await self.__read_bdays()
 
-	# reads data from the meetings file, stores it in this object, and updates the file if needed
+	# reads the saved meetings data, stores it in this object, and updates the saved data if needed
 	async def __read_meetings(self):
 		# flag if the list was updated while reading it
 		update = False
-		
-		# read the meetings file
-		with open(self.meetings_path, 'r') as file:
-			lines = file.readlines()
-		
-		# if the file was empty
-		if len(lines) <= 0:
+
+		# read the saved meeting index and meetings
+		self.meeting_index, meetings = await ServerData.io.run(self.server_id, ServerData.storage.read_meetings, self.server_id)
+
+		# get the current date and time
+		now = datetime.datetime.now(timezone)
+		# for each meeting that was saved
+		for meeting in meetings:
+			# if the meeting time is in the future, add it to the server's meetings list
+			if meeting > now:
+				await self.__add_meeting(meeting, save=False)
+			# if the meeting already happened, don't add it to the list and increment the minutes index
+			else:
+				# set the update flag to true so the bot will update the saved data
+				update = True
+				# set the minutes to the next person and decrease the index
+				self.inc_minutes()
+				self.adjust_meeting_index(-1, save=False)
+
+		# if there were any changes to the list while reading it, save the new list
+		if update:
 			self.__save_meetings()
-		# if the file wasn't empty
-		else:
-			index = lines[0].strip()
-			# if the first line is a positive integer
-			if index.isnumeric():
-				# set the meeting index to the number on the first line
-				self.meeting_index = int(index)
-			# else let it stay as 0
-			
-			# get the current date and time
-			now = datetime.datetime.now(timezone)
-			# for each line that was read in the file
-			for line in lines[1:]:
-				# get the date and time of the meeting from the string
-				try:
-					meeting = datetime.datetime.strptime(line.strip(), ServerData.dtfstr)
-				# just do the next line if this one is wrong
-				except:
-					continue
 
-				# if the meeting time is in the future, add it to the server's meetings list
-				if meeting > now:
-					await self.add_meeting(meeting, save=False)
-				# if the meeting already happened, don't add it to the list and increment the minutes index
-				else:
-					# set the update flag to true so the bot will update the data in the file
-					update = True
-					# set the minutes to the next person and decrease the index
-					self.inc_minutes()
-					self.adjust_meeting_index(-1, save=False)
-			
-			# if there were any changes to the list while reading it, save the new list
-			if update:
-				self.__save_meetings()
-	
-	# reads data from the weekly meetings file, stores it in this object, and updates the file if needed
+	# reads the saved weekly meetings data, stores it in this object, and updates the saved data if needed
 	async def __read_weekly_meetings(self):
-		# flag if the list was updated while reading it
-		update = False
-
-		# read the weekly meetings file
-		with open(self.weekly_path, 'r') as file:
-			lines = file.readlines()
-		
-		# if the file was empty
-		if len(lines) <= 0:
+		# read the saved weekly meeting index and weekly meetings
+		index, meetings = await ServerData.io.run(self.server_id, ServerData.storage.read_weekly_meetings, self.server_id)
+
+		# move every weekly meeting that already happened to its next occurrence
+		meetings, meetings_missed, meetings_stale = ServerData.catch_up_weekly_meetings(meetings, datetime.datetime.now(timezone))
+
+		# rebuild the weekly schedule (no alerts go out here, they get scheduled after all of the data is read)
+		self.weekly_meetings = WeeklySchedule(meetings[:ServerData.max_weekly_meetings])
+		# every meeting that already happened had its soon alert go out already, so take them off of the weekly meeting index
+		self.weekly_meeting_index = min(max(index - meetings_stale, 0), len(self.weekly_meetings))
+
+		# if any meetings already happened, move the agenda and meeting minutes duty along for all of them at once and save the new list
+		if meetings_stale > 0:
+			if meetings_missed > 0:
+				self.inc_agenda(meetings_missed)
+				self.inc_minutes(meetings_missed)
 			self.__save_weekly_meetings()
-		# if the file wasn't empty
-		else:
-			index = lines[0].strip()
-			# if the first line is a positive integer
-			if index.isnumeric():
-				# set the meeting index to the number on the first line
-				self.weekly_meeting_index = int(index)
-			# else let it stay as 0
-			
-			# get the current date and time
-			now = datetime.datetime.now(timezone)
-			# for each line that was read in the file
-			for line in lines[1:]:
-				# get the date and time of the meeting from the string
-				try:
-					meeting = datetime.datetime.strptime(line.strip(), ServerData.dtfstr)
-				# just do the next line if this one is wrong
-				except:
-					continue
 
-				# if the meeting time is in the past
-				if meeting < now:
-					# set the update flag to true so the bot will update the data in the file
-					update = True
-					# calculate how much time has passed since this meeting
-					delta = now - meeting
-					# calculate how many of these weekly meetings were missed
-					meetings_missed = delta.days // 7
-					delta_week_mod = delta.days % 7
-					# if today is the same weekday day as this weekly meeting
-					if delta_week_mod == 0:
-						today_meeting = meeting + delta
-						# if the meeting has already happened today
-						if today_meeting < now:
-							# make it so this weekly meeting will be stored as next week
-							delta_week_mod = 14
-						# if it hasn't happened yet today
-						else:
-							# don't include this meeting as being missed
-							meetings_missed -= 1
-					
-					# calculate how many days to add to the meeting to put it to the next weekly occurrence
-					delta = datetime.timedelta(days = delta.days + (7 - delta_week_mod))
-					# add the days to the meeting time
-					meeting += delta
-					# increase the agenda and meeting minutes indexes for how many meetings were missed and decrease the meetings index
-					self.inc_agenda(meetings_missed)
-					self.inc_minutes(meetings_missed)
-					self.adjust_weekly_meeting_index(-1, save=False)
-				
-				# add the meeting to the weekly meetings list
-				await self.add_weekly_meeting(meeting, save=False)
-			
-			# if there were any changes to the list while reading it, save the new list
-			if update:
-				self.__save_weekly_meetings()
-	
-	# reads data from the agenda order file, stores it in this object, and updates the file if needed
-	def __read_agenda(self):
-		# read the agenda order file
-		with open(self.agenda_path, 'r', encoding='utf8') as file:
-			lines = file.readlines()
-		
-		# remove the newline from each name and add it to the agenda order list
-		for line in lines[1:]:
-			self.agenda_order.append(line.strip())
-		
-		# if the file was empty
-		if len(lines) <= 0:
+	# reads the saved agenda order data, stores it in this object, and updates the saved data if needed
+	async def __read_agenda(self):
+		# read the saved agenda index and agenda order
+		index, self.agenda_order = await ServerData.io.run(self.server_id, ServerData.storage.read_agenda, self.server_id)
+
+		# if the index is not a positive integer or is too big
+		if index is None or (index > 0 and index >= len(self.agenda_order)):
+			# set the index to 0 and update the saved data
+			self.agenda_index = 0
 			self.__save_agenda()
 		else:
-			# remove newline from index
-			index = lines[0].strip()
-			# if the index is a positive integer
-			if index.isnumeric():
-				# grab the index
-				self.agenda_index = int(index)
-				# if the index is too big
-				if self.agenda_index >= len(self.agenda_order):
-					# set the index to 0 and update the data in the list's file
-					self.agenda_index = 0
-					self.__save_agenda()
-			# if the index is not a positive integer, update the data in the list's file so the index in there will be 0
-			else:
-				self.__save_agenda()
-	
-	# reads data from the meeting minutes order file, stores it in this object, and updates the file if needed
-	def __read_minutes(self):
-		# read the meeting minutes order file
-		with open(self.minutes_path, 'r', encoding='utf8') as file:
-			lines = file.readlines()
-		
-		# remove the newline from each name and add it to the meeting minutes order list
-		for line in lines[1:]:
-			self.minutes_order.append(line.strip())
-		
-		# if the file was empty
-		if len(lines) <= 0:
-			self.__save_agenda()
+			self.agenda_index = index
+
+	# reads the saved meeting minutes order data, stores it in this object, and updates the saved data if needed
+	async def __read_minutes(self):
+		# read the saved minutes index and meeting minutes order
+		index, self.minutes_order = await ServerData.io.run(self.server_id, ServerData.storage.read_minutes, self.server_id)
+
+		# if the index is not a positive integer or is too big
+		if index is None or (index > 0 and index >= len(self.minutes_order)):
+			# set the index to 0 and update the saved data
+			self.minutes_index = 0
+			self.__save_minutes()
 		else:
-			# remove newline from index
-			index = lines[0].strip()
-			# if the index is a positive integer
-			if index.isnumeric():
-				# grab the index
-				self.minutes_index = int(index)
-				# if the index is too big
-				if self.minutes_index >= len(self.minutes_order):
-					# set the index to 0 and update the data in the list's file
-					self.minutes_index = 0
-					self.__save_minutes()
-			# if the index is not a positive integer, update the data in the list's file so the index in there will be 0
-			else:
-				self.__save_minutes()
-	
-	# reads data from the alert_channel file, stores it in this object, and updates the file if needed
-	def __read_alert_channel(self):
-		# read the alert channel
-		with open(self.alert_path, 'r') as file:
-			channel_id = file.read().strip()
-			# try converting the data read from the file into a discord channel object
-			try:
-				self.alert_channel = client.get_channel(int(channel_id))
-			# if the file didn't have a valid discord channel id in it
-			except:
-				# reset the alert channel
-				self.reset_alert_channel(self.server)
-				return
-		
+			self.minutes_index = index
+
+	# reads the saved alert channel, stores it in this object, and updates the saved data if needed
+	async def __read_alert_channel(self):
+		# read the id of the saved alert channel
+		channel_id = await ServerData.io.run(self.server_id, ServerData.storage.read_alert_channel, self.server_id)
+		server = self.server
+		# if the bot can't get to the server right now, keep the saved alert channel (it gets checked again when the bot reconnects)
+		if server is None:
+			self.alert_channel_id = channel_id
+			return
+		# if there wasn't a valid discord channel id saved
+		if channel_id is None:
+			# reset the alert channel
+			self.reset_alert_channel(server)
+			return
+
+		# convert the saved id into a discord channel object
+		channel = server.get_channel(channel_id)
 		# if the text channel exists in this server
-		if self.alert_channel in self.server.text_channels:
-			channel_perms = self.alert_channel.permissions_for(self.server.me)
+		if channel is not None and channel in server.text_channels:
+			self.alert_channel = channel
+			channel_perms = ServerData.permissions.channel_permissions(channel)
 			# if the bot doesn't have permission to send messages in this channel
 			if not channel_perms.send_messages:
 				# reset the alert channel
-				self.reset_alert_channel(self.server)
+				self.reset_alert_channel(server)
 		# if the text channel doesn't exist in this server
 		else:
 			# reset the alert channel
-			self.reset_alert_channel(self.server)
-	
-	# reads data from th birthdays file, stores it in this object, and updates the file if needed
+			self.reset_alert_channel(server)
+
+	# reads the saved birthdays, stores them in this object, and updates the saved data if needed
 	async def __read_bdays(self):
 		# flag if the list was updated while reading it
 		update = False
 
-		# read the bdays file
-		with open(self.bdays_path, 'r') as file:
-			lines = file.readlines()
-		
 		# get the current date and time
 		now = datetime.datetime.now(timezone)
-		# for each line that was read in the file
-		for line in lines:
-			# get the name and datetime of the bday
-			try:
-				# assume the name of the bday goes up to the 20th last character, which is where the datetime should begin (including the newline char)
-				index = -26
-				name = line[:index].strip()
-				# get the datetime of the bday
-				date = datetime.datetime.strptime(line[index:].strip(), ServerData.dtfstr)
-			# set the update flag and do the next line if this one is wrong
-			except:
-				update = True
-				continue
-
+		# for each bday that was saved
+		for name, date, leap_day in await ServerData.io.run(self.server_id, ServerData.storage.read_bdays, self.server_id):
+			# construct the bday object (leap day bdays are saved as feb 28th in years that aren't leap years)
+			bday = BDay(date, name, leap_day)
 			# if the bday is in the past, update the year so it can be put back into the list
-			if date < now:
-				# set the update flag to true so the bot will update the data in the file
+			if bday.date < now:
+				# set the update flag to true so the bot will update the saved data
 				update = True
-				date = datetime.datetime(now.year, date.month, date.day, hour=date.hour, minute=date.minute, tzinfo=timezone)
+				bday = bday.in_year(now.year)
 				# if the bday is still in the past when is has the same year as now, set it's year to next year
-				if date < now:
-					date = datetime.datetime(now.year + 1, date.month, date.day, hour=date.hour, minute=date.minute, tzinfo=timezone)
-			
-			# construct the bday object and add it to the list in order
-			bday = BDay(date, name)
-			await self.add_bday(bday, save=False)
-		
+				if bday.date < now:
+					bday = bday.in_year(now.year + 1)
+
+			# add the bday to the list in order
+			await self.__add_bday(bday, save=False)
+
 		# if there were any changes to the list while reading it, save the new list
 		if update:
 			self.__save_bdays()
-	
+
 	###########################################################################
 	#
 	# alert functions
 	#
 	###########################################################################
 
+	# sends an alert message to the alert channel, and if none of it was sent, finds a new alert channel and sends it there
+	# (if the bot can't get to the server right now, like when it's unavailable or the bot was removed from it, the alert is
+	# skipped so whatever alert comes after it still gets scheduled)
+	async def __send_alert(self, message: str):
+		if await safe_message(self.alert_channel, message):
+			return
+
+		server = self.server
+		if server is None:
+			return
+		self.reset_alert_channel(server)
+		await safe_message(self.alert_channel, message)
+
 	# @s everyone to say that a meeting will be soon, what time it will be at, and who's on meeting minutes duty for it
 	# also adjusts the meeting index to put the next meeting on deck for being alerted about, and starts a meeting now loop if there isn't already one
 	async def __send_meeting_soon_alert(self):
-		# if this program is being run on windows
-		if sys.platform == 'win32':
-			message = self.meetings[self.meeting_index].strftime(f'@everyone **Meeting Soon at %#H:%M / %#I:%M %p {tzstr}**\n\n')
-		# if this program is being run on linux, mac os, or any other os
-		else:
-			message = self.meetings[self.meeting_index].strftime(f'@everyone **Meeting Soon at %-H:%M / %-I:%M %p {tzstr}**\n\n')
+		message = self.meetings[self.meeting_index].strftime(f'@everyone **Meeting Soon at {time_format}**\n\n')
 		
 		# if there is a meeting minutes list
 		if len(self.minutes_order) > 0:
 			message += f'**Meeting Minutes Duty:** {self.minutes_order[self.minutes_index]}'
 		
-		# if none of the message was sent
-		if not await safe_message(self.alert_channel, message):
-			# try finding a new alert channel and sending it there
-			self.reset_alert_channel(self.server)
-			await safe_message(self.alert_channel, message)
+		await self.__send_alert(message)
 		
 		# increase the meeting index so the next meeting gets checked for
 		self.adjust_meeting_index(1)
-		# start a meeting now loop if there isn't already one running
-		await self.__start_meeting_now_loop()
+		# schedule the meeting now alert for the soonest meeting
+		self.__schedule_meeting_now()
 	
 	# @s everyone to say that a weekly meeting will be soon, what time it will be at, and who's on meeting minutes duty for it
 	# also adjusts the weekly meeting index to put the next weekly meeting on deck for being alerted about, and starts a weekly meeting now loop if there isn't already one
 	async def __send_weekly_meeting_soon_alert(self):
-		# if this program is being run on windows
-		if sys.platform == 'win32':
-			message = self.weekly_meetings[self.weekly_meeting_index].strftime(f'@everyone **Weekly Meeting Soon at %#H:%M / %#I:%M %p {tzstr}**\n\n')
-		# if this program is being run on linux, mac os, or any other os
-		else:
-			message = self.weekly_meetings[self.weekly_meeting_index].strftime(f'@everyone **Weekly Meeting Soon at %-H:%M / %-I:%M %p {tzstr}**\n\n')
+		message = self.weekly_meetings[self.weekly_meeting_index].strftime(f'@everyone **Weekly Meeting Soon at {time_format}**\n\n')
 		
 		# if there is an agenda list
 		if len(self.agenda_order) > 0:
@@ -1275,16 +2683,12 @@ class ServerData:
 		if len(self.minutes_order) > 0:
 			message += f'**Meeting Minutes Duty:** {self.minutes_order[self.minutes_index]}'
 		
-		# if none of the message was sent
-		if not await safe_message(self.alert_channel, message):
-			# try finding a new alert channel and sending it there
-			self.reset_alert_channel(self.server)
-			await safe_message(self.alert_channel, message)
+		await self.__send_alert(message)
 		
 		# increase the weekly meeting index so the next meeting gets checked for
 		self.adjust_weekly_meeting_index(1)
-		# start a weekly meeting now loop if there isn't already one running
-		await self.__start_weekly_meeting_now_loop()
+		# schedule the weekly meeting now alert for the soonest weekly meeting
+		self.__schedule_weekly_meeting_now()
 
 	# @s everyone to say that a meeting has started and who's on meeting minutes duty for it
 	# also removes the first meeting from the meetings list and adjusts indexes adjust to the next meeting
@@ -1295,14 +2699,11 @@ class ServerData:
 		if len(self.minutes_order) > 0:
 			message += f'**Meeting Minutes Duty:** {self.minutes_order[self.minutes_index]}'
 		
-		# if none of the message was sent
-		if not await safe_message(self.alert_channel, message):
-			# try finding a new alert channel and sending it there
-			self.reset_alert_channel(self.server)
-			await safe_message(self.alert_channel, message)
+		await self.__send_alert(message)
 		
 		# remove the first meeting from the list
-		self.meetings = self.meetings[1:]
+		self.meetings.pop(0)
+		self.__changed('meetings')
 		# go to the next person on agenda meeting minutes duty
 		self.inc_minutes()
 		# decrease the meeting index to account for the pop
@@ -1322,17 +2723,10 @@ class ServerData:
 		if len(self.minutes_order) > 0:
 			message += f'**Meeting Minutes Duty:** {self.minutes_order[self.minutes_index]}'
 		
-		# if none of the message was sent
-		if not await safe_message(self.alert_channel, message):
-			# try finding a new alert channel and sending it there
-			self.reset_alert_channel(self.server)
-			await safe_message(self.alert_channel, message)
+		await self.__send_alert(message)
 		
-		# move the meeting back by 7 days and put it at the back of the list
-		delta_week = datetime.timedelta(days = 7)
-		next_meeting = self.weekly_meetings[0] + delta_week
-		self.weekly_meetings = self.weekly_meetings[1:]
-		self.weekly_meetings.append(next_meeting)
+		# move the meeting to next week, which puts it at the back of the schedule
+		self.weekly_meetings.advance()
 		# go to the next person on agenda and meeting minutes duty
 		self.inc_agenda()
 		self.inc_minutes()
@@ -1344,174 +2738,220 @@ class ServerData:
 		# constructs the message
 		message = f'@everyone Happy birthday {self.bdays[0].name}!'
 
-		# if none of the message was sent
-		if not await safe_message(self.alert_channel, message):
-			# try finding a new alert channel and sending it there
-			self.reset_alert_channel(self.server)
-			await safe_message(self.alert_channel, message)
+		await self.__send_alert(message)
 		
-		# move the birthday date back by 1 year and put it at the end of the list
-		try:
-			# if the birthday is on a leap day (feb 29)
-			if self.bdays[0].leap_day:
-				# try using the leap day for next year
-				day = 29
-			else:
-				day = self.bdays[0].date.day
-			
-			self.bdays[0].date = datetime.datetime(self.bdays[0].date.year + 1, self.bdays[0].date.month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-			next_bday = self.bdays[0]
-			self.bdays = self.bdays[1:]
-			self.bdays.append(next_bday)
-		except:
-			# if the bday is on a leap day
-			# use feb 28th for this year instead and set the leap_day flag to true for the bday object
-			if self.bdays[0].day == 29 and self.bdays[0].month == 2:
-				now = datetime.datetime.now(timezone)
-				day = 28
-				bday = datetime.datetime(now.year, self.bdays[0].month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-				self.bdays[0].leap_day = True
-				# if the meeting date is before now, increment it by a year
-				if bday < now:
-					bday = datetime.datetime(now.year + 1, self.bdays[0].month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-				
-				next_bday = self.bdays[0]
-				self.bdays = self.bdays[1:]
-				self.bdays.append(next_bday)
-			# otherwise, the birthday's corrupted
-			else:
-				# forget about it
-				self.bdays = self.bdays[1:]
+		# move the birthday to next year and put it back in the list in order
+		next_bday = self.bdays.pop(0)
+		self.bdays.add(next_bday.in_year(next_bday.year + 1))
+		self.__changed('bdays')
 		
 		self.__save_bdays()
 	
 	###########################################################################
 	#
-	# loop control functions
+	# alert scheduling functions
 	#
 	###########################################################################
 
-	# creates a new async task for the meeting soon loop if there isn't already one currently running
-	async def __start_meeting_soon_loop(self):
-		if self.meeting_soon_loop is None or self.meeting_soon_loop.cancelled() or self.meeting_soon_loop.done() or self.meeting_soon_loop.cancelling() > 0:
-			self.meeting_soon_loop = client.loop.create_task(self.__meeting_soon_loop())
+	# puts every alert this server needs on the scheduler
+	def __schedule_all(self):
+		self.__schedule_meeting_soon()
+		self.__schedule_meeting_now()
+		self.__schedule_weekly_meeting_soon()
+		self.__schedule_weekly_meeting_now()
+		self.__schedule_bday()
+
+	# schedules the meeting soon alert for the meeting at the meeting index, or cancels it if every meeting has already had one
+	def __schedule_meeting_soon(self):
+		if self.meeting_index < len(self.meetings):
+			alert_time = self.meetings[self.meeting_index] - datetime.timedelta(minutes = ServerData.soon_mins)
+			ServerData.scheduler.schedule(self.server_id, 'meeting_soon', alert_time, self.__meeting_soon_alarm)
+		else:
+			ServerData.scheduler.cancel(self.server_id, 'meeting_soon')
 
-	# creates a new async task for the weekly meeting soon loop if there isn't already one currently running
-	async def __start_weekly_meeting_soon_loop(self):
-		if self.weekly_meeting_soon_loop is None or self.weekly_meeting_soon_loop.cancelled() or self.weekly_meeting_soon_loop.done() or self.weekly_meeting_soon_loop.cancelling() > 0:
-			self.weekly_meeting_soon_loop = client.loop.create_task(self.__weekly_meeting_soon_loop())
+	# schedules the weekly meeting soon alert for the weekly meeting at the weekly meeting index, or cancels it if every weekly meeting has already had one
+	def __schedule_weekly_meeting_soon(self):
+		if self.weekly_meeting_index < len(self.weekly_meetings):
+			alert_time = self.weekly_meetings[self.weekly_meeting_index] - datetime.timedelta(minutes = ServerData.soon_mins)
+			ServerData.scheduler.schedule(self.server_id, 'weekly_meeting_soon', alert_time, self.__weekly_meeting_soon_alarm)
+		else:
+			ServerData.scheduler.cancel(self.server_id, 'weekly_meeting_soon')
 
-	# creates a new async task for the meeting now loop if there isn't already one currently running
-	async def __start_meeting_now_loop(self):
-		if self.meeting_now_loop is None or self.meeting_now_loop.cancelled() or self.meeting_now_loop.done() or self.meeting_now_loop.cancelling() > 0:
-			self.meeting_now_loop = client.loop.create_task(self.__meeting_now_loop())
-	
-	# creates a new async task for the weekly meeting now loop if there isn't already one currently running
-	async def __start_weekly_meeting_now_loop(self):
-		if self.weekly_meeting_now_loop is None or self.weekly_meeting_now_loop.cancelled() or self.weekly_meeting_now_loop.done() or self.weekly_meeting_now_loop.cancelling() > 0:
-			self.weekly_meeting_now_loop = client.loop.create_task(self.__weekly_meeting_now_loop())
+	# schedules the meeting now alert for the soonest meeting, or cancels it if no meeting has had a soon alert go out
+	def __schedule_meeting_now(self):
+		if self.meeting_index > 0 and len(self.meetings) > 0:
+			ServerData.scheduler.schedule(self.server_id, 'meeting_now', self.meetings[0], self.__meeting_now_alarm)
+		else:
+			ServerData.scheduler.cancel(self.server_id, 'meeting_now')
 
-	# creates a new async task that says happy birthday on peoples' birthdays
-	async def __start_bday_loop(self):
-		if self.bday_loop is None or self.bday_loop.cancelled() or self.bday_loop.done() or self.bday_loop.cancelling() > 0:
-			self.bday_loop = client.loop.create_task(self.__bday_loop())
+	# schedules the weekly meeting now alert for the soonest weekly meeting, or cancels it if no weekly meeting has had a soon alert go out
+	def __schedule_weekly_meeting_now(self):
+		if self.weekly_meeting_index > 0 and len(self.weekly_meetings) > 0:
+			ServerData.scheduler.schedule(self.server_id, 'weekly_meeting_now', self.weekly_meetings[0], self.__weekly_meeting_now_alarm)
+		else:
+			ServerData.scheduler.cancel(self.server_id, 'weekly_meeting_now')
 
-	# stops an async task from running if it currently is running
-	async def __end_loop(self, loop):
-		if loop is not None and not loop.cancelled() and not loop.done():
-			loop.cancel()
+	# schedules the bday alert for the soonest bday, or cancels it if there are no bdays
+	def __schedule_bday(self):
+		if len(self.bdays) > 0:
+			ServerData.scheduler.schedule(self.server_id, 'bday', self.bdays[0].date, self.__bday_alarm)
+		else:
+			ServerData.scheduler.cancel(self.server_id, 'bday')
 
 	###########################################################################
 	#
-	# time check loop functions
+	# alarm functions (called by the scheduler when an alert is due)
 	#
 	###########################################################################
 
-	# gives warnings when a meeting is in 30 minutes
-	async def __meeting_soon_loop(self):
-		delta_soon = datetime.timedelta(minutes = ServerData.soon_mins)
-		# while there are meetings left in the list to check for
-		while self.meeting_index < len(self.meetings):
-			# get the current time
+	# gives a warning when a meeting is in 30 minutes
+	async def __meeting_soon_alarm(self):
+		async with self.lock:
+			self.touch()
 			now = datetime.datetime.now(timezone)
-			# get the soon time before the index meeting
-			alert_time = self.meetings[self.meeting_index] - delta_soon
-			# calculate how many seconds to wait from now until 30 minutes before the index meeting
-			wait_time = (alert_time - now).total_seconds()
-			# if the meeting is more than soon_min minutes away from now
-			if wait_time > 0:
-				# wait until 30 minutes before the index meeting
-				await asyncio.sleep(wait_time)
-			
-			# send an alert about the meeting being soon
-			await self.__send_meeting_soon_alert()
-	
-	# gives warnings when a weekly meeting is in 30 minutes
-	async def __weekly_meeting_soon_loop(self):
-		delta_soon = datetime.timedelta(minutes = ServerData.soon_mins)
-		# while there are meetings left in the list to check for
-		while self.weekly_meeting_index < len(self.weekly_meetings):
-			# get the current time
+			delta_soon = datetime.timedelta(minutes = ServerData.soon_mins)
+			# if the meeting at the meeting index is due for a soon alert, send it
+			if self.meeting_index < len(self.meetings) and self.meetings[self.meeting_index] - delta_soon <= now:
+				await self.__send_meeting_soon_alert()
+
+			# wait for the next meeting
+			self.__schedule_meeting_soon()
+
+	# gives a warning when a weekly meeting is in 30 minutes
+	async def __weekly_meeting_soon_alarm(self):
+		async with self.lock:
+			self.touch()
 			now = datetime.datetime.now(timezone)
-			# get the soon time before the index meeting
-			alert_time = self.weekly_meetings[self.weekly_meeting_index] - delta_soon
-			# calculate how many seconds to wait from now until 30 minutes before the index meeting
-			wait_time = (alert_time - now).total_seconds()
-			# if the meeting is more than soon_min minutes away from now
-			if wait_time > 0:
-				# wait until 30 minutes before the index meeting
-				await asyncio.sleep(wait_time)
-			
-			# send an alert about the meeting being soon
-			await self.__send_weekly_meeting_soon_alert()
-	
-	# gives alerts when a meeting is starting
-	async def __meeting_now_loop(self):
-		# while there are still meetings in the list that have already had a soon alert go out
-		while len(self.meetings[:self.meeting_index]) > 0:
-			# get the current time
+			delta_soon = datetime.timedelta(minutes = ServerData.soon_mins)
+			# if the weekly meeting at the weekly meeting index is due for a soon alert, send it
+			if self.weekly_meeting_index < len(self.weekly_meetings) and self.weekly_meetings[self.weekly_meeting_index] - delta_soon <= now:
+				await self.__send_weekly_meeting_soon_alert()
+
+			# wait for the next weekly meeting
+			self.__schedule_weekly_meeting_soon()
+
+	# gives an alert when a meeting is starting
+	async def __meeting_now_alarm(self):
+		async with self.lock:
+			self.touch()
 			now = datetime.datetime.now(timezone)
-			# calculate how many seconds to wait from now until the next meeting
-			wait_time = (self.meetings[0] - now).total_seconds()
-			# if the next meeting hasn't started yet
-			if wait_time > 0:
-				# wait until the meeting starts
-				await asyncio.sleep(wait_time)
-			
-			# send an alert about the meeting starting
-			await self.__send_meeting_now_alert()
-	
-	# gives alerts when a weekly meeting is starting
-	async def __weekly_meeting_now_loop(self):
-		# while there are still meetings in the list that have already had a soon alert go out
-		while len(self.weekly_meetings[:self.weekly_meeting_index]) > 0:
-			# get the current time
+			# if the soonest meeting already had a soon alert go out and it has started, send the alert
+			if self.meeting_index > 0 and len(self.meetings) > 0 and self.meetings[0] <= now:
+				await self.__send_meeting_now_alert()
+
+			# wait for the next meeting
+			self.__schedule_meeting_now()
+			self.__schedule_meeting_soon()
+
+	# gives an alert when a weekly meeting is starting
+	async def __weekly_meeting_now_alarm(self):
+		async with self.lock:
+			self.touch()
 			now = datetime.datetime.now(timezone)
-			# calculate how many seconds to wait from now until the next meeting
-			wait_time = (self.weekly_meetings[0] - now).total_seconds()
-			# if the next meeting hasn't started yet
-			if wait_time > 0:
-				# wait until the meeting starts
-				await asyncio.sleep(wait_time)
-			
-			# send an alert about the meeting starting
-			await self.__send_weekly_meeting_now_alert()
-	
-	# gives alerts at 8:00 am when it's someone's bday
-	async def __bday_loop(self):
-		# while there are birthdays in the bday list
-		while len(self.bdays) > 0:
-			# get the current time
+			# if the soonest weekly meeting already had a soon alert go out and it has started, send the alert
+			if self.weekly_meeting_index > 0 and len(self.weekly_meetings) > 0 and self.weekly_meetings[0] <= now:
+				await self.__send_weekly_meeting_now_alert()
+
+			# wait for the next weekly meeting (the one that just started moved to next week, so it needs another soon alert too)
+			self.__schedule_weekly_meeting_now()
+			self.__schedule_weekly_meeting_soon()
+
+	# gives an alert at 8:00 am when it's someone's bday
+	async def __bday_alarm(self):
+		async with self.lock:
+			self.touch()
 			now = datetime.datetime.now(timezone)
-			# calculate how many seconds to wait from now until the next birthday
-			wait_time = (self.bdays[0].date - now).total_seconds()
-			# if it's not time to send an alert about the birthday yet
-			if wait_time > 0:
-				# wait until it's time to send a bday alert
-				await asyncio.sleep(wait_time)
-			
-			# say happy birthday!
-			await self.__send_bday_alert()
+			# if it's time to say happy birthday to the soonest bday
+			if len(self.bdays) > 0 and self.bdays[0].date <= now:
+				await self.__send_bday_alert()
+
+			# wait for the next bday
+			self.__schedule_bday()
+
+########################################################################################################################
+#
+# server data loading
+#
+########################################################################################################################
+
+# returns a server's data, loading it if it isn't in memory and lazy loading is on
+# returns none if the server's data isn't available
+async def get_server_data(server):
+	if server is None:
+		return None
+
+	data = server_data.get(server.id)
+	if data is None:
+		if not ServerData.lazy_loading:
+			return None
+		data = await load_server_data(server)
+
+	data.touch()
+	return data
+
+# loads a server's data into memory and returns it
+# if the server is already being loaded, waits for that instead of loading it twice
+async def load_server_data(server):
+	loading = loading_servers.get(server.id)
+	if loading is None:
+		loading = client.loop.create_task(store_new_server_data(server))
+		loading_servers[server.id] = loading
+		loading.add_done_callback(lambda task: loading_servers.pop(server.id, None))
+	# shield the load so a cancelled command doesn't cancel it for everyone else waiting on it
+	return await asyncio.shield(loading)
+
+# does the actual loading for load_server_data()
+async def store_new_server_data(server):
+	data = await ServerData.create_ServerData(server)
+	server_data[server.id] = data
+	# the server's own alerts are on the scheduler now, so it doesn't need to be woken up anymore
+	ServerData.scheduler.cancel(server.id, 'wake')
+	if ServerData.lazy_loading:
+		await evict_idle_servers()
+	return data
+
+# schedules a server's data to be loaded back into memory a little before timestamp so it's there for its next alert
+def schedule_wake(server_id: int, timestamp: float):
+	async def wake():
+		server = client.get_guild(server_id)
+		if server is not None:
+			await get_server_data(server)
+
+	wake_time = datetime.datetime.fromtimestamp(timestamp - ServerData.wake_early_secs, timezone)
+	ServerData.scheduler.schedule(server_id, 'wake', wake_time, wake)
+
+# takes the least recently used servers out of memory until there are no more than the max amount of resident servers
+# servers that were used recently or have an alert coming up soon are kept
+async def evict_idle_servers():
+	excess = len(server_data) - ServerData.max_resident_servers
+	now = client.loop.time()
+	for server_id, data in list(server_data.items()):
+		if excess <= 0:
+			break
+		# the dict is in least to most recently used order, so every server after one that was used recently was too
+		if now - data.last_used < ServerData.min_idle_secs:
+			break
+		# skip servers that were removed or reloaded while an earlier server was being taken out of memory
+		if server_data.get(server_id) is not data:
+			continue
+		# skip servers that are in the middle of a change or an alert
+		if data.lock.locked():
+			continue
+
+		# if this server has an alert coming up soon, keep it since it would just be loaded right back
+		next_time = ServerData.scheduler.next_time(server_id)
+		if next_time is not None and next_time - datetime.datetime.now(timezone).timestamp() < ServerData.min_idle_secs + ServerData.wake_early_secs:
+			continue
+
+		server_data.pop(server_id)
+		ServerData.permissions.invalidate(server_id)
+		excess -= 1
+		# swap the server's alerts for a single wake up before the earliest one
+		ServerData.scheduler.cancel_server(server_id)
+		if next_time is not None:
+			schedule_wake(server_id, next_time)
+		# save any changes before the data is gone (saves for this server always finish before it can be read again)
+		await ServerData.writer.save_now(data)
 
 ########################################################################################################################
 #
@@ -1519,6 +2959,16 @@ class ServerData:
 #
 ########################################################################################################################
 
+# sets up the storage engine that server data gets saved in
+if storage_engine == 'sqlite':
+	ServerData.storage = SQLiteStorage(ServerData.database_file)
+	# if there is server data saved as files from before, import it into the database and move the files out of the way so they only get imported once
+	if os.path.isdir(ServerData.server_root):
+		ServerData.storage.import_from(FileStorage(ServerData.server_root))
+		os.rename(ServerData.server_root, f'{ServerData.server_root}_imported')
+else:
+	ServerData.storage = FileStorage(ServerData.server_root)
+
 # called as soon as the bot is fully online and operational
 @client.event
 async def on_ready():
@@ -1529,21 +2979,103 @@ async def on_ready():
 	desktop_prefix = f"<@!{client.user.id}>"
 	mobile_prefix = f"<@{client.user.id}>"
 
+	global initialized
+	start_time = client.loop.time()
+	# if discord called this again because the bot reconnected, only update the data that changed while it was disconnected
+	if initialized:
+		print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", "Reconnected, reconciling server data...")
+		# the bot's permissions could have changed while it was disconnected without it getting the events for it
+		ServerData.permissions.clear()
+		await reconcile_servers()
 	# prints message to show that the bot is currently initializing the data for each server it's in
-	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", "Initializing server data...")
-
-	# sets up and starts running the bot for each server it's in
-	for server in client.guilds:
-		server_data[server] = await ServerData.create_ServerData(server)
+	else:
+		print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", "Initializing server data...")
+		initialized = True
+		# register the slash commands with discord (so any changes to them since the last time the bot ran show up)
+		try:
+			await tree.sync()
+		except discord.HTTPException as error:
+			print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Failed to register slash commands: {error}")
+
+	# servers that need their data set up (every server the first time, only servers that were joined while disconnected after that)
+	# when lazy loading is on, servers that already have a wake up or are being loaded are set up already
+	scheduled_ids = ServerData.scheduler.server_ids()
+	servers = [server for server in client.guilds if server.id not in server_data and server.id not in loading_servers and not (ServerData.lazy_loading and server.id in scheduled_ids)]
+	if len(servers) < 1:
+		print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Bot is running (no new servers, took {client.loop.time() - start_time:.3f}s)")
+		return
+
+	# find when each server's next alert is so the servers with the soonest alerts get set up first
+	# (anything in the past counts as due now since it might need to be caught up on)
+	alert_times = await client.loop.run_in_executor(ServerData.io.pool, ServerData.storage.next_alert_times)
+	servers.sort(key = lambda server: alert_times.get(server.id, float('inf')))
+	phase_time = client.loop.time()
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Found next alert times for {len(alert_times)} servers in {phase_time - start_time:.3f}s")
+
+	# if lazy loading is on, only schedule a wake up for each server a little before its first alert could go out
+	# (servers with alerts that are already due get loaded right away in order of how soon they are)
+	if ServerData.lazy_loading:
+		woken = 0
+		for server in servers:
+			if server.id in alert_times:
+				schedule_wake(server.id, alert_times[server.id] - ServerData.soon_mins * 60)
+				woken += 1
+		end_time = client.loop.time()
+		print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Scheduled wake ups for {woken} servers in {end_time - phase_time:.3f}s")
+	# if lazy loading is off, load every server's data now
+	else:
+		# sets up and starts running the bot for each server, a few servers at a time
+		# (servers get through the semaphore in the order they started waiting, so the soonest alerts still go first)
+		load_limit = asyncio.Semaphore(ServerData.max_concurrent_loads)
+		async def load_server(server):
+			async with load_limit:
+				try:
+					await load_server_data(server)
+				# if one server's data can't be loaded, keep loading the rest
+				except Exception as error:
+					print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Failed to load data for server {server.id}: {error}")
+		await asyncio.gather(*[load_server(server) for server in servers])
+		end_time = client.loop.time()
+		print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Loaded data for {len(servers)} servers in {end_time - phase_time:.3f}s")
 	
 	# prints message that the bot is done setting up
-	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", "Bot is running")
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Bot is running (startup took {end_time - start_time:.3f}s)")
+
+# brings the server data in memory up to date with the servers the bot is in after it reconnects
+# servers the bot isn't in anymore get taken out of memory (but their saved data is kept in case they come back)
+# servers it's still in get pointed at discord's newer objects for them and keep their alerts as they are
+async def reconcile_servers():
+	current_servers = {server.id: server for server in client.guilds}
+
+	# stop the alerts and wake ups of every server the bot isn't in anymore
+	for server_id in ServerData.scheduler.server_ids():
+		if server_id not in current_servers:
+			ServerData.scheduler.cancel_server(server_id)
+
+	# (this doesn't await anything so commands never see the dict half updated)
+	retired = []
+	for server_id, data in list(server_data.items()):
+		server = current_servers.get(server_id)
+		# if the bot isn't in this server anymore, take its data out of memory
+		if server is None:
+			server_data.pop(server_id)
+			retired.append(data)
+		# if the bot is still in this server, make sure its alert channel is still usable
+		else:
+			data.refresh_server(server)
+
+	# save any changes the retired servers had before their data is gone
+	for data in retired:
+		await ServerData.writer.save_now(data)
+
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Kept {len(server_data)} servers and retired {len(retired)} servers")
 
 # sets up the bot for a new server every time it joins one while running
 @client.event
 async def on_guild_join(server):
-	if len(server_data) <= 100:
-		server_data[server] = await ServerData.create_ServerData(server)
+	# (the server that was just joined is already in the guild list)
+	if len(client.guilds) <= ServerData.max_servers:
+		await load_server_data(server)
 	else:
 		channel = ServerData.find_first_message_channel(server)
 		if channel is not None:
@@ -1552,7 +3084,8 @@ async def on_guild_join(server):
 				message += f'Contact my admin if you wish to reserve a spot for your server with the me ({contact_info}). '
 				message += 'You can also visit the repository for my code for more info(https://github.com/ChandlerJayCalkins/Capstone-Meeting-Bot). '
 			message += 'Leaving server...'
-			channel.send(message)
+			# wait for the message to go out before leaving
+			await ServerData.sender.submit(SendDispatcher.alert, channel.id, channel.send, message)
 		await server.leave()
 
 ########################################################################################################################
@@ -1565,37 +3098,76 @@ async def on_guild_join(server):
 @client.event
 async def on_guild_remove(server):
 	# TODO: make it so the bot hangs onto a server's data for a day before it deletes it
-	# if the server's data exists
-	if server in server_data:
-		# deletes the folder and all files in it if the folder exists
-		if os.path.isdir(server_data[server].server_folder):
-			shutil.rmtree(server_data[server].server_folder)
-		
-		# deletes the server's data from ram
-		server_data.pop(server)
+	# if the server's data exists (it always does when lazy loading is on, even if it isn't in memory)
+	if server.id in server_data or ServerData.lazy_loading:
+		# stop all of the server's alerts
+		ServerData.scheduler.cancel_server(server.id)
+		# deletes the server's data from ram and forgets any changes that haven't been saved yet
+		data = server_data.pop(server.id, None)
+		if data is not None:
+			ServerData.writer.discard(data)
+		# forget the bot's permissions in the server
+		ServerData.permissions.invalidate(server.id)
+		# delete all of the server's saved data
+		await ServerData.io.run(server.id, ServerData.storage.delete_server, server.id)
+		ServerData.io.forget(server.id)
 
 # finds a new alert channel for a server if the current alert channel for a server was deleted
 @client.event
 async def on_guild_channel_delete(channel):
-	# update the server object that is being stored in memory
-	server_data[channel.guild].server = channel.guild
+	# the server's first channel the bot can send messages in might have been this one
+	ServerData.permissions.invalidate(channel.guild.id)
+	data = server_data.get(channel.guild.id)
+	# if the server's data isn't in memory, its alert channel gets checked when it's loaded
+	if data is None:
+		return
 	# if the channel that was deleted is the server's alert channel
-	if server_data[channel.guild].alert_channel == channel:
+	if data.alert_channel_id == channel.id:
 		# set the alert channel to the first text channel that the bot can send messages in
-		server_data[channel.guild].reset_alert_channel(channel.guild)
+		data.reset_alert_channel(channel.guild)
 
 # finds a new alert channel for a server if the current alert channel doesn't give the bot permission to send messages anymore
 @client.event
 async def on_guild_channel_update(before, after):
-	# update the server object that is being stored in memory
-	server_data[before.guild].server = after.guild
+	# the bot's permissions in the channel (or in the channels synced with it, if it's a category) might have changed
+	ServerData.permissions.invalidate(after.guild.id)
+	data = server_data.get(after.guild.id)
+	# if the server's data isn't in memory, its alert channel gets checked when it's loaded
+	if data is None:
+		return
 	# if the channel that was updated is the server's alert channel
-	if server_data[before.guild].alert_channel == before:
-		channel_perms = server_data[before.guild].alert_channel.permissions_for(after.guild.me)
+	if data.alert_channel_id == after.id:
+		channel_perms = ServerData.permissions.channel_permissions(after)
 		# if the bot doesn't have permission to send messages in the alert channel anymore
 		if not channel_perms.send_messages:
 			# set the alert channel to the first text channel that the bot can send messages in
-			server_data[before.guild].reset_alert_channel(after.guild)
+			data.reset_alert_channel(after.guild)
+
+# forgets the bot's permissions in a server when a channel is made, since it could be the first one the bot can send messages in now
+@client.event
+async def on_guild_channel_create(channel):
+	ServerData.permissions.invalidate(channel.guild.id)
+
+# forgets the bot's permissions in a server when a role is made, since the bot's permissions come from its roles
+@client.event
+async def on_guild_role_create(role):
+	ServerData.permissions.invalidate(role.guild.id)
+
+# (same for when a role's permissions or position change)
+@client.event
+async def on_guild_role_update(before, after):
+	ServerData.permissions.invalidate(after.guild.id)
+
+# (same for when a role is deleted)
+@client.event
+async def on_guild_role_delete(role):
+	ServerData.permissions.invalidate(role.guild.id)
+
+# forgets the bot's permissions in a server when its roles in that server change
+@client.event
+async def on_member_update(before, after):
+	if after.id == client.user.id:
+		ServerData.permissions.invalidate(after.guild.id)
 
 ########################################################################################################################
 #
@@ -1605,64 +3177,136 @@ async def on_guild_channel_update(before, after):
 
 # returns true if a message is a command, false if it isn't
 async def is_command(message) -> bool:
-	# if the message is not a DM, not from itself (prevents recursion), and starts with a command prefix
-	if message.guild and message.author.id != client.user.id and message.content.startswith(desktop_prefix) or message.content.startswith(mobile_prefix):
-		# if the message has an actual command (has more than just the prefix token)
-		if len(message.content.split()) > 1:
-			return True
-		# if the message is just @ing the bot with no command
-		else:
-			# reply with the help message and then return false
-			await help_command(message)
+	global accepted_messages
+	global rejected_messages
+
+	content = message.content
+	# every command starts with a mention of the bot, so throw out anything that doesn't start with a mention first
+	# since that's one check that rules out almost every message the bot sees
+	# then make sure the message is not a DM, not from itself (prevents recursion), and starts with a command prefix
+	if not content.startswith('<@') or message.guild is None or message.author.id == client.user.id or not content.startswith((desktop_prefix, mobile_prefix)):
+		rejected_messages += 1
+		# print the message counts every so often
+		if message_stats_interval > 0 and (accepted_messages + rejected_messages) % message_stats_interval == 0:
+			print_message_stats()
+		return False
+
+	accepted_messages += 1
+	# print the message counts every so often
+	if message_stats_interval > 0 and (accepted_messages + rejected_messages) % message_stats_interval == 0:
+		print_message_stats()
+
+	# if the message has an actual command (has more than just the prefix token)
+	if len(content.split(None, 1)) > 1:
+		return True
+	# if the message is just @ing the bot with no command
+	else:
+		# reply with the help message and then return false
+		await help_command(message)
 
 	return False
 
+# prints how many of the messages the bot has seen were commands and how many were thrown out
+# (along with stats about the messages and reactions the bot has sent, the permission cache, and how much memory server data takes up)
+def print_message_stats():
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Seen {accepted_messages + rejected_messages} messages: {accepted_messages} commands, {rejected_messages} rejected")
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Sends: {ServerData.sender.stats()}")
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Permission cache: {ServerData.permissions.stats()}")
+	total = sum(data.memory_size() for data in server_data.values())
+	average = total // len(server_data) if len(server_data) > 0 else 0
+	print(datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]"), f"{sys.argv[0]}:", f"Server data: {len(server_data)} servers in memory, {total / 1024:.1f} KB ({average} bytes per server)")
+
 # handles commands
 @client.event
 async def on_message(message):
 	# if the message is a command from a valid source, it starts with a command prefix, and the bot has the data for this server set up
-	if await is_command(message) and message.guild in server_data:
-		# splits the command up into tokens by whitespace
-		command = message.content.split()
-		# remove the prefix from the command list
-		command.pop(0)
-		# if there is a command
+	# (this loads the server's data if lazy loading is on and it isn't in memory)
+	if await is_command(message) and await get_server_data(message.guild) is not None:
+		# splits off the prefix and the command name from the rest of the command
+		command = message.content.split(None, 2)[1:]
+		# if there is a command, run the handler for it (each line of the rest of the command is rejoined with single spaces
+		# and blank lines are removed so the syntax patterns don't have to deal with extra whitespace)
 		if len(command) > 0:
-			# turns the first token (command type) into all lowercase so it's easier and faster to check the command type
-			command[0] = command[0].lower()
-			# if it's the help command
-			if command[0] == 'help':
-				if len(command) > 1:
-					await help_command(message, command[1])
-				else:
-					await help_command(message)
-			# if it's the add meeting command
-			elif command[0] == 'add':
-				await add_command(message, command)
-			# if it's the remove meeting command
-			elif command[0] == 'remove':
-				await remove_command(message, command)
-			# if it's the show meetings command
-			elif command[0] == 'meetings':
-				await meetings_command(message)
-			# if it's the set notetaking order command
-			elif command[0] == 'set':
-				await set_command(message, command)
-			# if it's the dutyorder command
-			elif command[0] == 'dutyorder':
-				await dutyorder_command(message)
-			# if it's the alert command
-			elif command[0] == 'alert':
-				await alert_command(message, command)
-			# if it's the bdays command
-			elif command[0] == 'bdays':
-				await bdays_command(message)
-			else:
-				await help_command(message)
+			lines = [' '.join(line.split()) for line in command[1].splitlines()] if len(command) > 1 else []
+			await run_command(message, command[0], '\n'.join(line for line in lines if line != ''))
 		# if the bot was @'d with no command
 		else:
 			await help_command(message)
 
+########################################################################################################################
+#
+# command registry
+#
+########################################################################################################################
+
+# maps the name of each command (the first word after the prefix) to a list of (pattern, handler, multiline) tuples, one for
+# each way the command can be used
+# the patterns are compiled once when the bot starts and get matched against everything after the command name
+# (so adding a command doesn't make any other command take longer to run)
+command_syntaxes = {}
+
+# registers the function below it as the handler for one way of using a command
+# syntax is a regular expression (that ignores case) for everything after the command name
+# each named group in it gets passed to the handler as a keyword argument after being run through the converter with the
+# same name in command_converters (groups without a converter are passed as the text they matched)
+# if multiline is true, the syntax gets the line breaks of the command (and . in it matches them), otherwise the lines of
+# the command are joined with spaces
+def command_syntax(name: str, syntax: str, multiline: bool = False):
+	def register(handler):
+		flags = re.IGNORECASE | re.DOTALL if multiline else re.IGNORECASE
+		command_syntaxes.setdefault(name, []).append((re.compile(syntax, flags), handler, multiline))
+		return handler
+	return register
+
+# runs the handler for the first syntax of a command that matches the rest of the command
+# reacts with an X if none of them match or if any of the arguments aren't valid, and shows the help message if the command doesn't exist
+async def run_command(message, name: str, args: str):
+	syntaxes = command_syntaxes.get(name.lower())
+	# if the command doesn't exist
+	if syntaxes is None:
+		await help_command(message)
+		return
+
+	# if the command has more than one line, try the syntaxes that take more than one line (like lists of things to add) first
+	if '\n' in args:
+		syntaxes = [syntax for syntax in syntaxes if syntax[2]] + [syntax for syntax in syntaxes if not syntax[2]]
+
+	# try each syntax of the command in the order they were registered
+	for pattern, handler, multiline in syntaxes:
+		match = pattern.fullmatch(args if multiline else args.replace('\n', ' '))
+		if match is not None:
+			# convert the arguments into the types the handler uses
+			kwargs = convert_command_args(match.groupdict())
+			# if any of the arguments aren't valid
+			if kwargs is None:
+				await react_with_x(message)
+			else:
+				await handler(message, **kwargs)
+			return
+
+	# if the command isn't used in any of the ways it can be
+	await react_with_x(message)
+
+# runs each argument of a command through the converter in command_converters with the same name
+# returns a dict of the converted arguments, or none if any of them aren't valid
+def convert_command_args(args: dict):
+	kwargs = {}
+	for name, text in args.items():
+		# leave out optional arguments that weren't used so the handler uses its default for them
+		if text is None:
+			continue
+
+		converter = command_converters.get(name)
+		if converter is not None:
+			text = converter(text)
+			# if the argument isn't valid
+			if text is None:
+				return None
+
+		kwargs[name] = text
+
+	return kwargs
+
 ########################################################################################################################
 #
 # command handling
@@ -1670,8 +3314,10 @@ async def on_message(message):
 ########################################################################################################################
 
 # handles the help command that displays a message about how to use commands
+# follows the format "help" or "help *command*" (anything after the command name is ignored)
+@command_syntax('help', r'(?:(?P<command>\S+)(?: .*)?)?')
 async def help_command(message, command = ''):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to send messages in the channel of the message
 	if channel_perms.send_messages:
 		command = command.lower()
@@ -1714,10 +3360,15 @@ async def help_command(message, command = ''):
 			reply += 'This will add a birthday to keep track of and I will say happy birthday on [date] to [name].\n'
 			reply += 'Note: you cannot add a birthday for a person with the exact same name and date as an already existing birthday.\n\n'
 
+			reply += f'**{desktop_prefix} add many** (then one entry per line, and / or an attached text or CSV file)\n'
+			reply += 'This will add a whole list of meetings, weekly meetings, and birthdays at once and I will reply with how many of each were added. '
+			reply += 'Each entry is written like the rest of one of the add commands above (like meeting on [date] at [time]) or as a CSV row (like meeting,[date],[time] or bday,[date],[name]).\n\n'
+
 			reply += '**Formatting:**\n\n'
 			reply += '**[date]:** YYYY/M/D or YYYY-M-D M/D or M-D (YYYY = year (1 <= YYYY <= 9999), M = month (1 <= M <= 12), D = day (1 <= D <= 31)).\n'
 			reply += 'Note: if the year is not inputted in the date, the next available date on M/D will be inputted. I will ignore years on bday inputs.\n'
-			reply += '**[time]:** H:M or H:M am/pm or H or H am/pm (H = hour (1 <= H <= 12 or 1 <= H <= 24), M = minute (1 <= M <= 59)).\n'
+			reply += 'Meeting dates can also be today, tomorrow, or next [day] (the first [day] after today).\n'
+			reply += '**[time]:** H:M or H:M am/pm or H or H am/pm (H = hour (1 <= H <= 12 or 1 <= H <= 24), M = minute (1 <= M <= 59)). The am/pm can go right after the time (like 3:30pm).\n'
 			reply += '**[day]:** Sundays: (su, sun, sunday, sundays), Mondays: (m, mon, monday, mondays), Tuesdays: (tu, tue, tues, tuesday, tuesdays), '
 			reply += 'Wednesdays: (w, wed, wednesday, wednesdays), Thursdays: (th, thu, thur, thurs, thursday, thursdays), Fridays: (f, fri, friday, fridays), '
 			reply += 'Saturdays: (sa, sat, saturdays, saturdays).\n\n'
@@ -1731,8 +3382,10 @@ async def help_command(message, command = ''):
 			reply += f'{desktop_prefix} add weekly meeting on mondays at 18\n'
 			reply += f'{desktop_prefix} add bday on 12-1 for Josh\n'
 			reply += f'{desktop_prefix} add meeting on 2024/10/31 at 1 am\n'
+			reply += f'{desktop_prefix} add meeting on next fri at 3:30pm\n'
 			reply += f'{desktop_prefix} add weekly meeting on friday at 1:45 pm\n'
-			reply += f'{desktop_prefix} add bday on 4/1 for Francis Fulloffrenchpeople'
+			reply += f'{desktop_prefix} add bday on 4/1 for Francis Fulloffrenchpeople\n'
+			reply += f'{desktop_prefix} add many\nmeeting on 5/3 at 3pm\nweekly meeting on tu at 15:30\nbday on 3/4 for Ada'
 
 			await safe_reply(message, reply)
 		# if the info on the remove command was requested
@@ -1871,15 +3524,40 @@ async def help_command(message, command = ''):
 			reply += 'This will display all birthdays that I am currently keeping track of to say happy birthday to.\n'
 			reply += 'Note: See how to add and remove birthdays in the "add" and "remove" command infos.'
 
+			await safe_reply(message, reply)
+		# if the info on the import command was requested
+		elif command == 'import':
+			# list of string lines that the bot will reply to the help command with
+			reply = f'`{command}:` Adds the meetings, weekly meetings, and birthdays in a calendar file from a calendar app.\n\n'
+
+			reply += '```Usage:```\n'
+
+			reply += f'**{desktop_prefix} import** (with a calendar (.ics) file attached)\n'
+			reply += 'This will add every event in the calendar and I will reply with how many meetings, weekly meetings, and birthdays were added. '
+			reply += 'One-time events become meetings, events that repeat every week become weekly meetings, and events that repeat every year become birthdays.\n'
+			reply += 'Note: events that repeat in other ways (like every other week) can\'t be added.'
+
+			await safe_reply(message, reply)
+		# if the info on the export command was requested
+		elif command == 'export':
+			# list of string lines that the bot will reply to the help command with
+			reply = f'`{command}:` Sends a calendar file of all meetings, weekly meetings, and birthdays I am keeping track of.\n\n'
+
+			reply += '```Usage:```\n'
+
+			reply += f'**{desktop_prefix} export**\n'
+			reply += 'This will send a calendar (.ics) file that can be imported into calendar apps (like Google Calendar or Outlook) or into me in another server.'
+
 			await safe_reply(message, reply)
 		# if no argument was given or it isn't recognized
 		else:
 			# list of commands that the bot has
-			command_list = ['help', 'add', 'remove', 'meetings', 'set', 'dutyorder', 'alert', 'bdays']
+			command_list = ['help', 'add', 'remove', 'meetings', 'set', 'dutyorder', 'alert', 'bdays', 'import', 'export']
 
 			# list of string lines that the bot will reply to the help command with
 			reply = f'`Usage:` **{desktop_prefix} [command] [arguments...]**\n\n'
-			reply += f'Type "{desktop_prefix} help [command]" to get more info on how to use a specific command.\n\n'
+			reply += f'Type "{desktop_prefix} help [command]" to get more info on how to use a specific command.\n'
+			reply += 'Every command can also be used as a slash command (like "/meetings" or "/add meeting").\n\n'
 
 			reply += f'```List of commands:```\n'
 
@@ -1915,763 +3593,1186 @@ async def help_command(message, command = ''):
 	else:
 		await react_with_x(message)
 
-# handles the add command that adds meetings to the server's meeting list
-async def add_command(message, command):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+# handles the add meeting command that adds a one-time meeting to the server's meeting list
+# follows the format "add meeting on *date* at *time*"
+@command_syntax('add', r'meeting on (?P<date>(?:next )?\S+) at (?P<time>\S+(?: [ap]m)?)')
+async def add_meeting_command(message, date: tuple, time: tuple):
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to add reactions in this channel
 	if channel_perms.add_reactions:
-		# if the command follows the format "add meeting on *day* at *time"
-		if len(command) > 5 and command[1].lower() == 'meeting' and command[2].lower() == 'on' and command[4].lower() == 'at':
-			# extract date
-			date_nums = str_to_date_nums(command[3])
-			# if the inputted date is invalid
-			if date_nums is None:
-				await react_with_x(message)
-				return
-			
-			# put date_num variables into more recognizable variable names
-			year, month, day = date_nums
-			
-			# extract time
-
-			# if the command has a "pm" or "am" after the time
-			if len(command) > 6:
-				# extract 12 hour time string into 24 hour time numbers
-				hour, minute = str_to_time_12hr(command[5], command[6])
-			else:
-				# extract 24 hour time string into numbers
-				hour, minute = str_to_time_24hr(command[5])
-			# if a valid time was not inputted
-			if hour is None:
-				await react_with_x(message)
-				return
-			
-			# construct datetime object
+		# construct datetime object
+		meeting = make_meeting_time(date, time)
+		# if the date isn't valid
+		if meeting is None:
+			await react_with_x(message)
+			return
+		
+		# add meeting to list
 
-			# if the year wasn't inputted
-			if year is None:
-				try:
-					now = datetime.datetime.now(timezone)
-					meeting = datetime.datetime(now.year, month, day, hour=hour, minute=minute, tzinfo=timezone)
-					# if the meeting date is before now, increment it by a year
-					if meeting < now:
-						meeting = datetime.datetime(now.year + 1, month, day, hour=hour, minute=minute, tzinfo=timezone)
-				# if the date isn't valid
-				except:
-					await react_with_x(message)
-					return
-			# if a year was inputted
-			else:
-				try:
-					meeting = datetime.datetime(year, month, day, hour=hour, minute=minute, tzinfo=timezone)
-				# if the date isn't valid
-				except:
-					await react_with_x(message)
-			
-			# add meeting to list
+		# if the meeting time is successfully added to the list
+		if await server_data[message.guild.id].add_meeting(meeting):
+			await react_with_check(message)
+		else:
+			await react_with_x(message)
 
-			# if the meeting time is successfully added to the list
-			if await server_data[message.guild].add_meeting(meeting):
-				await react_with_check(message)
-			else:
-				await react_with_x(message)
-		# if the command follows the format "add weekly meeting on *day* at *time*"
-		elif len(command) > 6 and command[1].lower() == 'weekly' and command[2].lower() == 'meeting' and command[3].lower() == 'on' and command[5].lower() == 'at':
-			# extract day
-
-			# get a number 0 to 6 of the day of the week
-			day = day_to_num(command[4])
-			# if a valid day of the week was not inputted
-			if day is None:
-				await react_with_x(message)
-				return
-			
-			# extract time
+# handles the add weekly meeting command that adds a meeting that recurs every week to the server's weekly meeting list
+# follows the format "add weekly meeting on *day* at *time*"
+@command_syntax('add', r'weekly meeting on (?P<day>\S+) at (?P<time>\S+(?: [ap]m)?)')
+async def add_weekly_meeting_command(message, day: int, time: tuple):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
+	if channel_perms.add_reactions:
+		# construct object
+		hour, minute = time
+		meeting = WeeklyMeeting(day, hour, minute)
 
-			# if the command has a "pm" or "am" after the time
-			if len(command) > 7:
-				# extract 12 hour time string into 24 hour time numbers
-				hour, minute = str_to_time_12hr(command[6], command[7])
-			else:
-				# extract 24 hour time string into numbers
-				hour, minute = str_to_time_24hr(command[6])
-			# if a valid time was not inputted
-			if hour is None:
-				await react_with_x(message)
-				return
-			
-			# construct object
-			meeting = WeeklyMeeting(day, hour, minute)
+		# if the meeting time is successfully added to the list in order and is not a duplicate
+		if await server_data[message.guild.id].add_weekly_meeting(meeting):
+			await react_with_check(message)
+		else:
+			await react_with_x(message)
 
-			# if the meeting time is successfully added to the list in order and is not a duplicate
-			if await server_data[message.guild].add_weekly_meeting(meeting):
-				await react_with_check(message)
-			else:
-				await react_with_x(message)
+# handles the add bday command that adds a birthday to the server's bday list
+# follows the format "add bday on *date* for *name*"
+@command_syntax('add', r'bday on (?P<date>\S+) for (?P<name>.+)')
+async def add_bday_command(message, date: tuple, name: str):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
+	if channel_perms.add_reactions:
+		# create the bday object
+		bday = make_bday(date, name)
+		# if the date isn't valid or has a year
+		if bday is None:
+			await react_with_x(message)
+			return
 		
-		# if the command follows the format "add bday on *day*"
-		elif len(command) > 5 and command[1].lower() == 'bday' and command[2].lower() == 'on' and command[4].lower() == 'for':
-			# extract date
-			date_nums = str_to_date_nums(command[3])
-			if date_nums is None:
-				await react_with_x(message)
-				return
-			
-			# put date_num variables into more recognizable variable names
-			year, month, day = date_nums
+		# if the bday was successfully added to the bday list
+		if await server_data[message.guild.id].add_bday(bday):
+			await react_with_check(message)
+		# if the bday is a duplicate (same name and date as an existing one)
+		else:
+			await react_with_x(message)
 
-			# if the year wasn't inputted
-			if year is None:
-				# create the bday object
-				try:
-					now = datetime.datetime.now(timezone)
-					bday = datetime.datetime(now.year, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-					# if the meeting date is before today, increment it by a year
-					if bday.month < now.month or (bday.month == now.month and bday.day < now.day):
-						bday = datetime.datetime(now.year + 1, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-					
-					# create bday object
-					bday = BDay(bday, ' '.join(command[5:]))
-				# if the date isn't valid
-				except:
-					# if the bday is on a leap day
-					# use feb 28th for this year instead and set the leap_day flag to true for the bday object
-					if day == 29 and month == 2:
-						day = 28
-						bday = datetime.datetime(now.year, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-						# if the meeting date is before now, increment it by a year
-						if bday < now:
-							bday = datetime.datetime(now.year + 1, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-						
-						# create bday object
-						bday = BDay(bday, ' '.join(command[5:]))
-						bday.leap_day = True
-					else:
-						await react_with_x(message)
-						return
-			# if a year was inputted
-			else:
-				await react_with_x(message)
-				return
-			
-			# if the bday was successfully added to the bday list
-			if await server_data[message.guild].add_bday(bday):
-				await react_with_check(message)
-			# if the bday is a duplicate (same name and date as an existing one)
-			else:
-				await react_with_x(message)
-		# if the command isn't recognized
+# maps each handler for adding one thing to what it adds, for the entries of the bulk add command (see parse_bulk_entries())
+bulk_add_kinds = {add_meeting_command: 'meeting', add_weekly_meeting_command: 'weekly meeting', add_bday_command: 'bday'}
+
+# how each kind of entry is written in a CSV row (kind,date or day,time or name) turned into the rest of an add command
+bulk_csv_formats = {
+	'meeting': 'meeting on {} at {}',
+	'weekly meeting': 'weekly meeting on {} at {}',
+	'weekly': 'weekly meeting on {} at {}',
+	'bday': 'bday on {} for {}',
+	'birthday': 'bday on {} for {}',
+}
+
+# turns one entry of a bulk add (written like the rest of an add command) into a (kind, meeting time / WeeklyMeeting / BDay) tuple
+# returns none if it isn't valid
+def parse_bulk_entry(entry: str):
+	for pattern, handler, multiline in command_syntaxes['add']:
+		kind = bulk_add_kinds.get(handler)
+		match = pattern.fullmatch(entry) if kind is not None else None
+		if match is None:
+			continue
+
+		kwargs = convert_command_args(match.groupdict())
+		# if any of the arguments aren't valid
+		if kwargs is None:
+			return None
+
+		if kind == 'meeting':
+			item = make_meeting_time(kwargs['date'], kwargs['time'])
+		elif kind == 'weekly meeting':
+			item = WeeklyMeeting(kwargs['day'], *kwargs['time'])
+		else:
+			item = make_bday(kwargs['date'], kwargs['name'])
+		return (kind, item) if item is not None else None
+
+	return None
+
+# splits the text of a bulk add into entries (one per line or separated by semicolons) and turns each into a meeting time,
+# WeeklyMeeting, or BDay
+# returns a dict of the lists of each kind and a list of the entries that couldn't be read
+def parse_bulk_entries(text: str) -> tuple:
+	items = {'meeting': [], 'weekly meeting': [], 'bday': []}
+	bad_entries = []
+	for entry in re.split(r'[\n;]', text):
+		entry = ' '.join(entry.split())
+		# skip blank lines and the header row of a CSV file
+		if entry == '' or entry.lower().startswith(('type,', 'kind,')):
+			continue
+		# let entries be whole add commands
+		if entry.lower().startswith('add '):
+			entry = entry[4:]
+
+		parsed = parse_bulk_entry(entry)
+		# if it isn't written like an add command, try reading it as a CSV row
+		if parsed is None and ',' in entry:
+			fields = [field.strip() for field in next(csv.reader([entry]))]
+			csv_format = bulk_csv_formats.get(fields[0].lower())
+			if len(fields) == 3 and csv_format is not None:
+				parsed = parse_bulk_entry(csv_format.format(fields[1], fields[2]))
+
+		if parsed is None:
+			bad_entries.append(entry)
+		else:
+			items[parsed[0]].append(parsed[1])
+
+	return items, bad_entries
+
+# handles the bulk add command that adds a list of meetings, weekly meetings, and birthdays all at once and replies with a summary
+# follows the format "add" or "add many" followed by one entry per line, and / or with text or CSV files of entries attached
+# each entry is written like the rest of an add command (like "meeting on *date* at *time*") or as a CSV row (like "meeting,*date*,*time*")
+@command_syntax('add', r'(?:many|batch)?(?:\n(?P<entries>.+))?', multiline = True)
+async def add_many_command(message, entries: str = '', file = None):
+	channel_perms = reply_permissions(message)
+	# if the bot doesn't have permission to send the summary in this channel
+	if not channel_perms.send_messages:
+		await react_with_x(message)
+		return
+
+	# read the entries in the message and in every attached file (slash commands pass their file as an option)
+	texts = await read_attachments(message, file, ServerData.max_bulk_add_file_size)
+	# if a file was too big or couldn't be read
+	if texts is None:
+		await react_with_x(message)
+		return
+
+	items, bad_entries = parse_bulk_entries('\n'.join([entries] + texts))
+	await add_bulk_items(message, items, bad_entries)
+
+# adds lists of meetings, weekly meetings, and bdays (from parse_bulk_entries() or parse_ics()) to the server of a message all at
+# once and replies with a summary of what was added and what couldn't be read
+async def add_bulk_items(message, items: dict, bad_entries: list):
+	total = sum(len(kind_items) for kind_items in items.values())
+	# if there was nothing to add
+	if total + len(bad_entries) < 1:
+		await react_with_x(message)
+		return
+
+	added = await server_data[message.guild.id].add_many(items['meeting'], items['weekly meeting'], items['bday'])
+
+	# reply with a summary of what was added
+	reply = f'**Added {added[0]} meeting(s), {added[1]} weekly meeting(s), and {added[2]} birthday(s).**\n'
+	if sum(added) < total:
+		reply += f'Skipped {total - sum(added)} that were duplicates, in the past, or over the max amount.\n'
+	if len(bad_entries) > 0:
+		reply += f'Couldn\'t read {len(bad_entries)} entries: ' + ', '.join(f'`{entry}`' for entry in bad_entries[:10])
+		if len(bad_entries) > 10:
+			reply += ', ...'
+		reply += '\n'
+	await safe_reply(message, reply)
+
+# handles the import command that adds the meetings, weekly meetings, and birthdays in attached calendar (.ics) files
+# follows the format "import" with the files attached (anything after the command name is ignored)
+# one-time events become meetings, events that repeat every week become weekly meetings, and events that repeat every year
+# (or are marked as birthdays) become birthdays
+@command_syntax('import', r'.*')
+async def import_command(message, file = None):
+	channel_perms = reply_permissions(message)
+	# if the bot doesn't have permission to send the summary in this channel
+	if not channel_perms.send_messages:
+		await react_with_x(message)
+		return
+
+	# read every attached file (slash commands pass their file as an option)
+	texts = await read_attachments(message, file, ServerData.max_import_file_size)
+	# if a file was too big or couldn't be read
+	if texts is None:
+		await react_with_x(message)
+		return
+
+	items, bad_entries = parse_ics('\n'.join(texts))
+	await add_bulk_items(message, items, bad_entries)
+
+# handles the export command that sends a calendar (.ics) file of all meetings, weekly meetings, and birthdays so they can be
+# put into calendar apps
+# follows the format "export" (anything after the command name is ignored)
+@command_syntax('export', r'.*')
+async def export_command(message):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to send files in the channel of the message
+	if channel_perms.send_messages and channel_perms.attach_files:
+		file = await server_data[message.guild.id].export_ics()
+		await safe_reply_file(message, discord.File(file, filename = 'meetings.ics'))
+	else:
+		await react_with_x(message)
+
+# handles the remove meetings command
+# follows the format "remove meeting(s) # # # ..."
+@command_syntax('remove', r'meetings? (?P<nums>.+)')
+async def remove_meetings_command(message, nums: list):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
+	if channel_perms.add_reactions:
+		# remove the meetings with the inputted numbers if all of the inputted numbers are valid
+		if await server_data[message.guild.id].remove_meetings(nums):
+			await react_with_check(message)
+		# if any of the inputted numbers are not valid
 		else:
 			await react_with_x(message)
 
-# handles the remove meeting command
-async def remove_command(message, command):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+# handles the remove weekly meetings command
+# follows the format "remove weekly meeting(s) # # # ..."
+@command_syntax('remove', r'weekly meetings? (?P<nums>.+)')
+async def remove_weekly_meetings_command(message, nums: list):
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to add reactions in this channel
 	if channel_perms.add_reactions:
-		# if the command follows the format "remove meeting(s) # # # ..."
-		if len(command) > 2 and (command[1].lower() == 'meeting' or command[1].lower() == 'meetings'):
-			# remove the meetings with the inputted numbers if all of the inputted numbers are valid
-			if await server_data[message.guild].remove_meetings(command[2:]):
-				await react_with_check(message)
-			# if any of the inputted numbers are not valid
-			else:
-				await react_with_x(message)
-		# if the command follows the format "remove weekly meeting(s) # # # ..."
-		elif len(command) > 3 and command[1].lower() == 'weekly' and (command[2].lower() == 'meeting' or command[2].lower() == 'meetings'):
-			# remove the weekly meetings with the inputted numbers if all of the inputted numbers are valid
-			if await server_data[message.guild].remove_weekly_meetings(command[3:]):
-				await react_with_check(message)
-			# if any of the inputted numbers are not valid
-			else:
-				await react_with_x(message)
-		# if the command follows the format "remove agenda"
-		elif len(command) > 1 and command[1].lower() == 'agenda':
-			# clear the server's agenda duty list
-			server_data[message.guild].clear_agenda_order()
+		# remove the weekly meetings with the inputted numbers if all of the inputted numbers are valid
+		if await server_data[message.guild.id].remove_weekly_meetings(nums):
 			await react_with_check(message)
-		# if the command follows the format "remove minutes"
-		elif len(command) > 1 and command[1].lower() == 'minutes':
-			# clear the server's meeting minutes duty list
-			server_data[message.guild].clear_minutes_order()
+		# if any of the inputted numbers are not valid
+		else:
+			await react_with_x(message)
+
+# handles the remove agenda and remove minutes commands that clear a duty list
+# follows the format "remove agenda" or "remove minutes"
+@command_syntax('remove', r'(?P<duty>agenda|minutes)')
+async def remove_duty_command(message, duty: str):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
+	if channel_perms.add_reactions:
+		# clear the server's agenda duty list
+		if duty == 'agenda':
+			await server_data[message.guild.id].clear_agenda_order()
+		# clear the server's meeting minutes duty list
+		else:
+			await server_data[message.guild.id].clear_minutes_order()
+		await react_with_check(message)
+
+# handles the remove bday command
+# follows the format "remove bday on *date* for *name*"
+@command_syntax('remove', r'bday on (?P<date>\S+) for (?P<name>.+)')
+async def remove_bday_command(message, date: tuple, name: str):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
+	if channel_perms.add_reactions:
+		# create the bday object the same way adding it does so it's found in the list
+		bday = make_bday(date, name)
+		# if the date isn't valid or has a year
+		if bday is None:
+			await react_with_x(message)
+			return
+		
+		data = server_data[message.guild.id]
+		# if the bday was successfully removed from the bday list
+		# (a bday that's today might have already been said and moved to next year, so that one gets tried too)
+		if await data.remove_bday(bday) or await data.remove_bday(bday.in_year(bday.year + 1)):
 			await react_with_check(message)
-		# if the command follows the format "remove bday on [date] for [name]"
-		elif len(command) > 5 and command[1].lower() == 'bday' and command[2].lower() == 'on' and command[4].lower() == 'for':
-			# extract date
-			date_nums = str_to_date_nums(command[3])
-			if date_nums is None:
-				await react_with_x(message)
-				return
-			
-			# put date_num variables into more recognizable variable names
-			year, month, day = date_nums
-
-			# if the year wasn't inputted
-			if year is None:
-				# get the current time
-				now = datetime.datetime.now(timezone)
-				# construct the bday object
-				try:
-					bday = datetime.datetime(now.year, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-					# if the meeting date is before now, increment it by a year
-					if bday < now:
-						bday = datetime.datetime(now.year + 1, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-					
-					# create bday object
-					bday = BDay(bday, ' '.join(command[5:]))
-				# if the date isn't valid
-				except:
-					# if the bday is on a leap day
-					# use feb 28th for this year instead and set the leap_day flag to true for the bday object
-					if day == 29 and month == 2:
-						day = 28
-						bday = datetime.datetime(now.year, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-						# if the meeting date is before now, increment it by a year
-						if bday < now:
-							bday = datetime.datetime(now.year + 1, month, day, hour=BDay.default_hour, minute=BDay.default_min, tzinfo=timezone)
-						
-						# create bday object
-						bday = BDay(bday, ' '.join(command[5:]))
-						bday.leap_day = True
-					else:
-						await react_with_x(message)
-						return
-			# if a year was inputted
-			else:
-				await react_with_x(message)
-				return
-			
-			# if the bday was successfully removed from the bday list
-			if await server_data[message.guild].remove_bday(bday):
-				await react_with_check(message)
-			# if the bday wasn't found / successfully removed from the list
-			else:
-				await react_with_x(message)
-		# if the command isn't recognized
+		# if the bday wasn't found / successfully removed from the list
 		else:
 			await react_with_x(message)
 
 # handles the meetings command that shows all current meetings
+# follows the format "meetings" (anything after the command name is ignored)
+@command_syntax('meetings', r'.*')
 async def meetings_command(message):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to send messages in the channel of the message
 	if channel_perms.send_messages:
-		reply = '```One-Time Meetings```\n'
-		
-		# if there are no one time meetings
-		if len(server_data[message.guild].meetings) < 1:
-			reply += '**No meetings.**\n\n'
-		# if there is at least 1 meeting
-		else:
-			# display all of the meetings in a numbered list
-			for i in range(len(server_data[message.guild].meetings)):
-				# if this program is being run on windows
-				if sys.platform == 'win32':
-					meeting_str = server_data[message.guild].meetings[i].strftime(f'%A %b %#d %Y at %#H:%M / %#I:%M %p {tzstr}')
-				# if this program is being run on linux, mac os, or any other os
-				else:
-					meeting_str = server_data[message.guild].meetings[i].strftime(f'%A %b %-d %Y at %-H:%M / %-I:%M %p {tzstr}')
-				
-				reply += f'**{i+1}. {meeting_str}**\n\n'
-
-		reply += '```Weekly Meetings```\n'
-
-		# if there are no weekly meetings
-		if len(server_data[message.guild].display_weekly_meetings) < 1:
-			reply += '**No weekly meetings.**\n'
-		# if there is at least 1 weekly meeting
-		else:
-			# display all of the weekly meetings in a numbered list
-			for i in range(len(server_data[message.guild].display_weekly_meetings)):
-				reply += f'**{i+1}. {server_data[message.guild].display_weekly_meetings[i]}**\n\n'
-		
-		await safe_reply(message, reply)
+		await safe_reply(message, server_data[message.guild.id].render_meetings())
 	# if the bot doesn't have permission to send message in the channel, react to the message with an x
 	else:
 		await react_with_x(message)
 
-# handles the set command that sets the order of agenda and meeting minutes notetaking duty
-async def set_command(message, command):
-	channel_perms = message.channel.permissions_for(message.guild.me)
-	# if the bot has permission to send messages in the channel of the message
+# handles the set order command that sets the order of agenda or meeting minutes notetaking duty
+# follows the format "set *agenda/minutes* order to *name*, *name*, ..."
+@command_syntax('set', r'(?P<duty>agenda|minutes) order to (?P<names>.+)')
+async def set_order_command(message, duty: str, names: list):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
 	if channel_perms.add_reactions:
-		# if user wants to remake a list
-		if len(command) > 4 and command[2].lower() == 'order' and command[3].lower() == 'to':
-			# set the 'agenda' / 'minutes' argument to all lowercase for easy comparison later
-			command[1] = command[1].lower()
-			# rebuild the list of names as a string
-			name_list = ' '.join(command[4:])
-			
-			# split the list of names by commas
-			name_list = name_list.split(',')
-			# iterate backwards through the name list (since some items might be removed)
-			for i in range(len(name_list)-1, -1, -1):
-				# if an item is an empty string or only whitespace, remove it
-				if name_list[i] == '' or name_list[i].isspace():
-					name_list.pop(i)
-				# if it isn't an empty string
-				else:
-					# remove surrounding whitespace
-					name_list[i] = name_list[i].strip()
-					# if the name is a duplicate
-					dupe = name_list.copy()
-					dupe.pop(i)
-					if name_list[i] in dupe:
-						await react_with_x(message)
-						return
-			
-			# if agenda list was passed as an argument and the agenda order was successfully set
-			if command[1] == 'agenda' and server_data[message.guild].set_agenda_order(name_list):
-				await react_with_check(message)
-			# if the minutes list was passed as an argument and the minutes orer was successfully set
-			elif command[1] == 'minutes' and server_data[message.guild].set_minutes_order(name_list):
-				await react_with_check(message)
-			# if the argument isn't recognized
-			else:
-				await react_with_x(message)
-				return
-		# if the user wants to skip to a person on the list
-		elif len(command) > 3 and command[2].lower() == 'to':
-			# set the 'agenda' / 'minutes' argument to all lowercase for easy comparison later
-			command[1] = command[1].lower()
-			# if the agenda list was passed as an argument
-			if command[1] == 'agenda':
-				# rebuild the name of the person passed as an argument into a string
-				name = command[3]
-				for token in command[4:]:
-					name += ' ' + token
-				
-				# if that name is in the agenda list
-				if server_data[message.guild].set_agenda_to(name):
-					await react_with_check(message)
-				else:
-					await react_with_x(message)
-			# if the minutes list was passed as an argument
-			elif command[1] == 'minutes':
-				# rebuild the name of the person passed as an argument into a string
-				name = command[3]
-				for token in command[4:]:
-					name += ' ' + token
-				
-				# if that name is in the minutes list
-				if server_data[message.guild].set_minutes_to(name):
-					await react_with_check(message)
-				else:
-					await react_with_x(message)
-			else:
-				await react_with_x(message)
-		# if the command is not valid
+		# if agenda list was passed as an argument and the agenda order was successfully set
+		if duty == 'agenda' and await server_data[message.guild.id].set_agenda_order(names):
+			await react_with_check(message)
+		# if the minutes list was passed as an argument and the minutes orer was successfully set
+		elif duty == 'minutes' and await server_data[message.guild.id].set_minutes_order(names):
+			await react_with_check(message)
+		# if the list couldn't be set
+		else:
+			await react_with_x(message)
+
+# handles the set to command that skips agenda or meeting minutes notetaking duty to a person on the list
+# follows the format "set *agenda/minutes* to *name*"
+@command_syntax('set', r'(?P<duty>agenda|minutes) to (?P<name>.+)')
+async def set_to_command(message, duty: str, name: str):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to add reactions in this channel
+	if channel_perms.add_reactions:
+		# if the agenda list was passed as an argument and that name is in the agenda list
+		if duty == 'agenda' and await server_data[message.guild.id].set_agenda_to(name):
+			await react_with_check(message)
+		# if the minutes list was passed as an argument and that name is in the minutes list
+		elif duty == 'minutes' and await server_data[message.guild.id].set_minutes_to(name):
+			await react_with_check(message)
 		else:
 			await react_with_x(message)
 
 # handles the dutyorder command that shows the current agenda and meeting minutes order
+# follows the format "dutyorder" (anything after the command name is ignored)
+@command_syntax('dutyorder', r'.*')
 async def dutyorder_command(message):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to send messages in the channel of the message
 	if channel_perms.send_messages:
-		up_next = '  <-- Up Next'
-		reply = '```Agenda Duty:```\n'
-		
-		# if the agenda duty list is empty
-		if len(server_data[message.guild].agenda_order) < 1:
-			reply += '**No agenda duty list**\n\n'
-		# if there is anyone on the agenda duty list
-		else:
-			# display the list of people on agenda duty
-			for i in range(len(server_data[message.guild].agenda_order)):
-				reply += f'**{i + 1}. {server_data[message.guild].agenda_order[i]}**'
-				# if the person that was just printed is up next, put an arrow and some text next to their name to say so
-				if i == server_data[message.guild].agenda_index:
-					reply += up_next
-				
-				reply += '\n\n'
-		
-		reply += '```Meeting Minutes Duty:```\n'
-
-		# if the meeting minutes duty list is empty
-		if len(server_data[message.guild].minutes_order) < 1:
-			reply += '**No meeting minutes duty list**'
-		# if there is anyone on the meeting minutes duty list
-		else:
-			# display the list of people on meeting minutes duty
-			for i in range(len(server_data[message.guild].minutes_order)):
-				reply += f'**{i + 1}. {server_data[message.guild].minutes_order[i]}**'
-				# if the person that was just printed is up next, put an arrow and some text next to their name to say so
-				if i == server_data[message.guild].minutes_index:
-					reply += up_next
-				
-				reply += '\n\n'
-		
-		await safe_reply(message, reply)
+		await safe_reply(message, server_data[message.guild.id].render_dutyorder())
 	# if the bot doesn't have permission to send message in the channel of the message
 	else:
 		await react_with_x(message)
 
-# handles the alert command that sets the channel that people get alerted about meetings and bdays in
-async def alert_command(message, command):
-	# if the command has an argument
-	if len(command) > 1:
-		# set the argument to lowercase to make it easier to compare
-		command[1] = command[1].lower()
-		# if the command follows the format "alert here"
-		if command[1] == 'here':
-			# set the alert channel for the server to the one that the command was sent in
-			if server_data[message.guild].set_alert_channel(message.channel):
-				await react_with_check(message)
-			else:
-				await react_with_check(message)
-		# if the command follows the format "alert channel"
-		elif command[1] == 'channel':
-			channel_perms = message.channel.permissions_for(message.guild.me)
-			# if the bot has permission to send messages in the channel of the message
-			if channel_perms.send_messages:
-				# if the bot doesn't have an alert channel
-				if server_data[message.guild].alert_channel not in message.guild.text_channels:
-					# look for one again
-					server_data[message.guild].alert_channel = ServerData.find_first_message_server(message.guild)
-					# if the bot still can't find an alert channel
-					if server_data[message.guild].alert_channel is None:
-						await react_with_x(message)
-						return
-
-				# reply with the bot's alert channel
-				reply = f'<#{server_data[message.guild].alert_channel.id}>'
-				await safe_reply(message, reply)
-			else:
-				await react_with_x(message)
+# handles the alert here command that sets the channel that people get alerted about meetings and bdays in
+# follows the format "alert here"
+@command_syntax('alert', r'here')
+async def alert_here_command(message):
+	# set the alert channel for the server to the one that the command was sent in
+	if await server_data[message.guild.id].set_alert_channel(message.channel):
+		await react_with_check(message)
+	else:
+		await react_with_check(message)
+
+# handles the alert channel command that shows the channel that people get alerted about meetings and bdays in
+# follows the format "alert channel"
+@command_syntax('alert', r'channel')
+async def alert_channel_command(message):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to send messages in the channel of the message
+	if channel_perms.send_messages:
+		# get the alert channel (looking for one again if the bot doesn't have one)
+		channel = await server_data[message.guild.id].find_alert_channel(message.guild)
+		# if the bot still can't find an alert channel
+		if channel is None:
+			await react_with_x(message)
+			return
+
+		# reply with the bot's alert channel
+		reply = f'<#{channel.id}>'
+		await safe_reply(message, reply)
 	else:
 		await react_with_x(message)
 
 # handles the bdays command that displays all birthdays that the bot is currently keeping track of
+# follows the format "bdays" (anything after the command name is ignored)
+@command_syntax('bdays', r'.*')
 async def bdays_command(message):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to send messages in the channel of the message
 	if channel_perms.send_messages:
-		reply = '```Birthdays:```\n'
-
-		# if the bday list is empty
-		if len(server_data[message.guild].bdays) < 1:
-			reply += '**No Birthdays**'
-		# if the bday list has at least 1 item in it
-		else:
-			# display the list of bdays
-			for bday in server_data[message.guild].bdays:
-				reply += f'**{bday}**\n\n'
-
-		await safe_reply(message, reply)
+		await safe_reply(message, server_data[message.guild.id].render_bdays())
 	else:
 		await react_with_x(message)
 
+########################################################################################################################
+#
+# slash commands
+#
+########################################################################################################################
+
+# stands in for the message of a command when the command is used as a slash command, so the same command handlers can
+# handle both
+# replies and reactions are sent as responses to the interaction
+class InteractionMessage:
+	# the permissions the bot has for responding to a slash command (see reply_permissions())
+	permissions = discord.Permissions(send_messages = True, add_reactions = True, attach_files = True)
+
+	def __init__(self, interaction: discord.Interaction):
+		self.interaction = interaction
+		self.guild = interaction.guild
+		self.channel = interaction.channel
+		self.author = interaction.user
+		# whether anything has been sent in response to the interaction yet
+		self.responded = False
+		# (slash commands pass their files as options instead)
+		self.attachments = []
+
+	# sends a response to the interaction, or a follow up message if it already has a response (or was deferred)
+	async def reply(self, content: str = None, ephemeral: bool = False, file: discord.File = discord.utils.MISSING):
+		if self.interaction.response.is_done():
+			await self.interaction.followup.send(content, ephemeral = ephemeral, file = file)
+		else:
+			await self.interaction.response.send_message(content, ephemeral = ephemeral, file = file)
+		self.responded = True
+
+	# responds to the interaction with the emoji since there's no message to react to
+	async def add_reaction(self, emoji: str):
+		await self.reply(emoji)
+
+# runs a command handler for a slash command
+# the options of the slash command are passed as text and get run through the same converters as the arguments of
+# mention commands (see command_converters)
+async def run_slash_command(interaction: discord.Interaction, handler, **args):
+	message = InteractionMessage(interaction)
+	# if the server's data isn't in memory, loading it could take longer than the 3 seconds discord gives the bot to
+	# respond, so tell discord that a response is coming
+	if interaction.guild_id not in server_data:
+		await interaction.response.defer()
+
+	# if the bot has the data for this server set up
+	if await get_server_data(interaction.guild) is not None:
+		# convert the arguments into the types the handler uses
+		kwargs = convert_command_args(args)
+		# if any of the arguments aren't valid
+		if kwargs is None:
+			await react_with_x(message)
+		else:
+			await handler(message, **kwargs)
+
+	# if nothing was sent in response, respond so the interaction doesn't show up as failed
+	if not message.responded:
+		await message.reply("\u274c", ephemeral = True)
+
+# choices for slash command options that pick a duty list
+duty_choices = [app_commands.Choice(name = 'agenda', value = 'agenda'), app_commands.Choice(name = 'minutes', value = 'minutes')]
+
+# choices for slash command options that pick a day of the week
+day_choices = [app_commands.Choice(name = day, value = day.lower()) for day in calendar.day_name]
+
+# descriptions of the slash command options that get parsed the same way as in mention commands
+date_description = 'YYYY/M/D, YYYY-M-D, M/D or M-D'
+meeting_date_description = 'YYYY/M/D, YYYY-M-D, M/D, M-D, today, tomorrow or next [day] (like next fri)'
+time_description = 'H:MM in 24 hour time or H:MM am/pm, like 15:30 or 3:30pm (the minutes are optional)'
+
+# groups of slash commands (e.g. "/add meeting")
+add_group = app_commands.Group(name = 'add', description = 'Adds a meeting or a birthday for me to keep track of.', guild_only = True)
+remove_group = app_commands.Group(name = 'remove', description = 'Removes meetings, birthdays, or the agenda or meeting minutes duty list.', guild_only = True)
+set_group = app_commands.Group(name = 'set', description = 'Sets the agenda or meeting minutes duty order or who is next on it.', guild_only = True)
+alert_group = app_commands.Group(name = 'alert', description = 'Sets or shows the channel I send meeting and birthday alerts in.', guild_only = True)
+tree.add_command(add_group)
+tree.add_command(remove_group)
+tree.add_command(set_group)
+tree.add_command(alert_group)
+
+# /help [command]
+@tree.command(name = 'help', description = 'Gives info about me and my commands.')
+@app_commands.guild_only()
+@app_commands.describe(command = 'The command to get info on')
+@app_commands.choices(command = [app_commands.Choice(name = name, value = name) for name in ['help', 'add', 'remove', 'meetings', 'set', 'dutyorder', 'alert', 'bdays', 'import', 'export']])
+async def help_slash(interaction: discord.Interaction, command: str = None):
+	await run_slash_command(interaction, help_command, command = command)
+
+# /add meeting [date] [time]
+@add_group.command(name = 'meeting', description = 'Adds a one-time meeting.')
+@app_commands.describe(date = meeting_date_description, time = time_description)
+async def add_meeting_slash(interaction: discord.Interaction, date: str, time: str):
+	await run_slash_command(interaction, add_meeting_command, date = date, time = time)
+
+# /add weekly-meeting [day] [time]
+@add_group.command(name = 'weekly-meeting', description = 'Adds a meeting that happens every week.')
+@app_commands.describe(day = 'The day of the week the meeting is on', time = time_description)
+@app_commands.choices(day = day_choices)
+async def add_weekly_meeting_slash(interaction: discord.Interaction, day: str, time: str):
+	await run_slash_command(interaction, add_weekly_meeting_command, day = day, time = time)
+
+# /add bday [date] [name]
+@add_group.command(name = 'bday', description = 'Adds a birthday.')
+@app_commands.describe(date = date_description + ' (the year is ignored)', name = 'Whose birthday it is')
+async def add_bday_slash(interaction: discord.Interaction, date: str, name: str):
+	await run_slash_command(interaction, add_bday_command, date = date, name = name)
+
+# /add many [entries] [file]
+@add_group.command(name = 'many', description = 'Adds a list of meetings, weekly meetings, and birthdays all at once.')
+@app_commands.describe(entries = 'Entries separated by semicolons, like "meeting on 5/3 at 3pm; bday on 3/4 for Ada"', file = 'A text or CSV file with one entry per line')
+async def add_many_slash(interaction: discord.Interaction, entries: str = '', file: discord.Attachment = None):
+	await run_slash_command(interaction, add_many_command, entries = entries, file = file)
+
+# /remove meetings [numbers]
+@remove_group.command(name = 'meetings', description = 'Removes one-time meetings.')
+@app_commands.describe(nums = 'The numbers of the meetings to remove (from /meetings), separated by spaces')
+@app_commands.rename(nums = 'numbers')
+async def remove_meetings_slash(interaction: discord.Interaction, nums: str):
+	await run_slash_command(interaction, remove_meetings_command, nums = nums)
+
+# /remove weekly-meetings [numbers]
+@remove_group.command(name = 'weekly-meetings', description = 'Removes weekly meetings.')
+@app_commands.describe(nums = 'The numbers of the weekly meetings to remove (from /meetings), separated by spaces')
+@app_commands.rename(nums = 'numbers')
+async def remove_weekly_meetings_slash(interaction: discord.Interaction, nums: str):
+	await run_slash_command(interaction, remove_weekly_meetings_command, nums = nums)
+
+# /remove agenda
+@remove_group.command(name = 'agenda', description = 'Clears the agenda duty list.')
+async def remove_agenda_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, remove_duty_command, duty = 'agenda')
+
+# /remove minutes
+@remove_group.command(name = 'minutes', description = 'Clears the meeting minutes duty list.')
+async def remove_minutes_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, remove_duty_command, duty = 'minutes')
+
+# /remove bday [date] [name]
+@remove_group.command(name = 'bday', description = 'Removes a birthday.')
+@app_commands.describe(date = date_description + ' (the year is ignored)', name = 'Whose birthday it is')
+async def remove_bday_slash(interaction: discord.Interaction, date: str, name: str):
+	await run_slash_command(interaction, remove_bday_command, date = date, name = name)
+
+# /set order [duty] [names]
+@set_group.command(name = 'order', description = 'Sets the order of people on agenda or meeting minutes duty.')
+@app_commands.describe(duty = 'The duty list to set', names = 'The names of the people on duty in order, separated by commas')
+@app_commands.choices(duty = duty_choices)
+async def set_order_slash(interaction: discord.Interaction, duty: str, names: str):
+	await run_slash_command(interaction, set_order_command, duty = duty, names = names)
+
+# /set next [duty] [name]
+@set_group.command(name = 'next', description = 'Sets who is next on agenda or meeting minutes duty.')
+@app_commands.describe(duty = 'The duty list to skip to someone on', name = 'The name of the person who is next')
+@app_commands.choices(duty = duty_choices)
+async def set_next_slash(interaction: discord.Interaction, duty: str, name: str):
+	await run_slash_command(interaction, set_to_command, duty = duty, name = name)
+
+# /alert here
+@alert_group.command(name = 'here', description = 'Sets the channel I send alerts in to this channel.')
+async def alert_here_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, alert_here_command)
+
+# /alert channel
+@alert_group.command(name = 'channel', description = 'Shows the channel I send alerts in.')
+async def alert_channel_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, alert_channel_command)
+
+# /meetings
+@tree.command(name = 'meetings', description = 'Shows all of the meetings and weekly meetings I am keeping track of.')
+@app_commands.guild_only()
+async def meetings_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, meetings_command)
+
+# /dutyorder
+@tree.command(name = 'dutyorder', description = 'Shows the agenda and meeting minutes duty order.')
+@app_commands.guild_only()
+async def dutyorder_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, dutyorder_command)
+
+# /bdays
+@tree.command(name = 'bdays', description = 'Shows all of the birthdays I am keeping track of.')
+@app_commands.guild_only()
+async def bdays_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, bdays_command)
+
+# /import [file]
+@tree.command(name = 'import', description = 'Adds the meetings, weekly meetings, and birthdays in a calendar (.ics) file.')
+@app_commands.describe(file = 'A calendar (.ics) file exported from a calendar app')
+@app_commands.guild_only()
+async def import_slash(interaction: discord.Interaction, file: discord.Attachment):
+	await run_slash_command(interaction, import_command, file = file)
+
+# /export
+@tree.command(name = 'export', description = 'Sends a calendar (.ics) file of all of the meetings and birthdays I am keeping track of.')
+@app_commands.guild_only()
+async def export_slash(interaction: discord.Interaction):
+	await run_slash_command(interaction, export_command)
+
 ########################################################################################################################
 #
 # utility functions
 #
 ########################################################################################################################
 
-# iserts obj into l with a binary insert
-# low = lowest index to insert into, high = highest index to insert into, no_dupes = returning false if obj is already in l within the low and high indexes
-def bin_insert(l: list, obj, low = 0, high=None, no_dupes=False):
-	# if no high argument was given, set it to the last index in l
-	if high is None:
-		high = len(l) - 1
+# returns the datetime of a one-time meeting on a date (year, month, day) at a time (hour, minute)
+# if the year isn't given, it's the next time that date and time comes around
+# returns none if the date doesn't exist
+def make_meeting_time(date: tuple, time: tuple):
+	year, month, day = date
+	hour, minute = time
+	try:
+		# if the year wasn't inputted
+		if year is None:
+			now = datetime.datetime.now(timezone)
+			meeting = datetime.datetime(now.year, month, day, hour=hour, minute=minute, tzinfo=timezone)
+			# if the meeting date is before now, increment it by a year
+			if meeting < now:
+				meeting = datetime.datetime(now.year + 1, month, day, hour=hour, minute=minute, tzinfo=timezone)
+		# if a year was inputted
+		else:
+			meeting = datetime.datetime(year, month, day, hour=hour, minute=minute, tzinfo=timezone)
+	# if the date isn't valid (or its numbers are too big to be a date at all)
+	except (ValueError, OverflowError):
+		return None
+
+	return meeting
+
+# returns the BDay of a name on a date (year, month, day) on the next time that date comes around
+# (bdays on feb 29th are on feb 28th in years that aren't leap years)
+# returns none if the date doesn't exist or has a year
+def make_bday(date: tuple, name: str):
+	year, month, day = date
+	# bdays don't have years
+	if year is not None:
+		return None
+
+	now = datetime.datetime.now(timezone)
+	# if the bday was earlier this year, it's next year (a bday today is still this year so it gets said today)
+	year = now.year + 1 if (month, day) < (now.month, now.day) else now.year
+	try:
+		return BDay(datetime.date(year, month, day), name)
+	# if the numbers are too big to be a date at all
+	except OverflowError:
+		return None
+	# if the date isn't valid
+	except ValueError:
+		# if the bday is on a leap day
+		# use feb 28th for that year instead and set the leap_day flag to true for the bday object
+		if day == 29 and month == 2:
+			return BDay(datetime.date(year, month, 28), name, leap_day = True)
+
+		return None
+
+# max number of bytes in a line of an iCalendar file (longer lines get folded onto more lines that start with a space)
+ics_line_len = 75
+
+# returns a line of an iCalendar file as bytes ending with a line break, folded onto more lines if it's too long
+# (lines are only folded between characters so multi-byte characters don't get split up)
+def ics_fold(line: str) -> bytes:
+	data = line.encode()
+	# if the line doesn't need to be folded
+	if len(data) <= ics_line_len:
+		return data + b'\r\n'
+
+	chunks = []
+	start = 0
+	limit = ics_line_len
+	while len(data) - start > limit:
+		end = start + limit
+		# move back to the start of the character the fold is in the middle of
+		while data[end] & 0xC0 == 0x80:
+			end -= 1
+		chunks.append(data[start:end])
+		start = end
+		# folded lines start with a space, which takes up one of their bytes
+		limit = ics_line_len - 1
+	chunks.append(data[start:])
+
+	return b'\r\n '.join(chunks) + b'\r\n'
+
+# escapes the characters that mean something in iCalendar text values
+def ics_escape(text: str) -> str:
+	return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+# undoes ics_escape()
+def ics_unescape(text: str) -> str:
+	return re.sub(r'\\(.)', lambda match: '\n' if match[1] in 'nN' else match[1], text)
+
+# yields the lines of the VTIMEZONE component that describes the bot's timezone, with the daylight saving time rules it
+# follows in a year (found from the times its utc offset changes in that year)
+def ics_timezone_lines(year: int):
+	utc = datetime.timezone.utc
+	start = datetime.datetime(year, 1, 1, tzinfo=utc)
+	transitions = []
+	# go through the year a day at a time and then an hour at a time in the days the utc offset changes
+	before = start.astimezone(timezone)
+	for day in range(1, 367):
+		after = (start + datetime.timedelta(days = day)).astimezone(timezone)
+		if after.utcoffset() != before.utcoffset():
+			for hour in range(1, 25):
+				moment = (start + datetime.timedelta(days = day - 1, hours = hour)).astimezone(timezone)
+				if moment.utcoffset() != before.utcoffset():
+					transitions.append((before.utcoffset(), moment))
+					break
+		before = after
+
+	yield 'BEGIN:VTIMEZONE'
+	yield f'TZID:{timezone.key}'
+	# if the timezone doesn't change its offset, it only has one observance that has always been in effect
+	if len(transitions) < 1:
+		yield 'BEGIN:STANDARD'
+		yield 'DTSTART:19700101T000000'
+		yield f'TZOFFSETFROM:{ics_offset(before.utcoffset())}'
+		yield f'TZOFFSETTO:{ics_offset(before.utcoffset())}'
+		yield f'TZNAME:{before.tzname()}'
+		yield 'END:STANDARD'
+	for offset_from, moment in transitions:
+		kind = 'DAYLIGHT' if moment.dst() else 'STANDARD'
+		# the change happens at the local time it was right before the change, every year on the same weekday of the month
+		# (like the 2nd sunday of march), or on the last one if it's in the last week of the month
+		local = (moment.astimezone(utc) + offset_from).replace(tzinfo=None)
+		week = (local.day - 1) // 7 + 1
+		if local.day + 7 > calendar.monthrange(local.year, local.month)[1]:
+			week = -1
+		yield f'BEGIN:{kind}'
+		yield f'DTSTART:{local.strftime(ics_time_format)}'
+		yield f'RRULE:FREQ=YEARLY;BYMONTH={local.month};BYDAY={week}{ics_days[local.weekday()]}'
+		yield f'TZOFFSETFROM:{ics_offset(offset_from)}'
+		yield f'TZOFFSETTO:{ics_offset(moment.utcoffset())}'
+		yield f'TZNAME:{moment.tzname()}'
+		yield f'END:{kind}'
+	yield 'END:VTIMEZONE'
+
+# returns a utc offset the way iCalendar writes them (like -0800)
+def ics_offset(offset: datetime.timedelta) -> str:
+	minutes = int(offset.total_seconds()) // 60
+	return f'{"-" if minutes < 0 else "+"}{abs(minutes) // 60:02}{abs(minutes) % 60:02}'
+
+# the way iCalendar writes each day of the week (monday is 0)
+ics_days = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+# matches a line of an iCalendar file (NAME;PARAM=value;PARAM="value":value)
+ics_line_pattern = re.compile(r'([A-Za-z0-9-]+)((?:;[A-Za-z0-9-]+=(?:"[^"]*"|[^";:]*))*):(.*)')
+# matches each parameter in a line of an iCalendar file
+ics_param_pattern = re.compile(r';([A-Za-z0-9-]+)=("[^"]*"|[^";:]*)')
+# parts of a repeat rule that weekly meetings can have
+ics_weekly_rule_parts = {'FREQ', 'INTERVAL', 'BYDAY', 'UNTIL', 'COUNT', 'WKST'}
+# matches a birthday event's name (like "Ada's Birthday" or "Ada birthday") to get the person's name out of it
+ics_bday_pattern = re.compile(r"(.+?)(?:'s)? (?:birthday|bday)", re.IGNORECASE)
+
+# yields each line of an iCalendar file with the lines that were folded onto more lines put back together
+def ics_unfold(text: str):
+	line = None
+	for next_line in text.splitlines():
+		# lines that start with a space or tab are the rest of the line before them
+		if next_line[:1] in (' ', '\t') and line is not None:
+			line += next_line[1:]
+			continue
+		if line is not None:
+			yield line
+		line = next_line
+	if line is not None:
+		yield line
+
+# returns the date (for all day events) or datetime that an iCalendar date / time value is
+# times are in utc or the timezone they were given in, and floating times (or ones in timezones the bot doesn't know, like
+# the windows names some calendar apps use) are taken as being in the bot's timezone
+# raises ValueError if it isn't a valid date / time
+def parse_ics_time(value: str, params: dict):
+	# if it's a date without a time
+	if params.get('VALUE', '').upper() == 'DATE' or len(value) == 8:
+		return datetime.datetime.strptime(value, '%Y%m%d').date()
+
+	moment = datetime.datetime.strptime(value.rstrip('Zz'), ics_time_format)
+	if value[-1:] in ('Z', 'z'):
+		return moment.replace(tzinfo=datetime.timezone.utc)
+
+	try:
+		return moment.replace(tzinfo=ZoneInfo(params['TZID'].strip('"')))
+	except (KeyError, ValueError, ZoneInfoNotFoundError):
+		return moment.replace(tzinfo=timezone)
+
+# turns an iCalendar file into meeting times, WeeklyMeetings, and BDays (the same way as parse_bulk_entries())
+# events are read one line at a time, and anything in them that the bot doesn't use (like alarms) is skipped over
+# returns a dict of the lists of each kind and a list of the names of the events that couldn't be read
+def parse_ics(text: str) -> tuple:
+	items = {'meeting': [], 'weekly meeting': [], 'bday': []}
+	bad_entries = []
+	# stack of the components the current line is in, and the properties of the event being read
+	components = []
+	event = None
+	for line in ics_unfold(text):
+		match = ics_line_pattern.fullmatch(line)
+		if match is None:
+			continue
+		name = match[1].upper()
+		value = match[3]
+
+		if name == 'BEGIN':
+			components.append(value.upper())
+			if components[-1] == 'VEVENT':
+				event = {}
+		elif name == 'END':
+			if len(components) > 0 and components.pop() == 'VEVENT' and event is not None:
+				add_ics_event(event, items, bad_entries)
+				event = None
+		# only keep the properties of the event itself (not of components inside it like alarms)
+		elif event is not None and components[-1] == 'VEVENT':
+			params = {param.upper(): param_value for param, param_value in ics_param_pattern.findall(match[2])}
+			event.setdefault(name, (params, value))
+
+	return items, bad_entries
+
+# turns the properties of an iCalendar event into a meeting time, WeeklyMeetings, or a BDay and puts them in items
+# (or its name in bad_entries if it can't be)
+# weekly events can repeat on more than one day, but only ones that happen every week with no other rules are used
+def add_ics_event(event: dict, items: dict, bad_entries: list):
+	summary = ics_unescape(event.get('SUMMARY', ({}, 'event'))[1]).strip() or 'event'
+	# skip events that were cancelled
+	if event.get('STATUS', ({}, ''))[1].upper() == 'CANCELLED':
+		return
+
+	rule = {}
+	if 'RRULE' in event:
+		for part in event['RRULE'][1].upper().split(';'):
+			key, _, rule_value = part.partition('=')
+			rule[key] = rule_value
+	categories = event.get('CATEGORIES', ({}, ''))[1].upper().split(',')
+
+	try:
+		start = parse_ics_time(event['DTSTART'][1], event['DTSTART'][0])
+
+		# if it's a birthday
+		if rule.get('FREQ') == 'YEARLY' or 'BIRTHDAY' in categories:
+			match = ics_bday_pattern.fullmatch(summary)
+			bday = make_bday((None, start.month, start.day), match[1] if match is not None else summary)
+			if bday is None:
+				raise ValueError(f'{start} is not a valid birthday')
+			items['bday'].append(bday)
+		# if it's a one-time meeting
+		elif len(rule) < 1 and type(start) is datetime.datetime:
+			items['meeting'].append(start.astimezone(timezone))
+		# if it's a weekly meeting
+		elif rule.get('FREQ') == 'WEEKLY' and rule.get('INTERVAL', '1') == '1' and set(rule) <= ics_weekly_rule_parts and type(start) is datetime.datetime:
+			# skip meetings that stopped repeating (the number of times it repeats is ignored since the bot doesn't keep track of that)
+			now = datetime.datetime.now(timezone)
+			until = parse_ics_time(rule['UNTIL'], {}) if 'UNTIL' in rule else None
+			if until is not None and until < (now if type(until) is datetime.datetime else now.date()):
+				return
+
+			# the days it repeats on are in the timezone of the event, so move it to each day before putting it in the bot's timezone
+			days = [ics_days.index(day) for day in rule['BYDAY'].split(',')] if 'BYDAY' in rule else [start.weekday()]
+			for day in days:
+				moment = (start + datetime.timedelta(days = (day - start.weekday()) % 7)).astimezone(timezone)
+				items['weekly meeting'].append(WeeklyMeeting(moment.weekday(), moment.hour, moment.minute))
+		else:
+			raise ValueError(f'{summary} repeats in a way the bot can\'t keep track of')
+	# if the event is missing its start or any part of it isn't valid
+	except (KeyError, ValueError, OverflowError):
+		bad_entries.append(summary)
+
+# turns a list of number strings from a command (that start at 1) into a set of list indexes (that start at 0)
+# returns none if any of the numbers aren't a valid index for a list of the given length or are repeated
+def nums_to_indexes(numbers: list, length: int):
+	indexes = set()
+	for number in numbers:
+		# if the argument isn't a positive integer
+		if not number.isnumeric():
+			return None
+		
+		index = int(number) - 1
+		# if the number isn't between 1 and the length of the list, or it was already inputted
+		if index < 0 or index >= length or index in indexes:
+			return None
+		
+		indexes.add(index)
 	
-	# if there are no duplicates allowed
-	if no_dupes:
-		# while the index to insert into hasn't been found yet
-		while low <= high:
-			# get the midpoint between the high and low indexes
-			mid = (low + high) // 2
-			# if the object is the same as the object at the midpoint in l
-			if obj == l[mid]:
-				return False
-			
-			# if the object is less than the object at the midpoint in l
-			if obj < l[mid]:
-				# cut the check to the lower half of the remaining list
-				high = mid - 1
-			# if the object is greater than or equal to the object at the midpoint in l
-			else:
-				# cut the check to the upper half of the remaining list
-				low = mid + 1
-	# if duplicates are allowed
-	else:
-		# while the index to insert into hasn't been found yet
-		while low <= high:
-			# get the midpoint between the high and low indexes
-			mid = (low + high) // 2
-			# if the object is less than the object at the midpoint in l
-			if obj < l[mid]:
-				high = mid - 1
-			# if the object is greater than or equal to the object at the midpoint in l
-			else:
-				low = mid + 1
-			
-	# return the new list with obj inserted in its sorted position
-	return l[:low] + [obj] + l[low:]
+	return indexes
+
+# returns the permissions the bot has for responding to a command
+# (slash commands are responded to through the interaction instead of the channel, so the bot can always respond to them)
+def reply_permissions(message):
+	if isinstance(message, InteractionMessage):
+		return InteractionMessage.permissions
+
+	return ServerData.permissions.channel_permissions(message.channel)
 
 # makes the bot react to a message with a checkmark emoji if it's able to
 async def react_with_check(message):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	if channel_perms.add_reactions and message is not None:
-		await message.add_reaction("\u2705")
+		await send_reaction(message, "\u2705")
 
 # makes the bot react to a message with an X emoji if it's able to
 async def react_with_x(message):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	if channel_perms.add_reactions and message is not None:
-		await message.add_reaction("\u274c")
+		await send_reaction(message, "\u274c")
+
+# reacts to a message through the send dispatcher, or responds to the interaction right away if it's a slash command
+# (interaction responses don't count against channel rate limits and have to go out within a few seconds)
+async def send_reaction(message, emoji: str):
+	if isinstance(message, InteractionMessage):
+		await message.add_reaction(emoji)
+	else:
+		ServerData.sender.submit(SendDispatcher.reaction, message.channel.id, message.add_reaction, emoji)
 
 # replies to a message and handles lack of permissions and character overflow
 async def safe_reply(message, reply: str):
-	channel_perms = message.channel.permissions_for(message.guild.me)
+	channel_perms = reply_permissions(message)
 	# if the bot has permission to send messages in the channel of the message
 	if channel_perms.send_messages:
-		# while the reply is too long to send, find a split point before the message limit and send the reply up to that point
-		while (len(reply) > max_message_len):
-			# strings to split the reply at before the message limit
-			split_strs = ["\n\n", "\n", " "]
-			# index of where the reply will be split
-			split_index = -1
-			# loop through each substring to get the index of the last instance of one of the strings in split_strs in the relpy before the max message length
-			for i in range(len(split_strs) + 1):
-				# if all of the strings in split_strs have been checked and none of them were found, set the split_index to the max message length
-				if i == len(split_strs):
-					split_index = max_message_len + 1
-				else:
-					# find the index of the last instance of a string in split_strs
-					split_index = reply.rfind(split_strs[i], 0, max_message_len)
-					# if an instance of the string was found, use the index of that string as the split index
-					if split_index != -1:
-						split_index += 1
-						break
-			
-			channel_perms = message.channel.permissions_for(message.guild.me)
+		# send the reply in as many messages as it takes to fit under the message limit
+		for chunk in message_chunks(reply):
+			channel_perms = reply_permissions(message)
 			# check to make sure the bot still has permission to send messages in this channel
 			if channel_perms.send_messages:
-				# send the part of the reply up to the split index
-				await message.reply(reply[:split_index])
+				# respond to slash commands right away, and send replies to messages through the send dispatcher
+				if isinstance(message, InteractionMessage):
+					await message.reply(chunk)
+				else:
+					ServerData.sender.submit(SendDispatcher.reply, message.channel.id, message.reply, chunk)
 			# if it doesn't, then stop and return
 			else:
 				return
-			# remove the part of the reply that was just sent
-			reply = reply[split_index:]
-		
-		channel_perms = message.channel.permissions_for(message.guild.me)
-		# check to make sure the bot still has permission to send messages in this channel
-		if channel_perms.send_messages:
-			# send the remaining part of the reply that is less than the max message length
-			await message.reply(reply)
 	# if the bot doesn't have permission to send messages in the channel of the message, react with an x
 	else:
 		await react_with_x(message)
 
-# sends a message in a channel and handles lack of permissions and character overflow
+# replies to a message with a file and handles lack of permissions
+async def safe_reply_file(message, file: discord.File):
+	channel_perms = reply_permissions(message)
+	# if the bot has permission to send files in the channel of the message
+	if channel_perms.send_messages and channel_perms.attach_files:
+		# respond to slash commands right away, and send replies to messages through the send dispatcher
+		if isinstance(message, InteractionMessage):
+			await message.reply(file = file)
+		else:
+			ServerData.sender.submit(SendDispatcher.reply, message.channel.id, functools.partial(message.reply, file = file))
+	# if it doesn't, react with an x
+	else:
+		await react_with_x(message)
+
+# reads every file attached to a message as text (or just file if it's given, like for slash commands that take a file as an option)
+# returns a list of the text of each file, or none if any of them are bigger than max_size bytes or couldn't be read as text
+async def read_attachments(message, file, max_size: int):
+	texts = []
+	for attachment in ([file] if file is not None else message.attachments):
+		# if the file is too big to read
+		if attachment.size > max_size:
+			return None
+		try:
+			texts.append((await attachment.read()).decode('utf-8-sig'))
+		# if the file couldn't be downloaded or isn't text
+		except (discord.HTTPException, UnicodeDecodeError):
+			return None
+
+	return texts
+
+# sends a message in a channel through the send dispatcher (in the alert lane by default) and handles lack of permissions and character overflow
 # returns true if the bot had permission to send messages in this channel at the start of this function, false if it didn't
-async def safe_message(channel, message: str) -> bool:
-	channel_perms = channel.permissions_for(channel.guild.me)
-	# if the bot has permission to send messages in the channel of the message
+# (or if there is no channel, like when a server's alert channel was deleted)
+async def safe_message(channel, message: str, lane: int = SendDispatcher.alert) -> bool:
+	if channel is None:
+		return False
+
+	channel_perms = ServerData.permissions.channel_permissions(channel)
+	# if the bot has permission to send messages in the channel
 	if channel_perms.send_messages:
-		# while the reply is too long to send, find a split point before the message limit and send the reply up to that point
-		while (len(message) > max_message_len):
-			# strings to split the reply at before the message limit
-			split_strs = ["\n\n", "\n", " "]
-			# index of where the reply will be split
-			split_index = -1
-			# loop through each substring to get the index of the last instance of one of the strings in split_strs in the relpy before the max message length
-			for i in range(len(split_strs) + 1):
-				# if all of the strings in split_strs have been checked and none of them were found, set the split_index to the max message length
-				if i == len(split_strs):
-					split_index = max_message_len + 1
-				else:
-					# find the index of the last instance of a string in split_strs
-					split_index = message.rfind(split_strs[i], 0, max_message_len)
-					# if an instance of the string was found, use the index of that string as the split index
-					if split_index != -1:
-						split_index += 1
-						break
-			
-			channel_perms = channel.permissions_for(channel.guild.me)
+		# send the message in as many messages as it takes to fit under the message limit
+		for chunk in message_chunks(message):
+			channel_perms = ServerData.permissions.channel_permissions(channel)
 			# check to make sure the bot still has permission to send messages in this channel
 			if channel_perms.send_messages:
-				# send the part of the reply up to the split index
-				await message.message(message[:split_index])
-			# if it doesn't, then exit the loop
+				ServerData.sender.submit(lane, channel.id, channel.send, chunk)
+			# if it doesn't, then stop
 			else:
 				break
-			# remove the part of the reply that was just sent
-			message = message[split_index:]
-		
-		channel_perms = channel.permissions_for(channel.guild.me)
-		# check to make sure the bot still has permission to send messages in this channel
-		if channel_perms.send_messages:
-			# send the remaining part of the reply that is less than the max message length
-			await channel.send(message)
 		
 		# return true if the bot had permission to send messages in this channel at the start of this function
 		return True
-	# if the bot doesn't have permission to send messages in the channel of the message
+	# if the bot doesn't have permission to send messages in the channel
 	else:
 		return False
 
-# turns a string of the format Y/M/D or Y-M-D into a tuple of numbers (year, month, day)
-def str_to_date_nums(date: str):
-	date_nums = []
-	# if the date uses slashes
-	if '/' in date and not '-' in date:
-		# split the string by slashes
-		date_nums = date.split('/')
-	# if the date uses dashes
-	elif '-' in date and not '/' in date:
-		# split the string by dashes
-		date_nums = date.split('-')
-	# if the date argument either has both slashes and dashes or neither
-	else:
-		return None
-	
-	year = None
-	month = None
-	day = None
-	# if there are exactly 2 strings from the split and they are both positive integers
-	if len(date_nums) == 2 and date_nums[0].isnumeric() and date_nums[1].isnumeric():
-		# convert those strings into numbers
-		month = int(date_nums[0])
-		day = int(date_nums[1])
-	# if there are exactly 3 strings from the split and they are all positive integers
-	elif len(date_nums) == 3 and date_nums[0].isnumeric() and date_nums[1].isnumeric() and date_nums[2].isnumeric():
-		# convert those strings into numbers
-		year = int(date_nums[0])
-		month = int(date_nums[1])
-		day = int(date_nums[2])
-	# if the date input is invalid
-	else:
-		return None
-	
-	return (year, month, day)
+# strings that long messages get split at, in order of which ones to split at first
+split_strs = ('\n\n', '\n', ' ')
+
+# splits a message into chunks that are each short enough to send in one discord message and yields them in order
+# each chunk ends at the last paragraph break, line break, or space before the message limit (or right at the limit if
+# there aren't any of those), and the split points are found by index so the rest of the message is never copied
+def message_chunks(message: str):
+	start = 0
+	# while the rest of the message is too long to send, split off the part of it up to the split point
+	while len(message) - start > max_message_len:
+		limit = start + max_message_len
+		# if none of the split strings are found, split at the message limit
+		split_index = limit
+		# find the last instance of one of the split strings before the message limit
+		for split_str in split_strs:
+			index = message.rfind(split_str, start, limit)
+			# if an instance of the string was found, split just after its first character
+			if index != -1:
+				split_index = index + 1
+				break
+
+		yield message[start:split_index]
+		start = split_index
 
-# returns whether or not a string is a day of the week
+	# the rest of the message is short enough to send
+	yield message[start:]
 
-def is_monday(token: str) -> bool:
-	token = token.lower()
-	return token == 'm' or token == 'mo' or token == 'mon' or token == 'monday' or token == 'mondays'
+# returns roughly how many bytes an object takes up in memory along with everything in it
+# only goes into containers and objects of this file's classes (not into discord or asyncio objects, which aren't owned
+# by the object), and counts objects that show up more than once only once
+def deep_sizeof(obj, seen: set = None) -> int:
+	if seen is None:
+		seen = set()
+	if id(obj) in seen:
+		return 0
+	seen.add(id(obj))
+
+	size = sys.getsizeof(obj)
+	if isinstance(obj, dict):
+		size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+	elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+		size += sum(deep_sizeof(item, seen) for item in obj)
+	elif type(obj).__module__ == __name__:
+		if hasattr(obj, '__dict__'):
+			size += deep_sizeof(vars(obj), seen)
+		for slot in getattr(type(obj), '__slots__', ()):
+			size += deep_sizeof(getattr(obj, slot, None), seen)
+	return size
+
+# words that can be in dates, times, and days of the week, mapped to the token each one is
+# (days of the week are numbers 0 to 6 (monday to sunday), am and pm are how many hours to add to a 12 hour time, and
+# relative dates are how many days after today they are)
+when_words = {
+	'am': ('ampm', 0), 'pm': ('ampm', 12),
+	'today': ('relative', 0), 'tomorrow': ('relative', 1),
+	'next': ('next', None),
+}
+# every name for each day of the week (monday to sunday)
+day_names = (
+	('m', 'mo', 'mon', 'monday', 'mondays'),
+	('tu', 'tue', 'tues', 'tuesday', 'tuesdays'),
+	('w', 'we', 'wed', 'wednesday', 'wednesdays'),
+	('th', 'thu', 'thur', 'thurs', 'thursday', 'thursdays'),
+	('f', 'fr', 'fri', 'friday', 'fridays'),
+	('sa', 'sat', 'saturday', 'saturdays'),
+	('su', 'sun', 'sunday', 'sundays'),
+)
+when_words.update({name: ('day', day) for day, names in enumerate(day_names) for name in names})
+
+# splits the text of a date, time, or day into numbers, words, and separators
+# words can have whitespace before them (like "3 pm" or "next fri"), and anything else (including whitespace anywhere
+# else) is caught by the last group so the text can be thrown out
+when_token_pattern = re.compile(r'(\d+)|\s*([^\W\d_]+)|([/:-])|(.)', re.DOTALL)
+
+# every way a date, time, or day can be written as a sequence of token kinds (numbers are 'n'), mapped to what it is
+when_shapes = {
+	('n', '/', 'n'): 'month_day',
+	('n', '-', 'n'): 'month_day',
+	('n', '/', 'n', '/', 'n'): 'year_month_day',
+	('n', '-', 'n', '-', 'n'): 'year_month_day',
+	('relative',): 'relative',
+	('next', 'day'): 'next_day',
+	('n',): 'hour',
+	('n', ':', 'n'): 'hour_minute',
+	('n', 'ampm'): 'hour_ampm',
+	('n', ':', 'n', 'ampm'): 'hour_minute_ampm',
+	('day',): 'day',
+}
+
+# max number of different date, time, and day texts whose parses are remembered
+when_cache_size = 1024
+
+# parses the text of a date, time, or day of the week
+# returns one of these tuples, or none if the text isn't any of them:
+# ('date', year or none, month, day), ('relative', days after today), ('next_day', day of the week), ('time', hour, minute)
+# in 24 hour time, or ('day', day of the week)
+# (results are remembered since the same few texts get used over and over, so relative dates are left for the caller to
+# work out from today's date)
+@functools.lru_cache(maxsize = when_cache_size)
+def parse_when(text: str):
+	kinds = []
+	values = []
+	for number, word, separator, other in when_token_pattern.findall(text.strip().lower()):
+		if number:
+			kinds.append('n')
+			values.append(int(number))
+		elif word:
+			token = when_words.get(word)
+			# if the word isn't part of any date, time, or day
+			if token is None:
+				return None
+			kinds.append(token[0])
+			values.append(token[1])
+		elif separator:
+			kinds.append(separator)
+			values.append(None)
+		else:
+			return None
+
+	shape = when_shapes.get(tuple(kinds))
+	if shape == 'month_day':
+		return ('date', None, values[0], values[2])
+	elif shape == 'year_month_day':
+		return ('date', values[0], values[2], values[4])
+	elif shape == 'relative':
+		return ('relative', values[0])
+	elif shape == 'next_day':
+		return ('next_day', values[1])
+	elif shape == 'day':
+		return ('day', values[0])
+	elif shape is None:
+		return None
+
+	# the rest of the shapes are times
+	hour = values[0]
+	minute = values[2] if shape == 'hour_minute' or shape == 'hour_minute_ampm' else 0
+	if minute > 59:
+		return None
+	# if the time is in 12 hour time, the hour has to be between 1 and 12 (12 am is 0 and 12 pm is 12)
+	if shape == 'hour_ampm' or shape == 'hour_minute_ampm':
+		if hour < 1 or hour > 12:
+			return None
+		hour = hour % 12 + values[-1]
+	# if the time is in 24 hour time, the hour has to be between 0 and 23
+	elif hour > 23:
+		return None
 
-def is_tuesday(token: str) -> bool:
-	token = token.lower()
-	return token == 'tu' or token == 'tue' or token == 'tues' or token == 'tuesday' or token == 'tuesdays'
+	return ('time', hour, minute)
 
-def is_wednesday(token: str) -> bool:
-	token = token.lower()
-	return token == 'w' or token == 'we' or token == 'wed' or token == 'wednesday' or token == 'wednesdays'
+# turns a string of the format Y/M/D, Y-M-D, M/D, or M-D into a tuple of numbers (year, month, day) (year is none if it isn't given)
+# also takes "today", "tomorrow", and "next *day*" (the first one of that day of the week after today)
+# returns none if the date isn't valid
+def str_to_date_nums(date: str):
+	parsed = parse_when(date)
+	if parsed is None:
+		return None
+	elif parsed[0] == 'date':
+		return parsed[1:]
+	elif parsed[0] == 'relative' or parsed[0] == 'next_day':
+		today = datetime.datetime.now(timezone).date()
+		# days until the first day after today that's on that day of the week
+		if parsed[0] == 'next_day':
+			days = (parsed[1] - today.weekday() - 1) % 7 + 1
+		else:
+			days = parsed[1]
+		date = today + datetime.timedelta(days = days)
+		return (date.year, date.month, date.day)
+	else:
+		return None
 
-def is_thursday(token: str) -> bool:
-	token = token.lower()
-	return token == 'th' or token == 'thu' or token == 'thur' or token == 'thurs' or token == 'thursday' or token == 'thursdays'
+# converts a string of a day sunday to saturday to a number 0 to 6 (monday is 0)
+# returns none if it isn't a day of the week
+def day_to_num(day: str):
+	parsed = parse_when(day)
+	if parsed is None or parsed[0] != 'day':
+		return None
 
-def is_friday(token: str) -> bool:
-	token = token.lower()
-	return token == 'f' or token == 'fr' or token == 'fri' or token == 'friday' or token == 'fridays'
+	return parsed[1]
 
-def is_saturday(token: str) -> bool:
-	token = token.lower()
-	return token == 'sa' or token == 'sat' or token == 'saturday' or token == 'saturdays'
+# takes a string of the form hour:minute or just the hour, optionally followed by "am" or "pm" (with or without a space
+# before it), and returns a tuple of numbers (hour, minute) in 24 hour time
+# returns none if the time isn't valid
+def str_to_time(time: str):
+	parsed = parse_when(time)
+	if parsed is None or parsed[0] != 'time':
+		return None
 
-def is_sunday(token: str) -> bool:
-	token = token.lower()
-	return token == 'su' or token == 'sun' or token == 'sunday' or token == 'sundays'
+	return parsed[1:]
 
-# converts a string of a day sunday to saturday to a number 0 to 6
-def day_to_num(day: str):
-	if is_monday(day):
-		return 0
-	elif is_tuesday(day):
-		return 1
-	elif is_wednesday(day):
-		return 2
-	elif is_thursday(day):
-		return 3
-	elif is_friday(day):
-		return 4
-	elif is_saturday(day):
-		return 5
-	elif is_sunday(day):
-		return 6
-	else:
+# splits a string of space separated numbers into a list of number strings
+# returns none if there aren't any numbers
+def str_to_nums(nums: str):
+	num_list = nums.split()
+	if len(num_list) < 1:
 		return None
 
-# takes a string of the form hour:minute or just the hour with a second string of either "am" or "pm" and returns an hour in 24 hour time and a minute
-def str_to_time_12hr(time: str, ampm: str):
-	# splits the string into tokens by colons
-	nums = time.split(':')
-	# if the time is just the hour with no minute
-	if len(nums) == 1:
-		# if both the token is a number
-		if nums[0].isnumeric():
-			# turn the hour into a number and make the minute 0
-			hour = int(nums[0])
-			minute = 0
-			# if the hour is between 1 and 12
-			if hour > 0 and hour <= 12:
-				# if the time is in pm and the hour is 12, add 12 to it to turn it into 24 hour time
-				if ampm == 'pm' and hour != 12:
-					hour += 12
-				# if the time is in am and the hour is 12, turn the hour to 0 to turn it into 24 hour time
-				elif ampm == 'am' and hour == 12:
-					hour = 0
-				
-				return hour, minute
-		
-		# return none if the input was not valid
-		return None, None
-	# if the time is of the form hour:minute
-	else:
-		# if both the first and second tokens are numbers
-		if nums[0].isnumeric() and nums[1].isnumeric():
-			# turn the first and second tokens into numbers
-			hour = int(nums[0])
-			minute = int(nums[1])
-			# if the hour is between 1 and 12 and the minute is between 0 and 59
-			if hour > 0 and hour <= 12 and minute >= 0 and minute < 60:
-				# if the time is in pm and the hour is 12, add 12 to it to turn it into 24 hour time
-				if ampm == 'pm' and hour != 12:
-					hour += 12
-				# if the time is in am and the hour is 12, turn the hour to 0 to turn it into 24 hour time
-				elif ampm == 'am' and hour == 12:
-					hour = 0
-				
-				return hour, minute
-		
-		# return none if the input was not valid
-		return None, None
-
-# takes a string of the form hour:minute or just the hour with a second string of either "am" or "pm" and returns an hour in 24 hour time and a minute
-def str_to_time_24hr(time: str):
-	# splits the string into tokens by colons
-	nums = time.split(':')
-	# if the time is just the hour with no minute
-	if len(nums) == 1:
-		# if both the token is a number
-		if nums[0].isnumeric():
-			# turn the hour into a number and make the minute 0
-			hour = int(nums[0])
-			minute = 0
-			# if the hour is between 0 and 23
-			if hour >= 0 and hour < 24:
-				return hour, minute
-		
-		# return none if the input was not valid
-		return None, None
-	# if the time is of the form hour:minute
-	else:
-		# if both the first and second tokens are numbers
-		if nums[0].isnumeric() and nums[1].isnumeric():
-			# turn the first and second tokens into numbers
-			hour = int(nums[0])
-			minute = int(nums[1])
-			# if the hour is between 0 and 23 and the minute is between 0 and 59
-			if hour >= 0 and hour < 24 and minute >= 0 and minute < 60:
-				return hour, minute
-		
-		# return none if the input was not valid
-		return None, None
+	return num_list
+
+# splits a string of comma separated names into a list of names with the surrounding whitespace removed
+# returns none if any of the names are repeated
+def str_to_names(names: str):
+	name_list = []
+	for name in names.split(','):
+		# skip items that are empty strings or only whitespace
+		if name == '' or name.isspace():
+			continue
+
+		name = name.strip()
+		# if the name is a duplicate
+		if name in name_list:
+			return None
+
+		name_list.append(name)
+
+	return name_list
+
+# maps the name of a group in a command syntax to the function that converts the text it matched into the argument its
+# handler gets (see command_syntax())
+# each function returns none if the text isn't valid
+command_converters = {
+	'date': str_to_date_nums,
+	'day': day_to_num,
+	'time': str_to_time,
+	'nums': str_to_nums,
+	'names': str_to_names,
+	'duty': str.lower,
+}
 
 ########################################################################################################################
 #
@@ -2679,4 +4780,8 @@ def str_to_time_24hr(time: str):
 #
 ########################################################################################################################
 
-client.run(bot_token)
\ No newline at end of file
+client.run(bot_token)
+
+# wait for any saves that were still running, then save any changes that were still waiting to be saved when the bot shut down
+ServerData.io.shutdown()
+ServerData.writer.flush_now()
\ No newline at end of file
@@ -0,0 +1,50 @@
+# benchmark for saving and reading the FileStorage meetings and bdays files, in the text format they were saved in before
+# and the compact format they're saved in now (run it from the root directory with "python tests/bench_file_storage.py")
+
+import datetime
+import os
+import tempfile
+
+from bot_loader import load_bot, load_bot_before, best_times
+
+# how many meetings and bdays are in each list
+size = 100
+# how many saves or reads each timing run does
+number = 300
+
+# returns a dict of each measurement to the function that does its work, and the storage, for one version of the bot
+def workloads(bot) -> tuple:
+	storage = bot.FileStorage(tempfile.mkdtemp())
+	storage.create_server(1)
+	start = datetime.datetime(2027, 1, 1, 9, 30, tzinfo=bot.timezone)
+	meetings = [start + datetime.timedelta(hours = 7 * i) for i in range(size)]
+	bdays = [bot.BDay(start + datetime.timedelta(days = 3 * i), f'Person Number {i}') for i in range(size)]
+
+	storage.save_meetings(1, 3, meetings)
+	storage.save_bdays(1, bdays)
+	# every version reads back what it saved
+	assert storage.read_meetings(1) == (3, meetings)
+	return {
+		'save meetings': lambda: storage.save_meetings(1, 3, meetings),
+		'read meetings': lambda: storage.read_meetings(1),
+		'save bdays': lambda: storage.save_bdays(1, bdays),
+		'read bdays': lambda: storage.read_bdays(1),
+	}, storage
+
+# returns the size in bytes of a server's meetings file
+def meetings_file_size(storage) -> int:
+	return os.path.getsize(os.path.join(storage.root, '1', storage.meetings_file))
+
+def main():
+	old, old_storage = workloads(load_bot_before('user-010'))
+	new, new_storage = workloads(load_bot())
+
+	print(f'{size} entry lists, best of 7 x {number} runs')
+	print(f'{"":16}{"text":>10}{"compact":>10}')
+	for name in old:
+		old_time, new_time = best_times([old[name], new[name]], number)
+		print(f'{name:16}{old_time:8.0f}us{new_time:8.0f}us  ({old_time / new_time:.1f}x)')
+	print(f'meetings file: {meetings_file_size(old_storage)} bytes -> {meetings_file_size(new_storage)} bytes')
+
+if __name__ == '__main__':
+	main()
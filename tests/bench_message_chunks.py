@@ -0,0 +1,68 @@
+# benchmark for splitting long messages into chunks that fit under discord's message limit, with the loop safe_reply and
+# safe_message used before and message_chunks() now (run it from the root directory with "python tests/bench_message_chunks.py")
+
+import random
+
+from bot_loader import load_bot, best_times
+
+bot = load_bot()
+
+# how safe_reply and safe_message used to split a message (copied from before message_chunks() replaced it)
+def old_chunks(reply: str) -> list:
+	chunks = []
+	max_message_len = bot.max_message_len
+	# while the reply is too long to send, find a split point before the message limit and send the reply up to that point
+	while (len(reply) > max_message_len):
+		# strings to split the reply at before the message limit
+		split_strs = ["\n\n", "\n", " "]
+		# index of where the reply will be split
+		split_index = -1
+		# loop through each substring to get the index of the last instance of one of the strings in split_strs in the relpy before the max message length
+		for i in range(len(split_strs) + 1):
+			# if all of the strings in split_strs have been checked and none of them were found, set the split_index to the max message length
+			if i == len(split_strs):
+				split_index = max_message_len + 1
+			else:
+				# find the index of the last instance of a string in split_strs
+				split_index = reply.rfind(split_strs[i], 0, max_message_len)
+				# if an instance of the string was found, use the index of that string as the split index
+				if split_index != -1:
+					split_index += 1
+					break
+
+		chunks.append(reply[:split_index])
+		# remove the part of the reply that was just sent
+		reply = reply[split_index:]
+
+	chunks.append(reply)
+	return chunks
+
+# checks message_chunks() against the old loop on random texts, and returns how many texts were split differently
+def check(texts: int) -> int:
+	rng = random.Random(1)
+	different = 0
+	for _ in range(texts):
+		alphabet = rng.choice(['ab \n', 'abcdefgh ', 'abcdefghij\n', 'abcdefghijklmnopqrstu', 'ab\n\n c'])
+		text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 9000)))
+		chunks = list(bot.message_chunks(text))
+		# the chunks always make up the whole text and fit under the limit
+		assert ''.join(chunks) == text and all(len(chunk) <= bot.max_message_len for chunk in chunks)
+		if chunks != old_chunks(text):
+			different += 1
+			# the only texts split differently are ones the old loop split one character over the limit
+			assert ' ' not in text and '\n' not in text
+
+	return different
+
+def main():
+	different = check(3000)
+	print(f'3000 random texts up to 9000 characters: {different} split differently (all ones with no separators)')
+
+	line = 'Meeting on Monday Jan 5 2026 at 15:30 / 3:30 PM PT\n\n'
+	texts = {'50 KB with line breaks': (line * (50000 // len(line) + 1))[:50000], '50 KB with no separators': 'x' * 50000}
+	for name, text in texts.items():
+		old_time, new_time = best_times([lambda: old_chunks(text), lambda: list(bot.message_chunks(text))], 200)
+		print(f'{name}: {old_time:.0f} us -> {new_time:.0f} us, {len(list(bot.message_chunks(text)))} chunks')
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,77 @@
+# benchmark for turning the dates, times, and days in commands into numbers, with the split / isnumeric helpers used before
+# and parse_when() now (run it from the root directory with "python tests/bench_parse_when.py")
+
+import random
+import re
+
+from bot_loader import load_bot, load_bot_before, best_times
+
+# the functions the commands use to convert their arguments
+converters = ['str_to_date_nums', 'str_to_time', 'day_to_num']
+
+# pieces random inputs are made of
+atoms = ['1', '2', '12', '13', '0', '00', '07', '23', '24', '59', '60', '2024', '9999', '/', '-', ':', ' ', 'am', 'pm', 'AM', 'Pm', 'xm', 'mon', 'TUES', 'th', 'fridays', 'sun', 'su', 'x', ':00', '３']
+
+# inputs like the examples in the help text
+examples = [('str_to_date_nums', '11/15'), ('str_to_date_nums', '2024/10/31'), ('str_to_date_nums', '9-20'), ('str_to_time', '10:30 am'), ('str_to_time', '15:30'), ('str_to_time', '4 pm'), ('day_to_num', 'tu'), ('day_to_num', 'mondays'), ('day_to_num', 'Sunday'), ('day_to_num', 'fri')]
+
+# returns the result of a converter, or 'error' if it raised an exception
+def convert(bot, converter: str, text: str):
+	try:
+		return getattr(bot, converter)(text)
+	except Exception:
+		return 'error'
+
+# compares the old and new converters on random inputs and returns a dict of each kind of difference to the inputs that had it
+def compare(old_bot, new_bot, inputs: int) -> dict:
+	rng = random.Random(7)
+	differences = {}
+	for _ in range(inputs):
+		text = ''.join(rng.choice(atoms) for _ in range(rng.randrange(1, 6))).strip()
+		for converter in converters:
+			old = convert(old_bot, converter, text)
+			new = convert(new_bot, converter, text)
+			if old == new:
+				continue
+			if old == 'error':
+				kind = 'old raised an exception'
+			elif new is None:
+				kind = 'old accepted, new rejects'
+			elif old is None:
+				kind = 'new accepts, old rejected'
+			else:
+				kind = 'both accept, but differ'
+			differences.setdefault(f'{converter}: {kind}', []).append(text)
+
+	return differences
+
+def main():
+	old_bot = load_bot_before('user-023')
+	new_bot = load_bot()
+
+	differences = compare(old_bot, new_bot, 200000)
+	print('200000 random inputs')
+	for kind, texts in differences.items():
+		print(f'  {kind}: {len(texts)}, like {texts[:4]}')
+	# the only new inputs are times with am / pm right after the number, and the only ones that stopped working are the
+	# old parsing bugs (junk after the minutes like 0:00:00, or an unknown word where am / pm goes like 07 xm)
+	assert all(re.search(r'\d(am|pm)$', text, re.IGNORECASE) for text in differences.get('str_to_time: new accepts, old rejected', []))
+	assert all(re.search(r':\d*:|:$|\s\S+$', text) for text in differences.get('str_to_time: old accepted, new rejects', []))
+
+	# runs every example through one version of the converters
+	def run_examples(bot):
+		for converter, text in examples:
+			getattr(bot, converter)(text)
+
+	# runs every example through the new converters without the cache
+	def run_uncached():
+		new_bot.parse_when.cache_clear()
+		run_examples(new_bot)
+
+	old_time, cached_time, uncached_time = best_times([lambda: run_examples(old_bot), lambda: run_examples(new_bot), run_uncached], 20000)
+	print(f'per call: old helpers {old_time / len(examples):.2f} us, new cache hit {cached_time / len(examples):.2f} us, new cache miss {uncached_time / len(examples):.2f} us')
+	old_time, new_time = best_times([lambda: old_bot.day_to_num('sundays'), lambda: new_bot.day_to_num('sundays')], 100000)
+	print(f"day_to_num('sundays'): {old_time:.2f} us -> {new_time:.2f} us")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,58 @@
+# benchmark for WeeklyMeeting and BDay, from before they were stored as slotted integer keys and now
+# (run it from the root directory with "python tests/bench_slotted_keys.py")
+
+import bisect
+import datetime
+import random
+import sys
+
+from bot_loader import load_bot, load_bot_before, best_times
+
+# how many weekly meetings and bdays each list has
+size = 100
+# how many times each timing run does its work
+number = 200
+
+# returns the bytes of memory an instance takes up (including its attribute dict if it has one)
+def instance_bytes(obj) -> int:
+	return sys.getsizeof(obj) + (sys.getsizeof(obj.__dict__) if hasattr(obj, '__dict__') else 0)
+
+# inserts every item into a list in sorted order one at a time
+def insort(items: list):
+	items_sorted = []
+	for item in items:
+		bisect.insort(items_sorted, item)
+
+# returns a dict of each measurement to the function that does its work, for one version of the bot
+def workloads(bot, slots: list, dates: list) -> dict:
+	weekly_meetings = [bot.WeeklyMeeting(*slot) for slot in slots]
+	bdays = [bot.BDay(date, 'x') for date in dates]
+	a, b = weekly_meetings[0], weekly_meetings[1]
+	c, d = bdays[0], bdays[1]
+	return {
+		'construct weekly': lambda: [bot.WeeklyMeeting(*slot) for slot in slots],
+		'sort weekly': lambda: sorted(weekly_meetings),
+		'insort weekly': lambda: insort(weekly_meetings),
+		'1000 weekly <': lambda: [a < b for _ in range(1000)],
+		'sort bdays': lambda: sorted(bdays),
+		'insort bdays': lambda: insort(bdays),
+		'1000 bday <': lambda: [c < d for _ in range(1000)],
+	}, weekly_meetings[0], bdays[0]
+
+def main():
+	rng = random.Random(12)
+	slots = [(rng.randrange(7), rng.randrange(24), rng.randrange(60)) for _ in range(size)]
+	old_bot = load_bot_before('user-012')
+	new_bot = load_bot()
+	dates = [datetime.datetime(2026, 1, 1, 8, tzinfo=new_bot.timezone) + datetime.timedelta(days = rng.randrange(730)) for _ in range(size)]
+
+	old, old_weekly, old_bday = workloads(old_bot, slots, dates)
+	new, new_weekly, new_bday = workloads(new_bot, slots, dates)
+	print(f'{size} items, best of 7, old vs new')
+	for name in old:
+		old_time, new_time = best_times([old[name], new[name]], number)
+		print(f'{name:18}{old_time:7.1f} -> {new_time:5.1f} us  {old_time / new_time:.1f}x')
+	print(f'bytes / weekly {instance_bytes(old_weekly)} -> {instance_bytes(new_weekly)};  bytes / bday {instance_bytes(old_bday)} -> {instance_bytes(new_bday)}')
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,68 @@
+# loads bot.py as a module for the offline tests and benchmarks without connecting to discord
+# (bot.py reads its token and starts the bot at import time, so everything from client.run() on is left out and the token
+# file is read from a temporary folder)
+
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+import types
+
+# folder that bot.py is in
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# returns the bot module, loading it the first time this is called
+def load_bot():
+	bot = sys.modules.get('bot')
+	if bot is not None:
+		return bot
+
+	with open(os.path.join(repo_root, 'bot.py'), 'r', encoding='utf8') as file:
+		source = file.read()
+	bot = load_source(source, 'bot')
+	sys.modules['bot'] = bot
+	return bot
+
+# returns the bot module as it was right before the first commit for a request in the backlog (like 'user-010'), for
+# comparing against in the benchmarks (needs git and this repository's history)
+def load_bot_before(request_id: str):
+	commits = subprocess.run(['git', 'log', '--reverse', '--format=%H', '--fixed-strings', f'--grep=[{request_id}]'], cwd=repo_root, capture_output=True, text=True, check=True).stdout.split()
+	if len(commits) < 1:
+		raise LookupError(f'no commit for {request_id} in the git history')
+	source = subprocess.run(['git', 'show', f'{commits[0]}^:bot.py'], cwd=repo_root, capture_output=True, text=True, check=True).stdout
+	return load_source(source, f'bot_before_{request_id.replace("-", "_")}')
+
+# runs the source of bot.py as a module with the given name
+def load_source(source: str, name: str):
+	# leave out starting the bot and shutting it down
+	source = source[:source.index('\nclient.run(bot_token)')]
+
+	bot = types.ModuleType(name)
+	bot.__file__ = os.path.join(repo_root, 'bot.py')
+
+	# run the bot's code in a folder with a fake token file in it
+	folder = tempfile.mkdtemp()
+	with open(os.path.join(folder, 'token.txt'), 'w') as file:
+		file.write('offline\n')
+	cwd = os.getcwd()
+	os.chdir(folder)
+	try:
+		exec(compile(source, bot.__file__, 'exec'), bot.__dict__)
+	finally:
+		os.chdir(cwd)
+
+	return bot
+
+# returns the best time in microseconds that one call of each function took, out of repeat runs of number calls each
+# (the runs of the functions take turns so something else slowing the computer down for a while affects them all the same)
+def best_times(functions: list, number: int, repeat: int = 7) -> list:
+	times = [float('inf')] * len(functions)
+	for _ in range(repeat):
+		for i, function in enumerate(functions):
+			times[i] = min(times[i], timeit.timeit(function, number = number) / number * 1e6)
+	return times
+
+# returns the path of a file in the fixtures folder
+def fixture_path(name: str) -> str:
+	return os.path.join(repo_root, 'tests', 'fixtures', name)
@@ -0,0 +1,85 @@
+# stand ins for the discord objects the bot uses, and a base class for tests that need servers with data in memory
+
+import asyncio
+import unittest
+
+from bot_loader import load_bot
+
+bot = load_bot()
+
+# stands in for the bot's permissions in a channel
+class FakePermissions:
+	send_messages = True
+	add_reactions = True
+	attach_files = True
+
+# stands in for a discord text channel
+class FakeChannel:
+	def __init__(self, guild, id: int):
+		self.guild = guild
+		self.id = id
+		self.sent = []
+
+	def permissions_for(self, member):
+		return FakePermissions()
+
+	# (alerts for meetings that are coming up soon get sent here)
+	async def send(self, content: str = None, **kwargs):
+		self.sent.append(content)
+
+# stands in for a discord server
+class FakeGuild:
+	def __init__(self, id: int, name: str):
+		self.id = id
+		self.name = name
+		self.me = object()
+		self.text_channels = [FakeChannel(self, id + 1)]
+
+	def get_channel(self, channel_id: int):
+		for channel in self.text_channels:
+			if channel.id == channel_id:
+				return channel
+		return None
+
+# stands in for a discord message sent in a channel
+class FakeMessage:
+	def __init__(self, channel, content: str = ''):
+		self.channel = channel
+		self.guild = channel.guild
+		self.content = content
+		self.reactions = []
+		self.replies = []
+
+	async def add_reaction(self, emoji: str):
+		self.reactions.append(emoji)
+
+	async def reply(self, content: str):
+		self.replies.append(content)
+
+# base class for tests that load servers' data, with an in memory database and the client's servers faked out
+class ServerTestCase(unittest.IsolatedAsyncioTestCase):
+	async def asyncSetUp(self):
+		bot.client.loop = asyncio.get_running_loop()
+		bot.ServerData.storage = bot.SQLiteStorage(':memory:')
+		self.guilds = {}
+		bot.client.get_guild = self.guilds.get
+		# the send dispatcher's workers run on the loop they were started on, so each test gets its own
+		bot.ServerData.sender = bot.SendDispatcher(bot.ServerData.send_workers, *bot.ServerData.global_send_rate, *bot.ServerData.channel_send_rate)
+
+	async def asyncTearDown(self):
+		for guild_id in self.guilds:
+			bot.ServerData.scheduler.cancel_server(guild_id)
+			bot.server_data.pop(guild_id, None)
+			bot.ServerData.permissions.invalidate(guild_id)
+		bot.ServerData.writer.flush_now()
+
+	# returns the data of a new server
+	async def new_server(self, id: int, name: str = 'Team'):
+		guild = FakeGuild(id, name)
+		self.guilds[id] = guild
+		return await bot.ServerData.create_ServerData(guild)
+
+	# waits until everything that was submitted to the send dispatcher has been sent
+	async def sent(self):
+		while len(bot.ServerData.sender.pending) > 0:
+			await asyncio.sleep(0)
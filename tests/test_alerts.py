@@ -0,0 +1,53 @@
+# offline tests for the alerts the scheduler sends when meetings and bdays come up
+
+import datetime
+import unittest
+
+from bot_loader import load_bot
+from fakes import FakeGuild, ServerTestCase
+
+bot = load_bot()
+
+class TestAlertsWithoutServer(ServerTestCase):
+	# returns the data of a new server that the bot then can't get to anymore (like when discord says it's unavailable)
+	async def lost_server(self):
+		data = await self.new_server(1 << 23)
+		self.guilds[data.server_id] = None
+		self.assertIsNone(data.alert_channel)
+		return data
+
+	# returns whether this server's alert of this kind is on the scheduler
+	def scheduled(self, data, kind: str) -> bool:
+		return (data.server_id, kind) in bot.ServerData.scheduler.tokens
+
+	async def test_meeting_alerts_still_get_scheduled(self):
+		data = await self.lost_server()
+		now = datetime.datetime.now(bot.timezone)
+		await data.add_meeting((now + datetime.timedelta(minutes = 5)).replace(microsecond = 0))
+
+		await data._ServerData__meeting_soon_alarm()
+		# the meeting was counted as alerted about and its meeting now alert is waiting for it
+		self.assertEqual(data.meeting_index, 1)
+		self.assertTrue(self.scheduled(data, 'meeting_now'))
+
+	async def test_bday_moves_to_next_year(self):
+		data = await self.lost_server()
+		now = datetime.datetime.now(bot.timezone)
+		bday = bot.BDay(now - datetime.timedelta(days = 1), 'Ada')
+		await data.add_bday(bday)
+
+		await data._ServerData__bday_alarm()
+		self.assertEqual(data.bdays[0].year, bday.year + 1)
+		self.assertTrue(self.scheduled(data, 'bday'))
+
+	async def test_load_keeps_saved_alert_channel(self):
+		data = await self.new_server(2 << 23)
+		bot.ServerData.storage.save_alert_channel(data.server_id, data.server_id + 2)
+		self.guilds[data.server_id] = None
+
+		# loading the server's data while the bot can't get to it anymore keeps the alert channel that was saved
+		copy = await bot.ServerData.create_ServerData(FakeGuild(data.server_id, 'Team'))
+		self.assertEqual(copy.alert_channel_id, data.server_id + 2)
+
+if __name__ == '__main__':
+	unittest.main()
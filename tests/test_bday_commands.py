@@ -0,0 +1,75 @@
+# offline tests for the add bday and remove bday commands
+
+import datetime
+import unittest
+
+from bot_loader import load_bot
+from fakes import FakeMessage, ServerTestCase
+
+bot = load_bot()
+
+check = '✅'
+x = '❌'
+
+class TestAddThenRemove(ServerTestCase):
+	async def asyncSetUp(self):
+		await super().asyncSetUp()
+		self.data = await self.new_server(1 << 23)
+		bot.server_data[self.data.server_id] = self.data
+		self.channel = self.guilds[self.data.server_id].text_channels[0]
+		# (the reactions here aren't what's being tested, so don't make them wait for the channel rate limit)
+		bot.ServerData.sender = bot.SendDispatcher(bot.ServerData.send_workers, 1000, 1, 1000, 1)
+		# say happy birthday at midnight so a bday today always already had its alert time go by
+		self.alert_time = (bot.BDay.default_hour, bot.BDay.default_min)
+		bot.BDay.default_hour, bot.BDay.default_min = 0, 0
+
+	async def asyncTearDown(self):
+		bot.BDay.default_hour, bot.BDay.default_min = self.alert_time
+		await super().asyncTearDown()
+
+	# runs a bday command and returns the reaction the bot gave it
+	async def command(self, command, month: int, day: int, name: str) -> str:
+		message = FakeMessage(self.channel)
+		await command(message, (None, month, day), name)
+		await self.sent()
+		return message.reactions[-1]
+
+	# adds and then removes a bday, checking that both worked
+	async def add_then_remove(self, month: int, day: int, name: str = 'Ada'):
+		self.assertEqual(await self.command(bot.add_bday_command, month, day, name), check)
+		# don't let the bday alert go off in between (that's tested separately)
+		bot.ServerData.scheduler.cancel(self.data.server_id, 'bday')
+		self.assertEqual(await self.command(bot.remove_bday_command, month, day, name), check)
+		self.assertEqual(len(self.data.bdays), 0)
+
+	async def test_today_after_alert_time(self):
+		today = datetime.datetime.now(bot.timezone)
+		await self.add_then_remove(today.month, today.day)
+
+	async def test_other_days(self):
+		today = datetime.datetime.now(bot.timezone).date()
+		for date in [today - datetime.timedelta(days = 1), today + datetime.timedelta(days = 1), datetime.date(2024, 12, 31), datetime.date(2024, 1, 1)]:
+			await self.add_then_remove(date.month, date.day)
+
+	async def test_leap_day(self):
+		await self.add_then_remove(2, 29)
+
+	async def test_after_bday_was_said(self):
+		today = datetime.datetime.now(bot.timezone)
+		self.assertEqual(await self.command(bot.add_bday_command, today.month, today.day, 'Ada'), check)
+		# the alert moves the bday to next year
+		await self.data._ServerData__bday_alarm()
+		self.assertEqual(self.data.bdays[0].year, today.year + 1)
+		self.assertEqual(await self.command(bot.remove_bday_command, today.month, today.day, 'Ada'), check)
+		self.assertEqual(len(self.data.bdays), 0)
+
+	async def test_remove_missing_or_invalid(self):
+		self.assertEqual(await self.command(bot.add_bday_command, 7, 4, 'Grace'), check)
+		self.assertEqual(await self.command(bot.remove_bday_command, 7, 4, 'Ada'), x)
+		self.assertEqual(await self.command(bot.remove_bday_command, 2, 30, 'Grace'), x)
+		self.assertEqual(await self.command(bot.remove_bday_command, 13, 1, 'Grace'), x)
+		self.assertEqual(await self.command(bot.remove_bday_command, 10 ** 20, 1, 'Grace'), x)
+		self.assertEqual(len(self.data.bdays), 1)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,55 @@
+# offline tests for taking idle servers' data out of memory (evict_idle_servers())
+
+import unittest
+
+from bot_loader import load_bot
+from fakes import ServerTestCase
+
+bot = load_bot()
+
+class TestEviction(ServerTestCase):
+	async def asyncSetUp(self):
+		await super().asyncSetUp()
+		self.settings = (bot.ServerData.lazy_loading, bot.ServerData.max_resident_servers)
+		bot.ServerData.lazy_loading = True
+		bot.ServerData.max_resident_servers = 2
+
+	async def asyncTearDown(self):
+		bot.ServerData.lazy_loading, bot.ServerData.max_resident_servers = self.settings
+		await super().asyncTearDown()
+
+	# puts new servers in memory in least to most recently used order, all idle for longer than min_idle_secs
+	async def add_idle_servers(self, count: int) -> list:
+		servers = []
+		for i in range(count):
+			data = await self.new_server((i + 1) << 23)
+			data.last_used = bot.client.loop.time() - bot.ServerData.min_idle_secs - 1
+			bot.server_data[data.server_id] = data
+			servers.append(data)
+		return servers
+
+	async def test_evicts_least_recently_used(self):
+		servers = await self.add_idle_servers(5)
+		await bot.evict_idle_servers()
+		self.assertEqual(list(bot.server_data.values()), servers[3:])
+
+	async def test_alert_moves_server_to_back(self):
+		servers = await self.add_idle_servers(5)
+		# an alert goes off for the least recently used server, which makes it the most recently used one
+		await servers[0]._ServerData__bday_alarm()
+		self.assertIs(list(bot.server_data.values())[-1], servers[0])
+
+		# the idle servers behind it still get taken out of memory
+		await bot.evict_idle_servers()
+		self.assertEqual(list(bot.server_data.values()), [servers[4], servers[0]])
+
+	async def test_touch_after_eviction(self):
+		servers = await self.add_idle_servers(3)
+		await bot.evict_idle_servers()
+		# data that was already taken out of memory doesn't get put back by an alert that was running on it
+		servers[0].touch()
+		self.assertNotIn(servers[0].server_id, bot.server_data)
+		self.assertEqual(len(bot.server_data), bot.ServerData.max_resident_servers)
+
+if __name__ == '__main__':
+	unittest.main()
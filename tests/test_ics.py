@@ -0,0 +1,110 @@
+# offline tests for importing and exporting calendar (.ics) files
+
+import datetime
+import unittest
+
+from bot_loader import load_bot, fixture_path
+from fakes import ServerTestCase
+
+bot = load_bot()
+
+# returns the state of a server's meetings, weekly meetings, and bdays in a form that can be compared
+def schedule_of(data) -> tuple:
+	meetings = list(data.meetings)
+	weekly_meetings = sorted(bot.WeeklyMeeting.key_of(meeting) for meeting in data.weekly_meetings)
+	bdays = sorted((bday.name, bday.key % 10000) for bday in data.bdays)
+	return meetings, weekly_meetings, bdays
+
+class TestFolding(unittest.TestCase):
+	def test_fold_round_trip(self):
+		for line in ['A' * 74, 'B' * 75, 'C' * 76, 'D' * 400, 'é' * 100, 'x' + '\U0001F600' * 30]:
+			folded = bot.ics_fold(line)
+			# every line ends with a line break and fits in 75 bytes
+			self.assertTrue(folded.endswith(b'\r\n'))
+			self.assertTrue(all(len(part) <= bot.ics_line_len for part in folded.split(b'\r\n')))
+			# multi-byte characters aren't split up and unfolding gives back the line
+			self.assertEqual(list(bot.ics_unfold(folded.decode())), [line])
+
+	def test_unfold_tabs_and_spaces(self):
+		text = 'SUMMARY:one\r\n two\r\n\tthree\r\nUID:x\r\n'
+		self.assertEqual(list(bot.ics_unfold(text)), ['SUMMARY:onetwothree', 'UID:x'])
+
+	def test_escape_round_trip(self):
+		text = 'Team, A; B \\ C\nnext line'
+		self.assertEqual(bot.ics_unescape(bot.ics_escape(text)), text)
+		self.assertNotIn(',', bot.ics_escape(text).replace('\\,', ''))
+
+class TestParseFixture(unittest.TestCase):
+	def setUp(self):
+		with open(fixture_path('calendar_app.ics'), 'r', encoding='utf8', newline='') as file:
+			self.items, self.bad_entries = bot.parse_ics(file.read())
+
+	def test_meetings(self):
+		local = lambda *args: datetime.datetime(*args, tzinfo=bot.timezone)
+		self.assertEqual(sorted(self.items['meeting']), [
+			# utc, which was already in the past
+			local(2020, 1, 1, 2, 0),
+			# new york time
+			local(2099, 1, 15, 15, 0),
+			# utc
+			local(2099, 3, 1, 9, 0),
+			# floating time
+			local(2099, 3, 2, 9, 30),
+			# a windows timezone name the bot doesn't know
+			local(2099, 3, 3, 10, 0),
+		])
+
+	def test_weekly_meetings(self):
+		# mondays and wednesdays at 1 am in new york are sundays and tuesdays at 10 pm in the bot's timezone
+		keys = sorted(meeting.key for meeting in self.items['weekly meeting'])
+		self.assertEqual(keys, [bot.WeeklyMeeting(1, 22, 0).key, bot.WeeklyMeeting(6, 22, 0).key])
+
+	def test_bdays(self):
+		bdays = sorted((bday.name, bday.month, bday.day, bday.leap_day) for bday in self.items['bday'])
+		self.assertEqual(bdays, [('Ada', 2, 29, True), ('Grace', 7, 4, False)])
+
+	def test_bad_entries(self):
+		# cancelled events and weekly events that ended are left out, and events the bot can't keep track of are reported
+		self.assertEqual(self.bad_entries, ['Every other week, sadly', 'All day offsite'])
+
+	def test_nothing_in_text_that_isnt_a_calendar(self):
+		items, bad_entries = bot.parse_ics('meeting on 5/3 at 3pm\nnot a calendar')
+		self.assertEqual(sum(len(kind_items) for kind_items in items.values()), 0)
+		self.assertEqual(bad_entries, [])
+
+class TestRoundTrip(ServerTestCase):
+	async def test_export_then_import(self):
+		source = await self.new_server(1 << 23, 'Round, trip; "team" ' + 'x' * 80)
+		now = datetime.datetime.now(bot.timezone).replace(second = 0, microsecond = 0)
+		meetings = [now + datetime.timedelta(days = i * 3 + 1, minutes = i * 17) for i in range(40)]
+		weekly_meetings = [bot.WeeklyMeeting(i % 7, (i * 5) % 24, (i * 13) % 60) for i in range(40)]
+		bdays = [bot.make_bday((None, i % 12 + 1, i % 28 + 1), f'Person, {i}; the \\ {i} ' + 'é' * 30) for i in range(30)]
+		bdays.append(bot.make_bday((None, 2, 29), 'Leap'))
+		await source.add_many(meetings, weekly_meetings, bdays)
+
+		data = (await source.export_ics()).getvalue()
+		# every line ends with a line break and fits in 75 bytes
+		self.assertTrue(data.endswith(b'\r\n'))
+		self.assertTrue(all(len(line) <= bot.ics_line_len for line in data.split(b'\r\n')))
+		self.assertEqual(data.count(b'BEGIN:VEVENT'), len(source.meetings) + len(source.weekly_meetings) + len(source.bdays))
+
+		items, bad_entries = bot.parse_ics(data.decode())
+		self.assertEqual(bad_entries, [])
+		copy = await self.new_server(2 << 23)
+		added = await copy.add_many(items['meeting'], items['weekly meeting'], items['bday'])
+		self.assertEqual(added, (len(source.meetings), len(source.weekly_meetings), len(source.bdays)))
+		self.assertEqual(schedule_of(copy), schedule_of(source))
+		self.assertTrue(any(bday.leap_day for bday in copy.bdays))
+
+		# importing the same calendar again doesn't add anything
+		self.assertEqual(await copy.add_many(items['meeting'], items['weekly meeting'], items['bday']), (0, 0, 0))
+
+	async def test_import_fixture(self):
+		data = await self.new_server(3 << 23)
+		with open(fixture_path('calendar_app.ics'), 'r', encoding='utf8', newline='') as file:
+			items, bad_entries = bot.parse_ics(file.read())
+		# the meeting from 2020 is in the past so it gets skipped
+		self.assertEqual(await data.add_many(items['meeting'], items['weekly meeting'], items['bday']), (4, 2, 2))
+
+if __name__ == '__main__':
+	unittest.main()
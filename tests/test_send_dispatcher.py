@@ -0,0 +1,218 @@
+# offline tests for the send dispatcher, sending through discord.py's http client to a local server that stands in for
+# the discord api (with a rate limit on each channel like discord has)
+
+import asyncio
+import collections
+import json
+import unittest
+
+from aiohttp import web
+import discord
+
+from bot_loader import load_bot
+
+bot = load_bot()
+
+# how many messages each channel can take in any period of per seconds on the fake api (discord's is 5 every 5 seconds, this
+# is shorter so the tests don't take long)
+rate = 5
+per = 0.5
+# how much earlier than per seconds a message can come in and still count as being in the next period (for the time
+# between a send leaving the dispatcher and reaching the server)
+slack = 0.05
+
+# returns a json response the way discord sends them (discord.py only reads the body as json if the content type is exactly
+# application/json, without the charset that aiohttp adds)
+def json_response(data, status: int = 200, headers: dict = {}):
+	return web.Response(body = json.dumps(data).encode(), status = status, headers = {'Content-Type': 'application/json', **headers})
+
+# stands in for the parts of the discord api that the bot's sends use
+class FakeDiscordAPI:
+	def __init__(self):
+		# (channel id, content, time) of every message that was accepted, in the order they came in
+		self.messages = []
+		# (channel id, message id, emoji) of every reaction that was accepted
+		self.reactions = []
+		# how many requests got a 429 response
+		self.rate_limited = 0
+		# maps channel ids to how many more requests in them get a 429 no matter what
+		self.force_429 = collections.Counter()
+		# maps channel ids to the times of the messages they accepted
+		self.times = collections.defaultdict(list)
+
+		self.app = web.Application()
+		self.app.router.add_get('/api/v10/users/@me', self.me)
+		self.app.router.add_post('/api/v10/channels/{channel_id}/messages', self.send_message)
+		self.app.router.add_put('/api/v10/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me', self.add_reaction)
+
+	# starts the server on a free port and returns the base url for discord.py's routes
+	async def start(self) -> str:
+		self.runner = web.AppRunner(self.app)
+		await self.runner.setup()
+		site = web.TCPSite(self.runner, '127.0.0.1', 0)
+		await site.start()
+		port = site._server.sockets[0].getsockname()[1]
+		return f'http://127.0.0.1:{port}/api/v10'
+
+	async def stop(self):
+		await self.runner.cleanup()
+
+	# a 429 response the way discord sends them (discord.py only retries 429s that came through its proxy)
+	def too_many_requests(self, retry_after: float):
+		self.rate_limited += 1
+		return json_response({'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': False}, 429, {'Via': '1.1 google'})
+
+	# returns a 429 response if the channel can't take another request right now, otherwise none
+	def check_rate_limit(self, channel_id: int):
+		now = asyncio.get_running_loop().time()
+		if self.force_429[channel_id] > 0:
+			self.force_429[channel_id] -= 1
+			return self.too_many_requests(0.05)
+
+		times = self.times[channel_id]
+		recent = [time for time in times if now - time < per - slack]
+		if len(recent) >= rate:
+			return self.too_many_requests(recent[0] + per - now)
+		times.append(now)
+		return None
+
+	async def me(self, request):
+		return json_response({'id': '1', 'username': 'bot', 'discriminator': '0', 'avatar': None})
+
+	async def send_message(self, request):
+		channel_id = int(request.match_info['channel_id'])
+		response = self.check_rate_limit(channel_id)
+		if response is not None:
+			return response
+
+		content = (await request.json())['content']
+		if content == 'forbidden':
+			return json_response({'message': 'Missing Permissions', 'code': 50013}, 403)
+		self.messages.append((channel_id, content, asyncio.get_running_loop().time()))
+		return json_response({'id': str(len(self.messages)), 'channel_id': str(channel_id), 'content': content})
+
+	async def add_reaction(self, request):
+		channel_id = int(request.match_info['channel_id'])
+		response = self.check_rate_limit(channel_id)
+		if response is not None:
+			return response
+
+		self.reactions.append((channel_id, int(request.match_info['message_id']), request.match_info['emoji']))
+		return web.Response(status = 204)
+
+	# returns the contents of the messages a channel got, in the order it got them
+	def contents(self, channel_id: int) -> list:
+		return [content for channel, content, time in self.messages if channel == channel_id]
+
+# stands in for a discord text channel, sending through discord.py's http client like the real one does
+class HTTPChannel:
+	def __init__(self, http, id: int):
+		self.http = http
+		self.id = id
+
+	async def send(self, content: str):
+		with discord.http.handle_message_parameters(content = content) as params:
+			await self.http.send_message(self.id, params = params)
+
+	async def add_reaction(self, message_id: int, emoji: str):
+		await self.http.add_reaction(self.id, message_id, emoji)
+
+class TestSendDispatcher(unittest.IsolatedAsyncioTestCase):
+	async def asyncSetUp(self):
+		bot.client.loop = asyncio.get_running_loop()
+		self.api = FakeDiscordAPI()
+		self.base = discord.http.Route.BASE
+		discord.http.Route.BASE = await self.api.start()
+		self.http = discord.http.HTTPClient(asyncio.get_running_loop())
+		await self.http.static_login('offline')
+		self.channels = [HTTPChannel(self.http, 1000 + i) for i in range(4)]
+
+	async def asyncTearDown(self):
+		await self.http.close()
+		await self.api.stop()
+		discord.http.Route.BASE = self.base
+
+	# returns a dispatcher with the same channel rate limit as the fake api
+	def dispatcher(self, workers: int = 4) -> bot.SendDispatcher:
+		return bot.SendDispatcher(workers, 50, 1.0, rate, per)
+
+	async def test_burst_goes_out_in_order_without_429s(self):
+		sender = self.dispatcher()
+		futures = [sender.submit(bot.SendDispatcher.reply, channel.id, channel.send, f'{channel.id} {i}') for i in range(8) for channel in self.channels]
+		self.assertEqual(await asyncio.gather(*futures), [True] * len(futures))
+
+		self.assertEqual(self.api.rate_limited, 0)
+		for channel in self.channels:
+			self.assertEqual(self.api.contents(channel.id), [f'{channel.id} {i}' for i in range(8)])
+		self.assertEqual(sender.sent[bot.SendDispatcher.reply], len(futures))
+		self.assertEqual(sum(sender.depth), 0)
+
+	async def test_direct_burst_gets_429s(self):
+		# (makes sure the fake api's rate limit is what keeps the dispatcher's sends spread out in the test above)
+		await asyncio.gather(*[channel.send(f'{channel.id} {i}') for i in range(8) for channel in self.channels])
+		self.assertGreater(self.api.rate_limited, 0)
+
+	async def test_channel_rate_limit(self):
+		sender = self.dispatcher()
+		channel = self.channels[0]
+		await asyncio.gather(*[sender.submit(bot.SendDispatcher.reply, channel.id, channel.send, str(i)) for i in range(3 * rate)])
+
+		# no period of per seconds has more than rate messages in it, and the burst was spread out instead of all going at once
+		times = [time for channel_id, content, time in self.api.messages]
+		for i in range(rate, len(times)):
+			self.assertGreaterEqual(times[i] - times[i - rate], per - slack)
+		self.assertGreaterEqual(times[-1] - times[0], 2 * per - slack)
+
+	async def test_lanes(self):
+		# one worker sends everything one at a time, so the order the sends went out in is the order the fake api got them
+		sender = self.dispatcher(workers = 1)
+		first, second = self.channels[0], self.channels[1]
+		futures = [
+			sender.submit(bot.SendDispatcher.reaction, first.id, first.add_reaction, 1, 'x'),
+			sender.submit(bot.SendDispatcher.reply, second.id, second.send, 'reply 1'),
+			sender.submit(bot.SendDispatcher.reply, first.id, first.send, 'reply 2'),
+			sender.submit(bot.SendDispatcher.alert, second.id, second.send, 'alert 1'),
+			sender.submit(bot.SendDispatcher.alert, first.id, first.send, 'alert 2'),
+		]
+		await asyncio.gather(*futures)
+
+		# alerts go before replies and replies before reactions, across channels and within each channel
+		self.assertEqual([content for channel_id, content, time in self.api.messages], ['alert 1', 'alert 2', 'reply 1', 'reply 2'])
+		self.assertEqual(self.api.reactions, [(first.id, 1, 'x')])
+		self.assertEqual(sender.sent, [2, 2, 1])
+
+	async def test_429_gets_retried(self):
+		sender = self.dispatcher()
+		channel = self.channels[0]
+		self.api.force_429[channel.id] = 2
+		futures = [sender.submit(bot.SendDispatcher.alert, channel.id, channel.send, str(i)) for i in range(3)]
+
+		self.assertEqual(await asyncio.gather(*futures), [True] * 3)
+		# each message got through exactly once, in order
+		self.assertEqual(self.api.rate_limited, 2)
+		self.assertEqual(self.api.contents(channel.id), ['0', '1', '2'])
+		self.assertEqual(sender.failed, 0)
+
+	async def test_failed_send_doesnt_stop_the_channel(self):
+		sender = self.dispatcher()
+		channel = self.channels[0]
+		futures = [sender.submit(bot.SendDispatcher.reply, channel.id, channel.send, content) for content in ['a', 'forbidden', 'b']]
+
+		self.assertEqual(await asyncio.gather(*futures), [True, False, True])
+		self.assertEqual(self.api.contents(channel.id), ['a', 'b'])
+		self.assertEqual(sender.failed, 1)
+
+class TestTokenBucket(unittest.TestCase):
+	def test_tokens_come_back_after_per_seconds(self):
+		bucket = bot.TokenBucket(2, 5.0)
+		self.assertEqual(bucket.take(0.0), 0.0)
+		self.assertEqual(bucket.take(1.0), 0.0)
+		# out of tokens until the first one comes back 5 seconds after it was taken
+		self.assertEqual(bucket.take(2.0), 3.0)
+		self.assertFalse(bucket.full(4.0))
+		self.assertEqual(bucket.take(5.0), 0.0)
+		self.assertEqual(bucket.take(5.5), 0.5)
+		self.assertTrue(bucket.full(10.0))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,111 @@
+# offline tests for the per-server lock that keeps commands and alerts from changing the same server's data at the same time
+
+import asyncio
+import datetime
+import random
+import unittest
+
+from bot_loader import load_bot
+from fakes import FakeChannel, FakeMessage, ServerTestCase
+
+bot = load_bot()
+
+class TestAlertsAndCommands(ServerTestCase):
+	async def asyncSetUp(self):
+		await super().asyncSetUp()
+		# (the alerts here aren't testing the channel rate limit, so don't make them wait for it)
+		bot.ServerData.sender = bot.SendDispatcher(bot.ServerData.send_workers, 1000, 1, 1000, 1)
+		# make the alerts yield before they're sent (safe_message only hands them to the send dispatcher, so otherwise nothing
+		# else would get to run in the middle of an alert)
+		self.safe_message = bot.safe_message
+		async def slow_safe_message(*args, **kwargs):
+			await asyncio.sleep(0.001)
+			return await self.safe_message(*args, **kwargs)
+		bot.safe_message = slow_safe_message
+
+	async def asyncTearDown(self):
+		bot.safe_message = self.safe_message
+		await super().asyncTearDown()
+
+	async def test_soon_alert_races_commands(self):
+		rng = random.Random(20)
+		soon = datetime.timedelta(minutes = bot.ServerData.soon_mins)
+		for trial in range(100):
+			data = await self.new_server((trial + 1) << 23)
+			now = datetime.datetime.now(bot.timezone).replace(second = 0, microsecond = 0)
+			for minutes in (60, 61):
+				await data.add_meeting(now + soon + datetime.timedelta(minutes = minutes))
+			# the first meeting is due for its soon alert, which is sent by calling the alarm below instead of by the scheduler
+			first = now + soon - datetime.timedelta(minutes = 5)
+			await data.add_meeting(first)
+			bot.ServerData.scheduler.cancel_server(data.server_id)
+
+			# the alert goes out (and waits on the send dispatcher) while commands add and remove meetings
+			commands = [
+				data.remove_meetings([str(rng.randrange(1, 4))]),
+				data.add_meeting(now + soon + datetime.timedelta(minutes = 30 + rng.randrange(100))),
+				data.remove_meetings(['1']),
+			]
+			rng.shuffle(commands)
+			await asyncio.gather(data._ServerData__meeting_soon_alarm(), *commands)
+			await self.sent()
+
+			# the first meeting is the only one marked as having had its soon alert, and it got exactly one alert (unless a
+			# command removed it before the alert went out)
+			alerts = self.guilds[data.server_id].text_channels[0].sent
+			self.assertEqual(list(data.meetings), sorted(data.meetings), f'trial {trial}')
+			self.assertEqual(list(data.meetings)[:data.meeting_index], [first] if first in data.meetings else [], f'trial {trial}')
+			self.assertLessEqual(len(alerts), 1)
+			if first in data.meetings:
+				self.assertEqual(len(alerts), 1)
+
+			# the meetings and meeting index that were saved match the ones in memory
+			bot.ServerData.writer.flush_now()
+			self.assertEqual(bot.ServerData.storage.read_meetings(data.server_id), (data.meeting_index, list(data.meetings)))
+			bot.ServerData.scheduler.cancel_server(data.server_id)
+
+class TestAlertChannelCommand(ServerTestCase):
+	async def asyncSetUp(self):
+		await super().asyncSetUp()
+		self.data = await self.new_server(1 << 23)
+		bot.server_data[self.data.server_id] = self.data
+		self.guild = self.guilds[self.data.server_id]
+		self.channel = self.guild.text_channels[0]
+
+	# runs the alert channel command and returns the bot's replies to it
+	async def command(self) -> list:
+		message = FakeMessage(self.channel)
+		await bot.alert_channel_command(message)
+		await self.sent()
+		return message.replies
+
+	async def test_deleted_alert_channel_gets_replaced_and_saved(self):
+		other = FakeChannel(self.guild, self.guild.id + 2)
+		self.guild.text_channels.append(other)
+		self.assertTrue(await self.data.set_alert_channel(other))
+		bot.ServerData.writer.flush_now()
+
+		# the alert channel gets deleted, so the command looks for a new one
+		self.guild.text_channels.remove(other)
+		self.assertEqual(await self.command(), [f'<#{self.channel.id}>'])
+		self.assertEqual(self.data.alert_channel_id, self.channel.id)
+		# the new alert channel gets saved
+		bot.ServerData.writer.flush_now()
+		self.assertEqual(bot.ServerData.storage.read_alert_channel(self.data.server_id), self.channel.id)
+
+	async def test_waits_for_the_lock(self):
+		other = FakeChannel(self.guild, self.guild.id + 2)
+		self.guild.text_channels.append(other)
+		self.assertTrue(await self.data.set_alert_channel(other))
+
+		# while something else holds the server's lock and deletes the alert channel, the command doesn't look for a new one
+		async with self.data.lock:
+			command = asyncio.create_task(self.command())
+			await asyncio.sleep(0.01)
+			self.assertFalse(command.done())
+			self.guild.text_channels.remove(other)
+		# and once the lock is free it sees the channel is gone
+		self.assertEqual(await command, [f'<#{self.channel.id}>'])
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,81 @@
+# offline tests for saving server data with sqlite (SQLiteStorage)
+
+import datetime
+import sqlite3
+import unittest
+
+from bot_loader import load_bot
+
+bot = load_bot()
+
+# stands in for a database connection whose transactions never get committed (like when the disk is full)
+class FailingCommit:
+	def __init__(self, connection):
+		self.connection = connection
+
+	def __getattr__(self, name):
+		return getattr(self.connection, name)
+
+	def __enter__(self):
+		return self.connection.__enter__()
+
+	def __exit__(self, *exception):
+		self.connection.rollback()
+		raise sqlite3.OperationalError('disk I/O error')
+
+class TestSQLiteStorage(unittest.TestCase):
+	def setUp(self):
+		self.storage = bot.SQLiteStorage(':memory:')
+		self.server_id = 1 << 23
+		self.storage.create_server(self.server_id)
+		now = datetime.datetime.now(bot.timezone).replace(second = 0, microsecond = 0)
+		self.meetings = [now + datetime.timedelta(days = i + 1) for i in range(3)]
+
+	# runs a save with commits failing, then turns them back on
+	def save_failing(self, save, *args):
+		connection = self.storage.connection
+		self.storage.connection = FailingCommit(connection)
+		try:
+			with self.assertRaises(sqlite3.OperationalError):
+				save(self.server_id, *args)
+		finally:
+			self.storage.connection = connection
+
+	# returns what's in the database for the server without going through the storage (which would refresh its copy)
+	def stored(self, column: str, table: str) -> tuple:
+		value = self.storage.connection.execute(f'SELECT {column} FROM servers WHERE id = ?', (self.server_id,)).fetchone()[0]
+		count = self.storage.connection.execute(f'SELECT COUNT(*) FROM {table} WHERE server_id = ?', (self.server_id,)).fetchone()[0]
+		return value, count
+
+	def test_only_changes_get_written(self):
+		self.storage.save_meetings(self.server_id, 0, self.meetings)
+		self.storage.save_meetings(self.server_id, 1, self.meetings[1:])
+		self.assertEqual(self.storage.read_meetings(self.server_id), (1, self.meetings[1:]))
+
+	def test_retry_after_rolled_back_rows(self):
+		self.storage.save_meetings(self.server_id, 0, self.meetings[:1])
+		self.save_failing(self.storage.save_meetings, 1, self.meetings)
+		# the database still has what was saved before the failed save
+		self.assertEqual(self.stored('meeting_index', 'meetings'), (0, 1))
+
+		# saving again (like the write behind saver does after a failure) writes the changes
+		self.storage.save_meetings(self.server_id, 1, self.meetings)
+		self.assertEqual(self.storage.read_meetings(self.server_id), (1, self.meetings))
+
+	def test_retry_after_rolled_back_column(self):
+		self.storage.save_alert_channel(self.server_id, 5)
+		self.save_failing(self.storage.save_alert_channel, 6)
+		self.assertEqual(self.stored('alert_channel', 'meetings'), (5, 0))
+
+		self.storage.save_alert_channel(self.server_id, 6)
+		self.assertEqual(self.storage.read_alert_channel(self.server_id), 6)
+
+	def test_retry_after_rolled_back_bdays(self):
+		bdays = [bot.make_bday((None, 2, 29), 'Leap'), bot.make_bday((None, 7, 4), 'Grace')]
+		self.storage.save_bdays(self.server_id, bdays[:1])
+		self.save_failing(self.storage.save_bdays, bdays)
+		self.storage.save_bdays(self.server_id, bdays)
+		self.assertEqual(sorted(name for name, date, leap_day in self.storage.read_bdays(self.server_id)), ['Grace', 'Leap'])
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,68 @@
+# offline property test for catching weekly meetings up after the bot was down (ServerData.catch_up_weekly_meetings())
+
+import datetime
+import random
+import unittest
+
+from bot_loader import load_bot
+
+bot = load_bot()
+
+# how __read_weekly_meetings used to move one saved weekly meeting to its next occurrence and count the meetings missed
+# (one meeting at a time, copied from before catch_up_weekly_meetings() replaced it)
+def old_catch_up(meeting: datetime.datetime, now: datetime.datetime) -> tuple:
+	# if the meeting time is in the future, it stays the same
+	if meeting >= now:
+		return meeting, 0
+
+	# calculate how much time has passed since this meeting
+	delta = now - meeting
+	# calculate how many of these weekly meetings were missed
+	meetings_missed = delta.days // 7
+	delta_week_mod = delta.days % 7
+	# if today is the same weekday day as this weekly meeting
+	if delta_week_mod == 0:
+		today_meeting = meeting + delta
+		# if the meeting has already happened today
+		if today_meeting < now:
+			# make it so this weekly meeting will be stored as next week
+			delta_week_mod = 14
+		# if it hasn't happened yet today
+		else:
+			# don't include this meeting as being missed
+			meetings_missed -= 1
+
+	# calculate how many days to add to the meeting to put it to the next weekly occurrence
+	delta = datetime.timedelta(days = delta.days + (7 - delta_week_mod))
+	return meeting + delta, meetings_missed
+
+class TestCatchUpWeeklyMeetings(unittest.TestCase):
+	def test_matches_old_loop_for_random_downtime(self):
+		rng = random.Random(11)
+		clamped = 0
+		for case in range(20000):
+			# a time the bot comes back up at (over a few years, so plenty of windows cross daylight saving time changes)
+			now = datetime.datetime(2024, 1, 1, tzinfo=bot.timezone) + datetime.timedelta(seconds = rng.randrange(3 * 365 * 86400))
+			# saved weekly meetings from up to about 2 years before now to a week after it, on whole minutes
+			meetings = []
+			for _ in range(rng.randrange(8)):
+				offset = rng.choice([rng.randrange(-7 * 1440, 2 * 365 * 1440), rng.randrange(-2, 3) * 7 * 1440 + rng.randrange(-3, 4)])
+				meeting = (now - datetime.timedelta(minutes = offset)).replace(second = 0, microsecond = 0)
+				meetings.append(meeting.astimezone(bot.timezone))
+
+			next_times, meetings_missed, meetings_stale = bot.ServerData.catch_up_weekly_meetings(meetings, now)
+
+			old = [old_catch_up(meeting, now) for meeting in meetings]
+			self.assertEqual(next_times, [next_time for next_time, missed in old], f'case {case}')
+			# the old loop counted -1 for a meeting earlier today, which moved the duty orders backwards, so it's counted as 0 now
+			self.assertEqual(meetings_missed, sum(max(missed, 0) for next_time, missed in old), f'case {case}')
+			self.assertEqual(meetings_stale, sum(1 for meeting in meetings if meeting < now), f'case {case}')
+			# every meeting is moved to after now
+			self.assertTrue(all(next_time >= now for next_time in next_times), f'case {case}')
+			clamped += sum(1 for next_time, missed in old if missed < 0)
+
+		# make sure the cases the old loop got wrong were actually tried
+		self.assertGreater(clamped, 0)
+
+if __name__ == '__main__':
+	unittest.main()
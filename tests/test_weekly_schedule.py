@@ -0,0 +1,91 @@
+# offline tests for keeping weekly meetings in a WeeklySchedule (instead of the two lists they used to be kept in)
+
+import datetime
+import random
+import unittest
+
+from bot_loader import load_bot
+from fakes import ServerTestCase
+
+bot = load_bot()
+
+# returns the next time a weekly meeting (given as minutes since monday at 0:00) happens after now
+def next_time(key: int, now: datetime.datetime) -> datetime.datetime:
+	meeting = bot.WeeklyMeeting(key // 1440, key // 60 % 24, key % 60)
+	time = datetime.datetime(now.year, now.month, now.day, meeting.hour, meeting.minute, tzinfo=bot.timezone)
+	time += datetime.timedelta(days = (meeting.day - now.weekday()) % 7)
+	if time <= now:
+		time += datetime.timedelta(days = 7)
+	return time
+
+class TestAgainstModel(unittest.TestCase):
+	# checks the schedule against a model that keeps a dict of each meeting's key to its next time, and works out both orders
+	# by sorting (like the two lists did)
+	def test_random_sequences(self):
+		rng = random.Random(13)
+		for sequence in range(3000):
+			now = datetime.datetime(2026, 1, 1, tzinfo=bot.timezone) + datetime.timedelta(minutes = rng.randrange(400 * 1440))
+			schedule = bot.WeeklySchedule([next_time(key, now) for key in {rng.randrange(7 * 1440) for _ in range(rng.randrange(6))}])
+			model = {key: schedule.times[key] for key in schedule.keys}
+
+			for step in range(25):
+				action = rng.random()
+				# add a meeting
+				if action < 0.45:
+					key = rng.randrange(7 * 1440)
+					time = next_time(key, now)
+					index = schedule.add(time)
+					if key in model:
+						self.assertIsNone(index)
+					else:
+						model[key] = time
+						self.assertEqual(index, sorted(model.values()).index(time))
+				# time passes until the soonest meeting, which then moves to next week
+				elif action < 0.7 and len(model) > 0:
+					key = min(model, key = model.get)
+					now = model[key]
+					schedule.advance()
+					model[key] = now + datetime.timedelta(days = 7)
+				# remove a meeting or two by their numbers in display order
+				elif len(model) > 0:
+					display_keys = sorted(model)
+					display_indexes = {rng.randrange(len(display_keys)) for _ in range(rng.randrange(1, 3))}
+					times = sorted(model.values())
+					expected = {times.index(model[display_keys[i]]) for i in display_indexes}
+					self.assertEqual(schedule.remove_display_indexes(display_indexes), expected)
+					for i in display_indexes:
+						del model[display_keys[i]]
+
+				# both orders and the mapping between them match the model
+				self.assertEqual(list(schedule), sorted(model.values()), f'sequence {sequence} step {step}')
+				self.assertEqual(schedule.keys, sorted(model))
+				for display_index in range(len(schedule)):
+					index = schedule.to_occurrence_index(display_index)
+					self.assertEqual(schedule[index], model[schedule.keys[display_index]])
+					self.assertEqual(schedule.to_display_index(index), display_index)
+
+class TestServerWeeklyMeetings(ServerTestCase):
+	async def test_add_remove_and_reload(self):
+		data = await self.new_server(1 << 23)
+		now = datetime.datetime.now(bot.timezone)
+		times = [now + datetime.timedelta(hours = hours) for hours in (3, 50, 1, 120)]
+		for time in times:
+			self.assertTrue(await data.add_weekly_meeting(bot.WeeklyMeeting(time.weekday(), time.hour, time.minute)))
+		# the same weekly meeting can't be added twice
+		self.assertFalse(await data.add_weekly_meeting(bot.WeeklyMeeting(times[0].weekday(), times[0].hour, times[0].minute)))
+
+		# weekly meetings are numbered in display order (by day of the week and time) for removing them
+		removed = data.weekly_meetings.display_meeting(0)
+		self.assertTrue(await data.remove_weekly_meetings(['1']))
+		self.assertFalse(await data.remove_weekly_meetings(['9']))
+		self.assertNotIn(removed, data.weekly_meetings.display_meetings())
+		self.assertEqual(len(data.weekly_meetings), 3)
+
+		# the saved weekly meetings read back into the same schedule
+		bot.ServerData.writer.flush_now()
+		copy = await bot.ServerData.create_ServerData(self.guilds[data.server_id])
+		self.assertEqual(list(copy.weekly_meetings), list(data.weekly_meetings))
+		self.assertEqual(copy.weekly_meetings.keys, data.weekly_meetings.keys)
+
+if __name__ == '__main__':
+	unittest.main()